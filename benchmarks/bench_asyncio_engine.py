@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+"""比较大量小对象操作的吞吐量：线程池（MinioService） vs asyncio引擎（AsyncioMinioEngine）
+
+需要本地MinIO（或兼容S3的服务）和miniopy-async，首次运行时会上传--objects个小文件：
+    minio server /tmp/minio-data
+    python -m benchmarks.bench_asyncio_engine --objects 2000 --concurrency 8 64
+"""
+import argparse
+import asyncio
+import io
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_list_requests import make_service
+from core.services.asyncio_engine import AsyncioMinioEngine
+
+OBJECT_SIZE = 1024
+
+
+def ensure_objects(service, count: int):
+    client = service.client
+    bucket = service.config_manager.get_minio_config()["bucket"]
+    if not client.bucket_exists(bucket):
+        client.make_bucket(bucket)
+    existing = sum(1 for _ in client.list_objects(bucket, prefix="small/", recursive=True))
+    if existing >= count:
+        return
+    payload = os.urandom(OBJECT_SIZE)
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        list(pool.map(lambda i: client.put_object(bucket, f"small/obj_{i:06d}.bin", io.BytesIO(payload), len(payload)),
+                      range(existing, count)))
+
+
+def run_threads(service, names, concurrency: int, operation: str):
+    """每个并发请求占用一个线程"""
+    client = service.client
+    bucket = service.config_manager.get_minio_config()["bucket"]
+
+    def stat(name):
+        client.stat_object(bucket, name)
+
+    def get(name):
+        response = client.get_object(bucket, name)
+        try:
+            response.read()
+        finally:
+            response.close()
+            response.release_conn()
+
+    peak = 0
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for _ in pool.map(stat if operation == "stat" else get, names):
+            peak = max(peak, threading.active_count())
+    return time.perf_counter() - start, peak
+
+
+def run_asyncio(service, names, concurrency: int, operation: str):
+    """所有请求在一个线程的事件循环中并发执行，连接池大小即并发数"""
+    async def main():
+        engine = AsyncioMinioEngine(service.config_manager, max_connections=concurrency)
+        try:
+            start = time.perf_counter()
+            if operation == "stat":
+                results = await engine.stat_files(names)
+            else:
+                results = await engine.read_files(names)
+            elapsed = time.perf_counter() - start
+            assert len(results) == len(names)
+            return elapsed, threading.active_count()
+        finally:
+            await engine.close()
+    return asyncio.run(main())
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--objects", type=int, default=2000)
+    parser.add_argument("--bucket", default="bench-async")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[8, 64])
+    args = parser.parse_args()
+
+    if not AsyncioMinioEngine.available():
+        print("需要安装miniopy-async: pip install -r requirements-asyncio.txt")
+        return
+
+    service = make_service(args.bucket)
+    ensure_objects(service, args.objects)
+    names = [f"small/obj_{i:06d}.bin" for i in range(args.objects)]
+
+    for operation in ("stat", "get"):
+        for concurrency in args.concurrency:
+            threads, thread_peak = run_threads(service, names, concurrency, operation)
+            coroutines, loop_threads = run_asyncio(service, names, concurrency, operation)
+            print(f"{operation} x {len(names)}, 并发 {concurrency}:")
+            print(f"  线程池:  {threads:7.2f} 秒, {len(names) / threads:8.0f} 次/秒, 线程数 {thread_peak}")
+            print(f"  asyncio: {coroutines:7.2f} 秒, {len(names) / coroutines:8.0f} 次/秒, 线程数 {loop_threads}")
+
+
+if __name__ == "__main__":
+    main()
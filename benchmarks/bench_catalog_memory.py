@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+"""比较对象目录的内存占用：每个对象一个dict（旧方式） vs 列式ObjectTable
+
+不需要MinIO，直接生成模拟记录：
+    python -m benchmarks.bench_catalog_memory --counts 100000 1000000
+"""
+import argparse
+import gc
+import os
+import sys
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.services.object_table import ObjectTable
+
+BASE_TIME = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def make_record(i: int):
+    """模拟list_objects返回的记录：约每1000个对象一个文件夹"""
+    return {
+        "name": f"photos/{i // 100000:02d}/{i // 1000 % 100:02d}/img_{i:07d}.jpg",
+        "size": 1024 + i % 5000,
+        "last_modified": BASE_TIME + timedelta(seconds=i * 7),
+        "etag": f"{i:032x}",
+        "content_type": "image/jpeg",
+        "metadata": {}
+    }
+
+
+def measure(build, count: int) -> int:
+    """返回build(count)构建的结构所占用的字节数"""
+    gc.collect()
+    tracemalloc.start()
+    result = build(count)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    gc.collect()
+    return current
+
+
+def build_dicts(count: int):
+    # 旧的ObjectCatalog：{对象名: 记录dict}
+    files = {}
+    for i in range(count):
+        record = make_record(i)
+        files[record["name"]] = record
+    return files
+
+
+def build_table(count: int):
+    table = ObjectTable()
+    for i in range(count):
+        table.upsert(make_record(i))
+    return table
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--counts", type=int, nargs="+", default=[100000, 1000000])
+    args = parser.parse_args()
+
+    for count in args.counts:
+        dicts = measure(build_dicts, count)
+        table = measure(build_table, count)
+        print(f"{count} 个对象:")
+        print(f"  dict记录:    {dicts / 2**20:8.1f} MiB, {dicts / count:6.0f} 字节/对象")
+        print(f"  ObjectTable: {table / 2**20:8.1f} MiB, {table / count:6.0f} 字节/对象")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+"""统计刷新一次文件列表时发出的HTTP请求数（旧的逐个stat方式 vs 仅LIST方式）
+
+使用方法（需要本地MinIO）：
+    minio server /tmp/minio-data
+    python -m benchmarks.bench_list_requests --objects 5000
+"""
+import argparse
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.utils.config_manager import ConfigManager
+from core.services.minio_service import MinioService
+
+VISIBLE_ROWS = 40  # 表格一屏大约显示的行数
+
+
+def make_service(bucket: str) -> MinioService:
+    config_manager = ConfigManager()
+    # 只修改内存中的配置，不写回settings.json
+    config_manager.config = dict(config_manager.config)
+    config_manager.config["minio"] = {
+        "endpoint": os.environ.get("BENCH_MINIO_ENDPOINT", "127.0.0.1:9000"),
+        "access_key": os.environ.get("BENCH_MINIO_ACCESS_KEY", "minioadmin"),
+        "secret_key": os.environ.get("BENCH_MINIO_SECRET_KEY", "minioadmin"),
+        "bucket": bucket,
+        "secure": False
+    }
+    return MinioService(config_manager)
+
+
+def count_requests(client):
+    """包装客户端的底层请求方法，返回计数器"""
+    counter = {"requests": 0}
+    url_open = client._url_open
+
+    def counting_url_open(*args, **kwargs):
+        counter["requests"] += 1
+        return url_open(*args, **kwargs)
+
+    client._url_open = counting_url_open
+    return counter
+
+
+def populate(service: MinioService, bucket: str, count: int):
+    client = service.client
+    if not client.bucket_exists(bucket):
+        client.make_bucket(bucket)
+    existing = sum(1 for _ in client.list_objects(bucket, recursive=True))
+    for i in range(existing, count):
+        client.put_object(
+            bucket, f"photos/{i // 1000:03d}/img_{i:07d}.jpg",
+            io.BytesIO(b"x"), 1,
+            content_type="image/jpeg",
+            metadata={"album": "bench"}
+        )
+
+
+def legacy_list_files(service: MinioService):
+    """改动前的实现：LIST之后对每个对象再stat一次"""
+    bucket = service.config_manager.get_minio_config()["bucket"]
+    files = []
+    for obj in service.client.list_objects(bucket, recursive=True):
+        stat = service.client.stat_object(bucket, obj.object_name)
+        files.append({
+            "name": obj.object_name,
+            "size": obj.size,
+            "last_modified": obj.last_modified,
+            "content_type": stat.content_type,
+            "metadata": stat.metadata
+        })
+    return files
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--objects", type=int, default=5000)
+    parser.add_argument("--bucket", default="bench-list")
+    args = parser.parse_args()
+
+    service = make_service(args.bucket)
+    populate(service, args.bucket, args.objects)
+    counter = count_requests(service.client)
+
+    counter["requests"] = 0
+    start = time.perf_counter()
+    files = legacy_list_files(service)
+    before = (counter["requests"], time.perf_counter() - start)
+
+    counter["requests"] = 0
+    service.invalidate_stat_cache()
+    start = time.perf_counter()
+    files = service.list_files()
+    service.stat_files(f["name"] for f in files[:VISIBLE_ROWS])
+    after = (counter["requests"], time.perf_counter() - start)
+
+    print(f"对象数: {len(files)}")
+    print(f"改动前: {before[0]} 次请求, {before[1]:.2f}s")
+    print(f"改动后: {after[0]} 次请求, {after[1]:.2f}s (含首屏 {VISIBLE_ROWS} 行按需stat)")
+
+
+if __name__ == "__main__":
+    main()
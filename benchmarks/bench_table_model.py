@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+"""比较文件列表的显示方式：逐行创建QTableWidgetItem（旧方式） vs 以目录为数据源的表格模型
+
+对象以模拟记录的形式分页写入共享目录（与流式列举相同的路径），不会上传任何文件；
+MinIO只用于创建服务对象，存储桶可以为空：
+    QT_QPA_PLATFORM=offscreen python -m benchmarks.bench_table_model --counts 10000 100000 1000000
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt5.QtWidgets import QApplication, QTableWidget, QTableWidgetItem, QTableView
+from PyQt5.QtCore import Qt
+from benchmarks.bench_list_requests import make_service
+from benchmarks.bench_catalog_memory import make_record
+from core.services.object_catalog import ObjectCatalog
+from core.services.object_table import format_size, format_time
+from ui.models.file_table_model import FileTableModel, FileFilterProxyModel
+
+PAGE_SIZE = 1000  # 与一次列举返回的页大小相同
+
+
+def file_type(ext: str) -> str:
+    return "图片" if ext in {".jpg", ".png"} else "其他"
+
+
+def timed(func) -> float:
+    start = time.perf_counter()
+    func()
+    QApplication.processEvents()
+    return time.perf_counter() - start
+
+
+def fill_catalog(catalog, count: int) -> float:
+    """按页写入count个对象，返回耗时（秒）"""
+    catalog.table.clear()
+    catalog.files_reset.emit()
+    start = time.perf_counter()
+    for first in range(0, count, PAGE_SIZE):
+        records = [make_record(i) for i in range(first, min(first + PAGE_SIZE, count))]
+        catalog.apply_delta({"added": records, "updated": [], "removed": []})
+    QApplication.processEvents()
+    return time.perf_counter() - start
+
+
+def legacy_fill(catalog) -> float:
+    """旧的FileManagerPage：为每个对象创建4个表格项"""
+    table = QTableWidget()
+    table.setColumnCount(4)
+    table.resize(900, 600)
+    table.show()
+
+    def fill():
+        records = list(catalog.table.records())
+        table.setRowCount(len(records))
+        for row, record in enumerate(records):
+            table.setItem(row, 0, QTableWidgetItem(record["name"]))
+            size_item = QTableWidgetItem(format_size(record["size"]))
+            size_item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+            table.setItem(row, 1, size_item)
+            table.setItem(row, 2, QTableWidgetItem(format_time(record["last_modified"].timestamp())))
+            table.setItem(row, 3, QTableWidgetItem(file_type(os.path.splitext(record["name"])[1])))
+        table.repaint()
+    elapsed = timed(fill)
+    table.deleteLater()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--counts", type=int, nargs="+", default=[10000, 100000, 1000000])
+    parser.add_argument("--bucket", default="bench-table")
+    parser.add_argument("--legacy-max", type=int, default=100000,
+                        help="超过该数量时跳过旧方式（百万行需要数分钟和数GB内存）")
+    args = parser.parse_args()
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    service = make_service(args.bucket)
+    catalog = ObjectCatalog.instance(service)
+    catalog.stop_listening()
+
+    for count in args.counts:
+        print(f"{count} 个对象:")
+        model = FileTableModel(catalog, file_type)
+        proxy = FileFilterProxyModel(catalog, file_type)
+        proxy.setSourceModel(model)
+        view = QTableView()
+        view.setModel(proxy)
+        view.resize(900, 600)
+        view.show()
+        QApplication.processEvents()
+
+        print(f"  流式写入（视图已显示）:     {fill_catalog(catalog, count):8.3f} 秒")
+        print(f"  模型重置 + 首次绘制:        {timed(lambda: (model.reset(), view.repaint())):8.3f} 秒")
+        print(f"  按大小排序:                 {timed(lambda: view.sortByColumn(1, Qt.DescendingOrder)):8.3f} 秒")
+        print(f"  按名称排序（无索引）:       {timed(lambda: view.sortByColumn(0, Qt.AscendingOrder)):8.3f} 秒")
+        catalog._build_name_index()
+        while catalog._current_name_index() is None:
+            app.processEvents()
+            time.sleep(0.01)
+        print(f"  按名称排序（有索引）:       {timed(lambda: view.sortByColumn(0, Qt.DescendingOrder)):8.3f} 秒")
+        print(f"  过滤 \"img_00012\":           {timed(lambda: proxy.set_filter('img_00012')):8.3f} 秒, "
+              f"{proxy.rowCount()} 行")
+        proxy.set_filter("")
+        if count <= args.legacy_max:
+            print(f"  QTableWidget逐项填充:       {legacy_fill(catalog):8.3f} 秒")
+        else:
+            print("  QTableWidget逐项填充:       已跳过")
+        view.deleteLater()
+        model.deleteLater()
+        QApplication.processEvents()
+
+
+if __name__ == "__main__":
+    main()
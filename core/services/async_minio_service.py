@@ -0,0 +1,181 @@
+from typing import Callable, Dict, Optional
+from datetime import timedelta
+from PyQt5.QtCore import QObject, QThreadPool, QTimer, pyqtSignal
+from core.worker import Worker
+from .minio_service import MinioService
+from .connection_manager import ConnectionManager
+
+class AsyncOperation(QObject):
+    """一次在后台执行的操作，结果通过信号在界面线程中发出
+
+    succeeded/failed/cancelled三者只会发出一个，之后总会发出finished。
+    超时或取消后，后台线程中的调用仍会执行完，但结果被丢弃。
+    """
+    succeeded = pyqtSignal(object)
+    failed = pyqtSignal(str)
+    cancelled = pyqtSignal()
+    finished = pyqtSignal()
+
+    def __init__(self, name: str, task, parent=None):
+        """task为实际执行的任务（Worker或asyncio的Future），结束时调用其cancel()"""
+        super().__init__(parent)
+        self.name = name
+        self.task = task
+        self.done = False
+
+    def cancel(self):
+        """取消操作；尚未开始的操作不会再执行"""
+        self._finish(self.cancelled)
+
+    def _succeed(self, result):
+        self._finish(self.succeeded, result)
+
+    def _fail(self, message: str):
+        self._finish(self.failed, message)
+
+    def _timeout(self, seconds: float):
+        self._finish(self.failed, f"操作超时（{seconds:g}秒）")
+
+    def _finish(self, signal, *args):
+        if self.done:
+            return
+        self.done = True
+        self.task.cancel()
+        signal.emit(*args)
+        self.finished.emit()
+
+
+class OperationRunner(QObject):
+    """在线程池中执行阻塞调用，支持超时、取消和忙碌状态通知"""
+    busy_changed = pyqtSignal(bool)
+    operations_changed = pyqtSignal(list)  # 进行中的操作名称
+
+    def __init__(self, max_threads: int = 4, parent=None):
+        super().__init__(parent)
+        self.thread_pool = QThreadPool()
+        self.thread_pool.setMaxThreadCount(max_threads)
+        self._operations = []
+
+    def submit(self, name: str, fn: Callable, *args, timeout: Optional[float] = None, **kwargs) -> AsyncOperation:
+        """在后台执行fn(*args, **kwargs)，timeout为秒数（None表示不限时）"""
+        worker = Worker(fn, *args, **kwargs)
+        operation = AsyncOperation(name, worker, self)
+        worker.signals.result.connect(operation._succeed)
+        worker.signals.error.connect(operation._fail)
+        if timeout:
+            timer = QTimer(operation)
+            timer.setSingleShot(True)
+            timer.timeout.connect(lambda: operation._timeout(timeout))
+            timer.start(int(timeout * 1000))
+        self._track(operation)
+        self.thread_pool.start(worker)
+        return operation
+
+    def is_busy(self) -> bool:
+        return bool(self._operations)
+
+    def operation_names(self):
+        return [operation.name for operation in self._operations]
+
+    def cancel_all(self):
+        for operation in list(self._operations):
+            operation.cancel()
+
+    def _track(self, operation: AsyncOperation):
+        """登记进行中的操作，结束时自动移除"""
+        operation.finished.connect(lambda: self._remove(operation))
+        self._operations.append(operation)
+        if len(self._operations) == 1:
+            self.busy_changed.emit(True)
+        self.operations_changed.emit(self.operation_names())
+
+    def _remove(self, operation: AsyncOperation):
+        self._operations.remove(operation)
+        self.operations_changed.emit(self.operation_names())
+        if not self._operations:
+            self.busy_changed.emit(False)
+        operation.deleteLater()
+
+
+class AsyncMinioService(OperationRunner):
+    """MinioService的非阻塞接口，所有网络调用都在线程池中执行
+
+    各操作返回AsyncOperation，界面连接其succeeded/failed信号处理结果。
+    离线时操作立即失败，不再等待网络超时；因网络错误失败的操作会触发重连。
+    """
+    # 各操作的默认超时（秒），None表示不限时（传输时间取决于文件大小）
+    TIMEOUTS: Dict[str, Optional[float]] = {
+        "list_folder": 60,
+        "stat_files": 60,
+        "download_file": None,
+        "read_range": 60,
+        "rename_file": None,
+        "rename_prefix": None,
+        "delete_file": 60,
+        "delete_files": None,
+        "delete_prefix": None,
+        "create_folder": 30,
+        "get_presigned_url": 15,
+    }
+
+    _instances: Dict[int, "AsyncMinioService"] = {}
+
+    @classmethod
+    def instance(cls, minio_service: MinioService) -> "AsyncMinioService":
+        """获取与minio_service对应的共享实例，使各页面的忙碌状态一致"""
+        key = id(minio_service)
+        if key not in cls._instances:
+            cls._instances[key] = cls(minio_service)
+        return cls._instances[key]
+
+    def __init__(self, minio_service: MinioService, max_threads: int = 4):
+        super().__init__(max_threads)
+        self.minio_service = minio_service
+        self.connection = ConnectionManager.instance(minio_service)
+
+    def call(self, method: str, *args, timeout: Optional[float] = None, **kwargs) -> AsyncOperation:
+        """在后台调用MinioService的方法，timeout默认取TIMEOUTS中的值"""
+        if timeout is None:
+            timeout = self.TIMEOUTS.get(method)
+        if self.connection.is_offline():
+            return self.submit(method, self._offline)
+        operation = self.submit(method, getattr(self.minio_service, method), *args, timeout=timeout, **kwargs)
+        operation.task.signals.exception.connect(self.connection.report_error)
+        return operation
+
+    @staticmethod
+    def _offline():
+        raise ConnectionError("未连接到MinIO服务器")
+
+    def list_folder(self, prefix: str = "") -> AsyncOperation:
+        return self.call("list_folder", prefix)
+
+    def stat_files(self, object_names) -> AsyncOperation:
+        return self.call("stat_files", list(object_names))
+
+    def download_file(self, object_name: str, file_path: str) -> AsyncOperation:
+        return self.call("download_file", object_name, file_path)
+
+    def read_range(self, object_name: str, offset: int, length: int) -> AsyncOperation:
+        return self.call("read_range", object_name, offset, length)
+
+    def rename_file(self, old_name: str, new_name: str) -> AsyncOperation:
+        return self.call("rename_file", old_name, new_name)
+
+    def rename_prefix(self, old_prefix: str, new_prefix: str) -> AsyncOperation:
+        return self.call("rename_prefix", old_prefix, new_prefix)
+
+    def delete_file(self, object_name: str) -> AsyncOperation:
+        return self.call("delete_file", object_name)
+
+    def delete_files(self, object_names) -> AsyncOperation:
+        return self.call("delete_files", list(object_names))
+
+    def delete_prefix(self, prefix: str) -> AsyncOperation:
+        return self.call("delete_prefix", prefix)
+
+    def create_folder(self, folder_name: str) -> AsyncOperation:
+        return self.call("create_folder", folder_name)
+
+    def get_presigned_url(self, object_name: str, expires: timedelta = timedelta(hours=1)) -> AsyncOperation:
+        return self.call("get_presigned_url", object_name, expires=expires)
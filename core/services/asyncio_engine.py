@@ -0,0 +1,261 @@
+import asyncio
+import io
+import threading
+from datetime import timedelta
+from typing import List, Optional, Dict, Any, Iterable, AsyncIterator, Coroutine
+from PyQt5.QtCore import QCoreApplication, pyqtSignal
+from ..utils.config_manager import ConfigManager
+from ..utils.qt_event_loop import current_qt_event_loop
+from .async_minio_service import AsyncOperation, OperationRunner
+
+# 可选依赖：miniopy-async提供asyncio版的MinIO客户端
+try:
+    import aiohttp
+    from miniopy_async import Minio as AsyncMinio
+    from miniopy_async.error import MinioException as AsyncMinioException
+except ImportError:
+    AsyncMinio = None
+    AsyncMinioException = Exception
+
+class AsyncioMinioEngine:
+    """MinioService常用操作的asyncio实现
+
+    所有请求共用一个连接池，数千个小对象操作（stat、HEAD、小文件下载）并发执行时只占用
+    事件循环所在的一个线程，而不是每个操作一个线程。返回的记录格式与MinioService相同。
+    客户端在第一次调用时于当前事件循环中创建，同一个引擎只能在一个事件循环中使用。
+    """
+    # 连接池大小，即同时进行的请求数上限
+    MAX_CONNECTIONS = 64
+
+    _instances: Dict[int, "AsyncioMinioEngine"] = {}
+
+    @classmethod
+    def instance(cls, minio_service) -> Optional["AsyncioMinioEngine"]:
+        """配置中启用了引擎（transfer.asyncio_engine）且已安装miniopy-async时返回共用的引擎，否则返回None
+
+        引擎的runner负责在Qt程序中执行其协程，结果以AsyncOperation的信号发出。
+        """
+        config = minio_service.config_manager.get_transfer_config()
+        if not cls.available() or not config.get("asyncio_engine", False):
+            return None
+        key = id(minio_service)
+        if key not in cls._instances:
+            engine = cls(minio_service.config_manager)
+            engine.runner = AsyncioRunner()
+            app = QCoreApplication.instance()
+            if app is not None:
+                app.aboutToQuit.connect(engine.shutdown)
+            cls._instances[key] = engine
+        return cls._instances[key]
+
+    def __init__(self, config_manager: ConfigManager, max_connections: int = MAX_CONNECTIONS):
+        if AsyncMinio is None:
+            raise RuntimeError("asyncio存储引擎需要安装miniopy-async（requirements-asyncio.txt）")
+        self.config_manager = config_manager
+        self.max_connections = max_connections
+        self._client = None
+        self._region_ready = None
+
+    @staticmethod
+    def available() -> bool:
+        return AsyncMinio is not None
+
+    @property
+    def bucket(self) -> str:
+        return self.config_manager.get_minio_config()["bucket"]
+
+    def client(self):
+        if self._client is None:
+            config = self.config_manager.get_minio_config()
+            session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.max_connections),
+                timeout=aiohttp.ClientTimeout(connect=30, sock_read=300)
+            )
+            self._client = AsyncMinio(
+                endpoint=config["endpoint"],
+                access_key=config["access_key"],
+                secret_key=config["secret_key"],
+                secure=config["secure"],
+                session=session
+            )
+        return self._client
+
+    async def ready(self):
+        """先单独查询一次存储桶区域
+
+        区域缓存前同时发出的请求会各自查询一次区域，大批并发请求之前先调用。
+        _get_region是miniopy-async的内部方法，没有该方法的版本中直接返回，由各请求自行查询。
+        """
+        get_region = getattr(self.client(), "_get_region", None)
+        if get_region is None:
+            return
+        if self._region_ready is None:
+            self._region_ready = asyncio.ensure_future(get_region(self.bucket))
+        try:
+            await self._region_ready
+        except AsyncMinioException:
+            self._region_ready = None  # 由随后的请求报告错误
+
+    async def close(self):
+        """关闭连接池"""
+        if self._client is not None:
+            await self._client.close_session()
+            self._client = None
+            self._region_ready = None
+
+    def shutdown(self):
+        """关闭连接池并停止instance()创建的runner"""
+        runner = getattr(self, "runner", None)
+        if runner is None:
+            return
+        if self._client is not None and runner._own_thread is not None:
+            try:
+                asyncio.run_coroutine_threadsafe(self.close(), runner.loop).result(2)
+            except Exception as e:
+                print(f"关闭asyncio存储引擎失败: {e}")
+        runner.shutdown()
+
+    async def iter_files(self, prefix: str = "", page_size: int = 500) -> AsyncIterator[List[Dict[str, Any]]]:
+        """分页列出文件，记录格式与MinioService.iter_files相同"""
+        page = []
+        try:
+            async for obj in self.client().list_objects(self.bucket, prefix=prefix, recursive=True,
+                                                        include_user_meta=True):
+                page.append({
+                    "name": obj.object_name,
+                    "size": obj.size or 0,
+                    "last_modified": obj.last_modified,
+                    "etag": obj.etag,
+                    "content_type": obj.content_type,
+                    "metadata": dict(obj.metadata) if obj.metadata else {}
+                })
+                if len(page) >= page_size:
+                    yield page
+                    page = []
+        except AsyncMinioException as e:
+            print(f"列出文件失败: {e}")
+        if page:
+            yield page
+
+    async def list_files(self, prefix: str = "") -> List[Dict[str, Any]]:
+        return [record async for page in self.iter_files(prefix) for record in page]
+
+    async def stat_file(self, object_name: str) -> Optional[Dict[str, Any]]:
+        """获取单个文件的内容类型和用户元数据，格式与MinioService.stat_files的值相同"""
+        try:
+            stat = await self.client().stat_object(self.bucket, object_name)
+        except AsyncMinioException as e:
+            print(f"获取文件元数据失败: {object_name}, {e}")
+            return None
+        metadata = stat.metadata or {}
+        return {
+            "content_type": stat.content_type,
+            "metadata": {k: v for k, v in metadata.items() if k.lower().startswith("x-amz-meta-")}
+        }
+
+    async def stat_files(self, object_names: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """并发获取多个文件的元数据，失败的文件不在结果中"""
+        object_names = list(object_names)
+        await self.ready()
+        infos = await asyncio.gather(*(self.stat_file(name) for name in object_names))
+        return {name: info for name, info in zip(object_names, infos) if info is not None}
+
+    async def exists(self, object_name: str) -> bool:
+        return await self.stat_file(object_name) is not None
+
+    async def read_file(self, object_name: str, offset: int = 0, length: int = 0) -> Optional[bytes]:
+        """读取文件内容（length为0时读到末尾），适合小文件"""
+        try:
+            response = await self.client().get_object(self.bucket, object_name, offset=offset, length=length)
+            try:
+                return await response.read()
+            finally:
+                response.release()
+        except AsyncMinioException as e:
+            print(f"读取文件失败: {object_name}, {e}")
+            return None
+
+    async def read_files(self, object_names: Iterable[str]) -> Dict[str, bytes]:
+        object_names = list(object_names)
+        await self.ready()
+        contents = await asyncio.gather(*(self.read_file(name) for name in object_names))
+        return {name: data for name, data in zip(object_names, contents) if data is not None}
+
+    async def put_bytes(self, object_name: str, data: bytes,
+                        content_type: str = "application/octet-stream") -> bool:
+        try:
+            await self.client().put_object(self.bucket, object_name, io.BytesIO(data), len(data),
+                                           content_type=content_type)
+            return True
+        except AsyncMinioException as e:
+            print(f"上传文件失败: {e}")
+            return False
+
+    async def remove_file(self, object_name: str) -> bool:
+        try:
+            await self.client().remove_object(self.bucket, object_name)
+            return True
+        except AsyncMinioException as e:
+            print(f"删除文件失败: {e}")
+            return False
+
+    async def get_presigned_url(self, object_name: str, expires: timedelta = timedelta(hours=1)) -> Optional[str]:
+        try:
+            return await self.client().presigned_get_object(self.bucket, object_name, expires=expires)
+        except AsyncMinioException as e:
+            print(f"获取预签名URL失败: {e}")
+            return None
+
+
+class AsyncioRunner(OperationRunner):
+    """在Qt程序中执行协程，结果以AsyncOperation的信号发出
+
+    已通过install_qt_event_loop安装qasync事件循环时，协程直接在界面线程中调度；
+    否则在一个后台线程中运行事件循环，所有协程共用这一个线程。
+    """
+    _completed = pyqtSignal(object, object, object)  # 操作, 结果, 异常
+
+    def __init__(self, loop: Optional[asyncio.AbstractEventLoop] = None, parent=None):
+        super().__init__(1, parent)
+        self._completed.connect(self._deliver)
+        if loop is None:
+            loop = current_qt_event_loop()
+        self._own_thread = None
+        if loop is None:
+            loop = asyncio.new_event_loop()
+            self._own_thread = threading.Thread(target=loop.run_forever, name="asyncio-engine", daemon=True)
+            self._own_thread.start()
+        self.loop = loop
+
+    def run(self, name: str, coroutine: Coroutine, timeout: Optional[float] = None) -> AsyncOperation:
+        """在事件循环中执行协程，timeout为秒数（超时后协程被取消）"""
+        if timeout:
+            coroutine = asyncio.wait_for(coroutine, timeout)
+        if self._own_thread is None:
+            future = asyncio.ensure_future(coroutine, loop=self.loop)
+        else:
+            future = asyncio.run_coroutine_threadsafe(coroutine, self.loop)
+        operation = AsyncOperation(name, future, self)
+        # 完成回调可能在事件循环线程中执行，通过信号转到界面线程
+        future.add_done_callback(lambda f: self._completed.emit(
+            operation, None if f.cancelled() or f.exception() else f.result(),
+            None if f.cancelled() else f.exception()))
+        self._track(operation)
+        return operation
+
+    def _deliver(self, operation: AsyncOperation, result, error):
+        if operation.done:
+            return  # 已取消或超时，对象可能已被释放
+        if isinstance(error, (asyncio.TimeoutError, TimeoutError)):
+            operation._fail("操作超时")
+        elif error is not None:
+            operation._fail(str(error))
+        else:
+            operation._succeed(result)
+
+    def shutdown(self):
+        """停止后台事件循环（使用qasync事件循环时不做任何事）"""
+        if self._own_thread is not None:
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self._own_thread.join(2)
+            self._own_thread = None
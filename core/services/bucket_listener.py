@@ -0,0 +1,112 @@
+import time
+from datetime import datetime, timezone
+from typing import Dict, Any, Optional
+from urllib.parse import unquote_plus
+from PyQt5.QtCore import QThread, pyqtSignal
+from minio.error import S3Error
+from .minio_service import MinioService
+
+class BucketNotificationListener(QThread):
+    """在后台线程中监听存储桶的创建/删除事件（MinIO的listen_bucket_notification扩展接口）"""
+    events_received = pyqtSignal(list)  # 一批事件记录
+    listening_changed = pyqtSignal(bool)
+
+    EVENTS = ("s3:ObjectCreated:*", "s3:ObjectRemoved:*")
+    MAX_RETRY_DELAY = 60  # 秒
+
+    def __init__(self, minio_service: MinioService):
+        super().__init__()
+        self.minio_service = minio_service
+        self._stopped = False
+        self._events = None
+
+    def run(self):
+        delay = 1
+        while not self._stopped:
+            try:
+                self._events = self.minio_service.client.listen_bucket_notification(
+                    bucket_name=self.minio_service.config_manager.get_minio_config()["bucket"],
+                    events=self.EVENTS
+                )
+                self.listening_changed.emit(True)
+                for event in self._events:
+                    if self._stopped:
+                        break
+                    records = event.get("Records") or []
+                    if records:
+                        self.events_received.emit(records)
+                    delay = 1
+            except S3Error as e:
+                if e.code == "NotImplemented":
+                    print("服务器不支持存储桶事件通知，停止监听")
+                    self.listening_changed.emit(False)
+                    return
+                print(f"监听存储桶事件失败: {e}")
+            except Exception as e:
+                if not self._stopped:
+                    print(f"监听存储桶事件失败: {e}")
+            finally:
+                self._close_events()
+
+            if self._stopped:
+                break
+            self.listening_changed.emit(False)
+            # 断线后按指数退避重连
+            deadline = time.monotonic() + delay
+            while not self._stopped and time.monotonic() < deadline:
+                time.sleep(0.2)
+            delay = min(delay * 2, self.MAX_RETRY_DELAY)
+
+    def stop(self):
+        """停止监听并关闭连接，使阻塞中的读取立即返回"""
+        self._stopped = True
+        self._close_events()
+
+    def _close_events(self):
+        """关闭事件流
+
+        minio的EventIterable没有close()，只能通过上下文管理器的退出关闭响应；但关闭响应会等待
+        另一个线程中阻塞的读取（空闲时服务器可能长时间不发送数据），所以先shutdown底层连接，
+        使读取立即返回，再关闭。
+        """
+        events, self._events = self._events, None
+        if events is None:
+            return
+        response = getattr(events, "_response", None)
+        if response is not None and hasattr(response, "shutdown"):  # urllib3 >= 2.3
+            try:
+                response.shutdown()
+            except ValueError:
+                pass  # 连接已释放，没有阻塞的读取需要中断
+        try:
+            events.__exit__(None, None, None)
+        except Exception as e:
+            print(f"关闭存储桶事件连接失败: {e}")
+
+    @staticmethod
+    def record_to_change(record: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """将事件记录转换为 {"removed": bool, "file": 文件记录}"""
+        try:
+            obj = record["s3"]["object"]
+            name = unquote_plus(obj["key"])
+        except (KeyError, TypeError):
+            return None
+        if record.get("eventName", "").startswith("s3:ObjectRemoved:"):
+            return {"removed": True, "file": {"name": name}}
+
+        event_time = record.get("eventTime")
+        try:
+            last_modified = datetime.strptime(event_time, "%Y-%m-%dT%H:%M:%S.%fZ").replace(tzinfo=timezone.utc)
+        except (TypeError, ValueError):
+            last_modified = datetime.now(timezone.utc)
+        return {
+            "removed": False,
+            "file": {
+                "name": name,
+                "size": obj.get("size", 0),
+                "last_modified": last_modified,
+                "etag": obj.get("eTag"),
+                "content_type": obj.get("contentType"),
+                "metadata": obj.get("userMetadata") or {}
+            }
+        }
@@ -0,0 +1,138 @@
+import os
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Tuple
+
+class CatalogStore:
+    """本地SQLite对象目录，按(存储桶, 对象名)缓存列表结果，支持增量对账"""
+
+    def __init__(self, db_path: str = os.path.join("cache", "catalog.db")):
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self._lock = threading.Lock()
+        # 对账在后台线程进行，读取在界面线程进行，由锁保证串行访问
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS objects (
+                bucket TEXT NOT NULL,
+                name TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                etag TEXT,
+                last_modified REAL,
+                content_type TEXT,
+                PRIMARY KEY (bucket, name)
+            ) WITHOUT ROWID
+        """)
+        self._conn.commit()
+
+    def iter_records(self, bucket: str, page_size: int = 500) -> Iterator[List[Dict[str, Any]]]:
+        """分页读取缓存中某个存储桶的全部记录"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT name, size, etag, last_modified, content_type FROM objects "
+                "WHERE bucket = ? ORDER BY name",
+                (bucket,)
+            ).fetchall()
+        for start in range(0, len(rows), page_size):
+            yield [self._row_to_record(row) for row in rows[start:start + page_size]]
+
+    def count(self, bucket: str) -> int:
+        """缓存中某个存储桶的对象数"""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM objects WHERE bucket = ?", (bucket,)
+            ).fetchone()[0]
+
+    def reconcile(self, bucket: str, pages: Iterable[List[Dict[str, Any]]]) -> Iterator[Dict[str, list]]:
+        """用一次完整列举的结果与缓存对账，只写入发生变化的行
+
+        每处理一页产出一个变更 {"added": [...], "updated": [...], "removed": [...]}，
+        列举全部完成后才删除服务器上已不存在的对象；列举中途出错时不会删除任何行。
+        """
+        with self._lock:
+            known = {
+                name: (size, etag, last_modified)
+                for name, size, etag, last_modified in self._conn.execute(
+                    "SELECT name, size, etag, last_modified FROM objects WHERE bucket = ?",
+                    (bucket,)
+                )
+            }
+
+        for page in pages:
+            added, updated = [], []
+            for record in page:
+                old = known.pop(record["name"], None)
+                if old is None:
+                    added.append(record)
+                elif old != self._signature(record):
+                    updated.append(record)
+            if added or updated:
+                self._upsert(bucket, added + updated)
+                yield {"added": added, "updated": updated, "removed": []}
+
+        removed = list(known)
+        if removed:
+            with self._lock:
+                self._conn.executemany(
+                    "DELETE FROM objects WHERE bucket = ? AND name = ?",
+                    [(bucket, name) for name in removed]
+                )
+                self._conn.commit()
+            yield {"added": [], "updated": [], "removed": removed}
+
+    def apply(self, bucket: str, delta: Dict[str, list]):
+        """直接写入一组已知的变更（来自事件通知或本地操作）"""
+        records = delta["added"] + delta["updated"]
+        if records:
+            self._upsert(bucket, records)
+        if delta["removed"]:
+            with self._lock:
+                self._conn.executemany(
+                    "DELETE FROM objects WHERE bucket = ? AND name = ?",
+                    [(bucket, name) for name in delta["removed"]]
+                )
+                self._conn.commit()
+
+    def clear(self, bucket: Optional[str] = None):
+        """清空缓存"""
+        with self._lock:
+            if bucket is None:
+                self._conn.execute("DELETE FROM objects")
+            else:
+                self._conn.execute("DELETE FROM objects WHERE bucket = ?", (bucket,))
+            self._conn.commit()
+
+    def _upsert(self, bucket: str, records: List[Dict[str, Any]]):
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO objects "
+                "(bucket, name, size, etag, last_modified, content_type) VALUES (?, ?, ?, ?, ?, ?)",
+                [(bucket, record["name"]) + self._signature(record) + (record.get("content_type"),)
+                 for record in records]
+            )
+            self._conn.commit()
+
+    @staticmethod
+    def _signature(record: Dict[str, Any]) -> Tuple[int, Optional[str], Optional[float]]:
+        """用于判断对象是否变化的字段（大小、ETag、修改时间）"""
+        last_modified = record.get("last_modified")
+        return (
+            record["size"],
+            record.get("etag"),
+            last_modified.timestamp() if last_modified else None
+        )
+
+    @staticmethod
+    def _row_to_record(row) -> Dict[str, Any]:
+        name, size, etag, last_modified, content_type = row
+        return {
+            "name": name,
+            "size": size,
+            "last_modified": datetime.fromtimestamp(last_modified, tz=timezone.utc) if last_modified else None,
+            "etag": etag,
+            "content_type": content_type,
+            "metadata": {}
+        }
@@ -0,0 +1,130 @@
+from typing import Dict
+import urllib3
+from PyQt5.QtCore import QObject, QThreadPool, QTimer, pyqtSignal
+from ..worker import Worker
+from .minio_service import MinioService
+
+class ConnectionManager(QObject):
+    """在后台建立并维护与MinIO服务器的连接
+
+    启动时不等待网络：连接检查在线程池中执行，结果通过state_changed信号通知。
+    连接失败或请求因网络错误失败时进入离线状态，并按指数退避自动重连；
+    离线期间各页面继续使用本地目录中缓存的列表。
+    """
+    # 连接状态
+    CONNECTING = "connecting"
+    CONNECTED = "connected"
+    OFFLINE = "offline"
+
+    state_changed = pyqtSignal(str)
+    error = pyqtSignal(str)
+
+    CHECK_TIMEOUT = 10  # 单次连接检查的超时（秒）
+    MIN_RETRY_DELAY = 1  # 秒
+    MAX_RETRY_DELAY = 60  # 秒
+
+    _instances: Dict[int, "ConnectionManager"] = {}
+
+    @classmethod
+    def instance(cls, minio_service: MinioService) -> "ConnectionManager":
+        """获取与minio_service对应的共享连接状态"""
+        key = id(minio_service)
+        if key not in cls._instances:
+            cls._instances[key] = cls(minio_service)
+        return cls._instances[key]
+
+    @staticmethod
+    def is_connection_error(exc: BaseException) -> bool:
+        """是否为网络层面的错误（服务器无法访问、超时、连接中断），而不是服务器返回的错误"""
+        return isinstance(exc, (urllib3.exceptions.HTTPError, ConnectionError, TimeoutError))
+
+    def __init__(self, minio_service: MinioService):
+        super().__init__()
+        self.minio_service = minio_service
+        self.state = self.OFFLINE
+        self.last_error = ""
+        self.retry_delay = self.MIN_RETRY_DELAY
+        self.thread_pool = QThreadPool()
+        self.thread_pool.setMaxThreadCount(1)
+        self._worker = None
+        self._retry_timer = QTimer(self)
+        self._retry_timer.setSingleShot(True)
+        self._retry_timer.timeout.connect(self.connect_to_server)
+        self.connect_to_server()
+
+    def is_connected(self) -> bool:
+        return self.state == self.CONNECTED
+
+    def is_offline(self) -> bool:
+        return self.state == self.OFFLINE
+
+    def seconds_until_retry(self) -> int:
+        """距下次自动重连的秒数，没有安排重连时为0"""
+        if not self._retry_timer.isActive():
+            return 0
+        return max(0, round(self._retry_timer.remainingTime() / 1000))
+
+    def connect_to_server(self):
+        """在后台检查连接；已有检查进行中时忽略"""
+        if self._worker is not None:
+            return
+        self._retry_timer.stop()
+        config = self.minio_service.config_manager.get_minio_config()
+        worker = Worker(MinioService.check_connection, config, self.CHECK_TIMEOUT)
+        worker.signals.result.connect(self._handle_connected)
+        worker.signals.error.connect(self._handle_failed)
+        worker.signals.finished.connect(self._handle_finished)
+        self._worker = worker
+        self._set_state(self.CONNECTING)
+        self.thread_pool.start(worker)
+
+    def reconnect_now(self):
+        """立即重连（例如用户点击了重新连接），退避时间从头计算"""
+        self.retry_delay = self.MIN_RETRY_DELAY
+        self.connect_to_server()
+
+    def report_error(self, exc: BaseException):
+        """请求失败时调用；网络错误使连接进入离线状态并安排重连"""
+        if not self.is_connection_error(exc) or self.state != self.CONNECTED:
+            return
+        print(f"与MinIO服务器的连接中断: {exc}")
+        self._go_offline(str(exc))
+
+    def _handle_connected(self, _):
+        config = self.minio_service.config_manager.get_minio_config()
+        print("MinIO服务器连接成功")
+        self.minio_service.logger.log_minio_connection(
+            endpoint=config["endpoint"],
+            bucket=config["bucket"],
+            success=True
+        )
+        self.retry_delay = self.MIN_RETRY_DELAY
+        self.last_error = ""
+        self._set_state(self.CONNECTED)
+
+    def _handle_failed(self, message: str):
+        config = self.minio_service.config_manager.get_minio_config()
+        print(f"连接MinIO服务器失败: {message}，{self.retry_delay}秒后重试")
+        self.minio_service.logger.log_minio_connection(
+            endpoint=config["endpoint"],
+            bucket=config["bucket"],
+            success=False,
+            error_msg=message
+        )
+        self._go_offline(message)
+
+    def _handle_finished(self):
+        self._worker = None
+
+    def _go_offline(self, message: str):
+        """进入离线状态，按当前退避时间安排重连，下次的退避时间加倍"""
+        self.last_error = message
+        self._retry_timer.start(int(self.retry_delay * 1000))
+        self.retry_delay = min(self.retry_delay * 2, self.MAX_RETRY_DELAY)
+        self._set_state(self.OFFLINE)
+        self.error.emit(message)
+
+    def _set_state(self, state: str):
+        if state != self.state:
+            self.state = state
+            self.state_changed.emit(state)
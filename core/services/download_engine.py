@@ -0,0 +1,167 @@
+import os
+import json
+import math
+import time
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Set
+import urllib3
+from .minio_service import MinioService
+
+class DownloadCancelled(Exception):
+    """下载被取消"""
+
+
+class DownloadVerifyError(Exception):
+    """下载完成后大小或ETag与服务器上的对象不一致"""
+
+
+class RangedDownloadEngine:
+    """分段并发下载，支持断点续传
+
+    大文件按part_size拆成多个字节范围，用Range请求并发下载，直接写入预先分配好大小的
+    "<目标>.part"文件中各自的位置。每完成一段就记录到旁边的"<目标>.part.json"，
+    取消、暂停或程序崩溃后再次下载同一对象时只下载还没完成的段。
+    每个请求都带If-Match，下载过程中对象被覆盖会失败而不是拼出混合的内容；
+    完成后检查大小，单次上传的对象（ETag为MD5）还会校验MD5，然后才替换目标文件。
+    """
+    CHUNK_SIZE = 256 * 1024
+    PART_RETRIES = 3
+
+    def __init__(self, minio_service: MinioService, part_size: int = 16 * 1024 * 1024, concurrency: int = 4):
+        self.minio_service = minio_service
+        self.part_size = max(self.CHUNK_SIZE, part_size)
+        self.concurrency = max(1, concurrency)
+
+    @property
+    def bucket(self) -> str:
+        return self.minio_service.config_manager.get_minio_config()["bucket"]
+
+    def download(self, object_name: str, file_path: str, on_progress: Callable[[int], None] = lambda n: None,
+                 cancelled: Callable[[], bool] = lambda: False) -> str:
+        """下载对象到file_path，返回ETag；on_progress(新写入的字节数)在下载线程中调用
+
+        失败时抛出异常并保留已下载的部分，取消时抛出DownloadCancelled。
+        """
+        stat = self.minio_service.client.stat_object(self.bucket, object_name)
+        size, etag = stat.size, stat.etag
+        part_path = file_path + ".part"
+        state_path = part_path + ".json"
+        done = self._load_state(state_path, part_path, object_name, size, etag)
+        if not done:
+            # 新的下载：预先分配文件大小，各段可以直接写入自己的位置
+            with open(part_path, "wb") as f:
+                f.truncate(size)
+        count = max(1, math.ceil(size / self.part_size))
+        on_progress(sum(self._part_length(number, size) for number in done))
+
+        lock = threading.Lock()
+        failed = threading.Event()  # 一段失败后，其他段不再继续下载
+        part_cancelled = lambda: failed.is_set() or cancelled()
+
+        def fetch(number: int):
+            self._fetch(object_name, etag, part_path, number * self.part_size,
+                        self._part_length(number, size), on_progress, part_cancelled)
+            with lock:
+                done.add(number)
+                self._save_state(state_path, object_name, size, etag, done)
+
+        pending = [number for number in range(count) if number not in done]
+        if pending:
+            with ThreadPoolExecutor(max_workers=min(self.concurrency, len(pending))) as pool:
+                futures = [pool.submit(fetch, number) for number in pending]
+                try:
+                    for future in futures:
+                        future.result()
+                except BaseException:
+                    failed.set()
+                    for future in futures:
+                        future.cancel()
+                    raise
+
+        self._verify(part_path, size, etag)
+        os.replace(part_path, file_path)
+        self._remove(state_path)
+        return etag
+
+    def _part_length(self, number: int, size: int) -> int:
+        return max(0, min(self.part_size, size - number * self.part_size))
+
+    def _fetch(self, object_name: str, etag: str, part_path: str, offset: int, length: int,
+               on_progress, cancelled):
+        """下载一段并写入.part文件中对应的位置；网络错误时重试"""
+        if length == 0:
+            return
+        for attempt in range(1, self.PART_RETRIES + 1):
+            written = 0
+            try:
+                response = self.minio_service.client.get_object(
+                    self.bucket, object_name, offset=offset, length=length,
+                    request_headers={"If-Match": f'"{etag}"'})
+                try:
+                    with open(part_path, "r+b") as f:
+                        f.seek(offset)
+                        for chunk in response.stream(self.CHUNK_SIZE):
+                            if cancelled():
+                                raise DownloadCancelled()
+                            f.write(chunk)
+                            written += len(chunk)
+                            on_progress(len(chunk))
+                finally:
+                    response.close()
+                    response.release_conn()
+                if written != length:
+                    raise OSError(f"数据不完整: {written}/{length}")
+                return
+            except (urllib3.exceptions.HTTPError, OSError) as e:
+                # S3Error(如If-Match不满足)不在这里重试
+                on_progress(-written)  # 重试时这部分会重新下载
+                if attempt == self.PART_RETRIES:
+                    raise
+                print(f"下载分段失败，正在重试: {object_name} @{offset}, {e}")
+                time.sleep(attempt)
+            except BaseException:
+                on_progress(-written)
+                raise
+
+    def _verify(self, part_path: str, size: int, etag: str):
+        actual = os.path.getsize(part_path)
+        if actual != size:
+            raise DownloadVerifyError(f"文件大小不一致: {actual} != {size}")
+        if "-" in etag or len(etag) != 32:
+            return  # 分片上传的ETag不是整个文件的MD5，只能检查大小
+        md5 = hashlib.md5()
+        with open(part_path, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                md5.update(chunk)
+        if md5.hexdigest() != etag.lower():
+            self._remove(part_path + ".json")  # 已下载的数据不可信，下次从头下载
+            raise DownloadVerifyError(f"MD5校验失败: {md5.hexdigest()} != {etag}")
+
+    def _load_state(self, state_path: str, part_path: str, object_name: str, size: int, etag: str) -> Set[int]:
+        """读取已完成的段；对象或分段大小变了、.part文件不对时从头下载"""
+        try:
+            with open(state_path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+            if (state.get("object") == object_name and state.get("size") == size and state.get("etag") == etag
+                    and state.get("part_size") == self.part_size and os.path.getsize(part_path) == size):
+                return set(state.get("done", []))
+        except (OSError, ValueError):
+            pass
+        return set()
+
+    def _save_state(self, state_path: str, object_name: str, size: int, etag: str, done: Set[int]):
+        state = {"object": object_name, "size": size, "etag": etag, "part_size": self.part_size,
+                 "done": sorted(done)}
+        temp_path = state_path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(temp_path, state_path)
+
+    @staticmethod
+    def _remove(path: str):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
@@ -0,0 +1,253 @@
+import os
+import json
+import hashlib
+from typing import Dict, List, Optional, Tuple
+from PyQt5.QtCore import QObject, pyqtSignal
+from .transfer_scheduler import TransferJob
+
+SYNC_STATE_FILE = ".minio_sync.json"  # 保存在本地文件夹中，记录上次同步时两边的状态
+
+# 同步方向
+BOTH = "both"
+UPLOAD_ONLY = "upload"
+DOWNLOAD_ONLY = "download"
+
+# 操作
+UPLOAD = "upload"
+DOWNLOAD = "download"
+
+
+def scan_local(root: str) -> Dict[str, Tuple[int, float]]:
+    """本地文件夹中的文件：相对路径（用"/"分隔） -> (大小, 修改时间)
+
+    只读取目录项的stat，不打开文件；跳过同步状态文件和未完成的下载。
+    """
+    files = {}
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        try:
+            entries = list(os.scandir(directory))
+        except OSError as e:
+            print(f"读取文件夹失败: {directory}, {e}")
+            continue
+        names = {entry.name for entry in entries}
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                stack.append(entry.path)
+                continue
+            if not entry.is_file() or entry.name == SYNC_STATE_FILE or is_download_part(entry.name, names):
+                continue
+            stat = entry.stat()
+            relative = os.path.relpath(entry.path, root).replace(os.sep, "/")
+            files[relative] = (stat.st_size, stat.st_mtime)
+    return files
+
+
+def is_download_part(name: str, names) -> bool:
+    """name是否为下载引擎在同一文件夹中留下的文件："<目标>.part"及其状态文件"<目标>.part.json"
+
+    只有数据文件和状态文件同时存在时才算，单独一个以.part或.part.json结尾的文件是用户自己的文件。
+    """
+    if name.endswith(".part"):
+        return name + ".json" in names
+    for suffix in (".json", ".json.tmp"):
+        if name.endswith(".part" + suffix):
+            return name[:-len(suffix)] in names
+    return False
+
+
+def list_remote(minio_service, prefix: str) -> Dict[str, Tuple[int, Optional[float], Optional[str]]]:
+    """从服务器重新列举前缀下的对象：相对路径 -> (大小, 修改时间, ETag)；出错时抛出异常，需在后台线程中调用"""
+    bucket = minio_service.config_manager.get_minio_config()["bucket"]
+    files = {}
+    for obj in minio_service.client.list_objects(bucket, prefix=prefix, recursive=True):
+        if obj.object_name.endswith("/"):
+            continue  # 文件夹占位对象
+        mtime = obj.last_modified.timestamp() if obj.last_modified else None
+        files[obj.object_name[len(prefix):]] = (obj.size or 0, mtime, obj.etag)
+    return files
+
+
+def file_md5(path: str) -> str:
+    md5 = hashlib.md5()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            md5.update(chunk)
+    return md5.hexdigest()
+
+
+def is_md5_etag(etag: Optional[str]) -> bool:
+    """单次上传的对象ETag是内容的MD5，分片上传的带"-分片数"后缀"""
+    return bool(etag) and len(etag) == 32 and "-" not in etag
+
+
+class SyncPlan:
+    """本地文件夹与前缀之间的差异，以及为消除差异要执行的上传和下载
+
+    两边的变化都以上次同步的状态为基准判断：本地看大小和修改时间，远端看ETag。
+    只有一边变化时按该边同步，两边都变化时保留修改时间较新的一边（记为冲突）。
+    删除不会同步到另一边，只在跳过列表中列出。
+    """
+
+    def __init__(self, root: str, prefix: str, bucket: str, direction: str = BOTH):
+        self.root = root
+        self.prefix = prefix
+        self.bucket = bucket
+        self.direction = direction
+        self.actions: List[Tuple[str, str, str]] = []  # (操作, 相对路径, 原因)
+        self.skipped: List[Tuple[str, str]] = []  # (相对路径, 原因)
+        self.unchanged = 0
+        self.local: Dict[str, Tuple[int, float]] = {}
+        self.remote: Dict[str, Tuple[int, Optional[float], Optional[str]]] = {}
+        # 相对路径 -> [本地大小, 本地修改时间, ETag]，同步成功后写回状态文件
+        self.state: Dict[str, list] = {}
+
+    @property
+    def state_path(self) -> str:
+        return os.path.join(self.root, SYNC_STATE_FILE)
+
+    def local_path(self, relative: str) -> str:
+        return os.path.join(self.root, *relative.split("/"))
+
+    def count(self, action: str) -> int:
+        return sum(1 for item in self.actions if item[0] == action)
+
+    def total_size(self, action: str) -> int:
+        if action == UPLOAD:
+            return sum(self.local[path][0] for item, path, _ in self.actions if item == UPLOAD)
+        return sum(self.remote[path][0] for item, path, _ in self.actions if item == DOWNLOAD)
+
+    def load_state(self):
+        """读取上次同步的状态；存储桶或前缀不同时视为从未同步"""
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+            if state.get("bucket") == self.bucket and state.get("prefix") == self.prefix:
+                self.state = state.get("files", {})
+        except (OSError, ValueError):
+            self.state = {}
+
+    def save_state(self):
+        state = {"bucket": self.bucket, "prefix": self.prefix, "files": self.state}
+        temp_path = self.state_path + ".tmp"
+        try:
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(state, f)
+            os.replace(temp_path, self.state_path)
+        except OSError as e:
+            print(f"保存同步状态失败: {e}")
+
+    def compute(self, remote: Dict[str, Tuple[int, Optional[float], Optional[str]]], check_hash: bool = False):
+        """扫描本地文件并与远端比较；check_hash时大小相同的文件再比较MD5（仅限单次上传的对象）"""
+        self.remote = remote
+        self.local = scan_local(self.root)
+        self.load_state()
+        for path in sorted(self.local.keys() | remote.keys()):
+            local, remote_file, state = self.local.get(path), remote.get(path), self.state.get(path)
+            if local and remote_file:
+                self._compare(path, local, remote_file, state, check_hash)
+            elif local:
+                if state is not None:
+                    self.skipped.append((path, "远端已删除"))
+                else:
+                    self._add(UPLOAD, path, "新文件")
+            elif state is not None:
+                self.skipped.append((path, "本地已删除"))
+            else:
+                self._add(DOWNLOAD, path, "新文件")
+        # 两边都已删除的文件不再记录
+        self.state = {path: entry for path, entry in self.state.items()
+                      if path in self.local or path in remote}
+
+    def _compare(self, path: str, local, remote_file, state, check_hash: bool):
+        size, mtime = local
+        remote_size, remote_mtime, etag = remote_file
+        if state is None:
+            # 第一次比较：大小相同（并且在需要时MD5相同）即视为相同
+            if size == remote_size and self._same_content(path, etag, check_hash):
+                self._keep(path, local, etag)
+            else:
+                self._add_newer(path, mtime, remote_mtime, "内容不同")
+            return
+        local_changed = state[0] != size or state[1] != mtime
+        remote_changed = state[2] != etag
+        if local_changed and not remote_changed and size == remote_size and check_hash \
+                and is_md5_etag(etag) and file_md5(self.local_path(path)) == etag:
+            local_changed = False  # 只是修改时间变了
+        if not local_changed and not remote_changed:
+            self._keep(path, local, etag)
+        elif not remote_changed:
+            self._add(UPLOAD, path, "本地已修改")
+        elif not local_changed:
+            self._add(DOWNLOAD, path, "远端已修改")
+        else:
+            self._add_newer(path, mtime, remote_mtime, "冲突，保留较新的")
+
+    def _same_content(self, path: str, etag: Optional[str], check_hash: bool) -> bool:
+        if not check_hash or not is_md5_etag(etag):
+            return True
+        return file_md5(self.local_path(path)) == etag
+
+    def _keep(self, path: str, local, etag: Optional[str]):
+        self.unchanged += 1
+        self.state[path] = [local[0], local[1], etag]
+
+    def _add_newer(self, path: str, mtime: float, remote_mtime: Optional[float], reason: str):
+        newer_remote = remote_mtime is not None and remote_mtime > mtime
+        self._add(DOWNLOAD if newer_remote else UPLOAD, path, reason)
+
+    def _add(self, action: str, path: str, reason: str):
+        if self.direction == UPLOAD_ONLY and action == DOWNLOAD:
+            self.skipped.append((path, f"仅上传，未下载（{reason}）"))
+        elif self.direction == DOWNLOAD_ONLY and action == UPLOAD:
+            self.skipped.append((path, f"仅下载，未上传（{reason}）"))
+        else:
+            self.actions.append((action, path, reason))
+
+
+class FolderSync(QObject):
+    """通过传输队列执行同步计划，每完成一个文件就更新同步状态，全部结束后写入状态文件"""
+    finished = pyqtSignal(object)  # 同步计划
+
+    def __init__(self, plan: SyncPlan, scheduler, parent=None):
+        super().__init__(parent or scheduler)
+        self.plan = plan
+        self.scheduler = scheduler
+        self.jobs: Dict[int, Tuple[TransferJob, str]] = {}  # id(任务) -> (任务, 相对路径)
+
+    def start(self):
+        plan = self.plan
+        self.scheduler.job_changed.connect(self._job_changed)
+        for action, path, _ in plan.actions:
+            local_path = plan.local_path(path)
+            if action == UPLOAD:
+                job = self.scheduler.upload(local_path, plan.prefix + path)
+            else:
+                os.makedirs(os.path.dirname(local_path), exist_ok=True)
+                job = self.scheduler.download(plan.prefix + path, local_path, plan.remote[path][0])
+            self.jobs[id(job)] = (job, path)
+        if not self.jobs:
+            self._finish()
+
+    def _job_changed(self, job: TransferJob):
+        item = self.jobs.get(id(job))
+        if item is None or item[0] is not job or not job.is_finished():
+            return
+        del self.jobs[id(job)]
+        path = item[1]
+        if job.state == TransferJob.DONE:
+            if job.kind == "upload":
+                size, mtime = self.plan.local[path]
+            else:
+                stat = os.stat(self.plan.local_path(path))
+                size, mtime = stat.st_size, stat.st_mtime
+            self.plan.state[path] = [size, mtime, job.result]
+        if not self.jobs:
+            self._finish()
+
+    def _finish(self):
+        self.scheduler.job_changed.disconnect(self._job_changed)
+        self.plan.save_state()
+        self.finished.emit(self.plan)
+        self.deleteLater()
@@ -1,21 +1,47 @@
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Iterable, Iterator, Tuple
 from datetime import timedelta
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import urllib3
 from minio import Minio
+from minio.commonconfig import CopySource, ComposeSource
+from minio.deleteobjects import DeleteObject
 from minio.error import MinioException
 from ..utils.config_manager import ConfigManager
 from ..utils.logger import LogManager
+from .catalog_store import CatalogStore
+from .sharded_listing import ShardedLister
 import os
 import io
 
 class MinioService:
+    # 按需获取元数据时 stat_object 的最大并发数
+    STAT_POOL_SIZE = 8
+    # 分页列举时每页的记录数
+    LIST_PAGE_SIZE = 500
+    # 分片并发列举的线程数
+    LIST_SHARD_WORKERS = 8
+    # 单次服务器端复制的大小上限，更大的对象用分片复制
+    COPY_LIMIT = 5 * 1024 ** 3
+    # 按前缀重命名时同时进行的复制数
+    COPY_WORKERS = 8
+    # 一次批量删除请求最多包含的对象数（S3的限制）
+    DELETE_BATCH_SIZE = 1000
+
     def __init__(self, config_manager: ConfigManager):
         self.config_manager = config_manager
         self.client = None
         self.logger = LogManager()
+        self._stat_pool = None
+        self._stat_cache: Dict[str, Dict[str, Any]] = {}
+        self._folder_cache: Dict[str, Tuple[List[str], List[Dict[str, Any]]]] = {}
+        self.catalog_store = CatalogStore()
         self.setup_client()
 
     def setup_client(self):
-        """初始化MinIO客户端"""
+        """初始化MinIO客户端
+
+        只创建客户端，不访问网络；连接检查由ConnectionManager在后台进行。
+        """
         try:
             config = self.config_manager.get_minio_config()
             print(f"正在连接MinIO服务器: {config['endpoint']}")
@@ -26,14 +52,6 @@ class MinioService:
                 secret_key=config["secret_key"],
                 secure=config["secure"]
             )
-            # 测试连接
-            self.client.list_buckets()
-            print("MinIO服务器连接成功")
-            self.logger.log_minio_connection(
-                endpoint=config["endpoint"],
-                bucket=config["bucket"],
-                success=True
-            )
         except Exception as e:
             error_msg = str(e)
             print(f"MinIO客户端初始化失败: {error_msg}")
@@ -45,35 +63,167 @@ class MinioService:
             )
             raise
 
+    @staticmethod
+    def check_connection(config: Dict[str, Any], timeout: float = 10) -> None:
+        """用给定配置连接服务器并检查存储桶，失败时抛出异常
+
+        只发出一次HEAD请求，连接和读取都有超时，不会因为服务器无响应而长时间阻塞。
+        """
+        http_client = urllib3.PoolManager(
+            timeout=urllib3.Timeout(connect=timeout, read=timeout),
+            retries=urllib3.Retry(total=0)
+        )
+        client = Minio(
+            endpoint=config["endpoint"],
+            access_key=config["access_key"],
+            secret_key=config["secret_key"],
+            secure=config["secure"],
+            http_client=http_client
+        )
+        try:
+            if not client.bucket_exists(config["bucket"]):
+                raise ValueError(f"存储桶不存在: {config['bucket']}")
+        finally:
+            http_client.clear()
+
     def list_files(self, prefix: str = "") -> List[Dict[str, Any]]:
-        """列出指定前缀的所有文件"""
+        """列出指定前缀的所有文件（仅使用LIST响应，不再逐个stat）"""
+        return [record for page in self.iter_files(prefix) for record in page]
+
+    def iter_files(self, prefix: str = "", page_size: int = LIST_PAGE_SIZE) -> Iterator[List[Dict[str, Any]]]:
+        """分页列出文件，每凑满page_size条记录就产出一页，无需等待整个存储桶列举完成"""
+        try:
+            yield from self._iter_pages(prefix, page_size)
+        except MinioException as e:
+            print(f"列出文件失败: {e}")
+
+    def iter_files_parallel(self, prefix: str = "", page_size: int = LIST_PAGE_SIZE,
+                            workers: int = LIST_SHARD_WORKERS) -> Iterator[List[Dict[str, Any]]]:
+        """分片并发列出文件，结果顺序与iter_files相同，适合对象数很多的存储桶"""
+        try:
+            yield from self._iter_pages(prefix, page_size, workers)
+        except MinioException as e:
+            print(f"列出文件失败: {e}")
+
+    def _iter_pages(self, prefix: str, page_size: int, workers: int = 1) -> Iterator[List[Dict[str, Any]]]:
+        """分页列出文件，出错时直接抛出异常；workers大于1时按前缀分片并发列举"""
+        bucket = self.config_manager.get_minio_config()["bucket"]
+        if workers > 1:
+            records = ShardedLister(self.client, bucket, self._object_to_record, workers).iter_records(prefix)
+        else:
+            records = map(self._object_to_record, self.client.list_objects(
+                bucket_name=bucket,
+                prefix=prefix,
+                recursive=True,
+                include_user_meta=True  # MinIO会在列表中直接返回用户元数据
+            ))
+        page = []
+        for record in records:
+            page.append(record)
+            if len(page) >= page_size:
+                yield page
+                page = []
+        if page:
+            yield page
+
+    def list_folder(self, prefix: str = "", use_cache: bool = True) -> Tuple[List[str], List[Dict[str, Any]]]:
+        """按"/"分隔符只列出一层目录，返回(子文件夹前缀列表, 文件记录列表)，结果按前缀缓存"""
+        if use_cache and prefix in self._folder_cache:
+            return self._folder_cache[prefix]
         try:
             objects = self.client.list_objects(
                 bucket_name=self.config_manager.get_minio_config()["bucket"],
                 prefix=prefix,
-                recursive=True
+                recursive=False,
+                include_user_meta=True
             )
-            
-            files = []
+            folders, files = [], []
             for obj in objects:
-                # 获取文件的元数据
-                stat = self.client.stat_object(
-                    bucket_name=self.config_manager.get_minio_config()["bucket"],
-                    object_name=obj.object_name
-                )
-                
-                files.append({
-                    "name": obj.object_name,
-                    "size": obj.size,
-                    "last_modified": obj.last_modified,
-                    "content_type": stat.content_type,
-                    "metadata": stat.metadata
-                })
-            
-            return files
+                if obj.object_name == prefix:
+                    continue  # 跳过文件夹自身的占位对象
+                if obj.is_dir:
+                    folders.append(obj.object_name)
+                else:
+                    files.append(self._object_to_record(obj))
+            self._folder_cache[prefix] = (folders, files)
+            return folders, files
         except MinioException as e:
-            print(f"列出文件失败: {e}")
-            return []
+            print(f"列出文件夹失败: {e}")
+            return [], []
+
+    def invalidate_folder_cache(self, object_name: Optional[str] = None):
+        """清除目录缓存；指定对象名时只清除其所在文件夹"""
+        if object_name is None:
+            self._folder_cache.clear()
+        else:
+            parent = object_name.rstrip("/").rpartition("/")[0]
+            self._folder_cache.pop(parent + "/" if parent else "", None)
+
+    def iter_cached_files(self, page_size: int = LIST_PAGE_SIZE) -> Iterator[List[Dict[str, Any]]]:
+        """分页读取本地目录中缓存的文件列表（不访问网络）"""
+        bucket = self.config_manager.get_minio_config()["bucket"]
+        return self.catalog_store.iter_records(bucket, page_size)
+
+    def sync_catalog(self, page_size: int = LIST_PAGE_SIZE) -> Iterator[Dict[str, list]]:
+        """重新列举存储桶并与本地目录对账，逐页产出变更"""
+        bucket = self.config_manager.get_minio_config()["bucket"]
+        pages = self._iter_pages("", page_size, self.LIST_SHARD_WORKERS)
+        yield from self.catalog_store.reconcile(bucket, pages)
+
+    def _object_to_record(self, obj) -> Dict[str, Any]:
+        """将list_objects返回的对象转换为文件记录"""
+        record = {
+            "name": obj.object_name,
+            "size": obj.size or 0,
+            "last_modified": obj.last_modified,
+            "etag": obj.etag,
+            # 服务器不支持在列表中返回元数据时为None，可通过stat_files按需获取
+            "content_type": obj.content_type,
+            "metadata": dict(obj.metadata) if obj.metadata else {}
+        }
+        if record["content_type"] is not None:
+            # 列表中已带元数据，预览时无需再stat
+            self._stat_cache[record["name"]] = {
+                "content_type": record["content_type"],
+                "metadata": record["metadata"]
+            }
+        return record
+
+    def stat_files(self, object_names: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """按需并发获取文件的内容类型和元数据，结果会被缓存"""
+        object_names = list(object_names)
+        pending = [name for name in object_names if name not in self._stat_cache]
+        if pending:
+            if self._stat_pool is None:
+                self._stat_pool = ThreadPoolExecutor(max_workers=self.STAT_POOL_SIZE)
+            for name, info in zip(pending, self._stat_pool.map(self._stat_one, pending)):
+                if info is not None:
+                    self._stat_cache[name] = info
+        return {name: self._stat_cache[name] for name in object_names if name in self._stat_cache}
+
+    def _stat_one(self, object_name: str) -> Optional[Dict[str, Any]]:
+        """获取单个文件的元数据"""
+        try:
+            stat = self.client.stat_object(
+                bucket_name=self.config_manager.get_minio_config()["bucket"],
+                object_name=object_name
+            )
+            metadata = stat.metadata or {}
+            return {
+                "content_type": stat.content_type,
+                # stat返回全部响应头，这里只保留用户元数据
+                "metadata": {k: v for k, v in metadata.items() if k.lower().startswith("x-amz-meta-")}
+            }
+        except MinioException as e:
+            print(f"获取文件元数据失败: {object_name}, {e}")
+            return None
+
+    def invalidate_stat_cache(self, object_name: Optional[str] = None):
+        """清除元数据缓存（文件被修改或删除后调用）"""
+        if object_name is None:
+            self._stat_cache.clear()
+        else:
+            self._stat_cache.pop(object_name, None)
 
     def upload_file(self, file_path: str, object_name: Optional[str] = None) -> bool:
         """上传文件到MinIO"""
@@ -86,6 +236,8 @@ class MinioService:
                 object_name=object_name,
                 file_path=file_path
             )
+            self.invalidate_stat_cache(object_name)
+            self.invalidate_folder_cache(object_name)
             return True
         except MinioException as e:
             print(f"上传文件失败: {e}")
@@ -104,6 +256,40 @@ class MinioService:
             print(f"下载文件失败: {e}")
             return False
 
+    def read_file(self, object_name: str) -> Optional[bytes]:
+        """读取整个文件的内容，适合图片等较小的文件"""
+        try:
+            response = self.client.get_object(
+                bucket_name=self.config_manager.get_minio_config()["bucket"],
+                object_name=object_name
+            )
+            try:
+                return response.read()
+            finally:
+                response.close()
+                response.release_conn()
+        except MinioException as e:
+            print(f"读取文件失败: {object_name}, {e}")
+            return None
+
+    def read_range(self, object_name: str, offset: int, length: int) -> Optional[bytes]:
+        """用Range请求读取文件中从offset开始的length个字节，不下载整个文件"""
+        try:
+            response = self.client.get_object(
+                bucket_name=self.config_manager.get_minio_config()["bucket"],
+                object_name=object_name,
+                offset=offset,
+                length=length
+            )
+            try:
+                return response.read()
+            finally:
+                response.close()
+                response.release_conn()
+        except MinioException as e:
+            print(f"读取文件失败: {object_name}, {e}")
+            return None
+
     def delete_file(self, object_name: str) -> bool:
         """删除MinIO中的文件"""
         try:
@@ -111,6 +297,8 @@ class MinioService:
                 bucket_name=self.config_manager.get_minio_config()["bucket"],
                 object_name=object_name
             )
+            self.invalidate_stat_cache(object_name)
+            self.invalidate_folder_cache(object_name)
             return True
         except MinioException as e:
             print(f"删除文件失败: {e}")
@@ -133,8 +321,8 @@ class MinioService:
             self.logger.log_error("获取预签名URL失败", f"文件: {object_name}, 错误: {error_msg}")
             return None
 
-    def get_bucket_size(self) -> int:
-        """获取存储桶的总大小（字节）"""
+    def get_bucket_size(self) -> Optional[int]:
+        """获取存储桶的总大小（字节），失败时返回None"""
         try:
             total_size = 0
             objects = self.client.list_objects(
@@ -146,7 +334,7 @@ class MinioService:
             return total_size
         except MinioException as e:
             print(f"获取存储桶大小失败: {e}")
-            return 0
+            return None
 
     def create_folder(self, folder_name: str) -> bool:
         """在MinIO中创建文件夹（实际上是创建一个空对象）"""
@@ -162,43 +350,95 @@ class MinioService:
                 data=io.BytesIO(b""),
                 length=0
             )
+            self.invalidate_folder_cache(folder_name)
             return True
         except MinioException as e:
             print(f"创建文件夹失败: {e}")
             return False
 
+    def copy_file(self, source: str, target: str, size: Optional[int] = None):
+        """在服务器端复制对象，数据不经过客户端；超过5GiB的对象用分片复制（compose_object）"""
+        bucket = self.config_manager.get_minio_config()["bucket"]
+        stat = None
+        if size is None or size > self.COPY_LIMIT:
+            stat = self.client.stat_object(bucket_name=bucket, object_name=source)
+            size = stat.size
+        if size <= self.COPY_LIMIT:
+            self.client.copy_object(bucket, target, CopySource(bucket, source))
+        else:
+            # 分片复制不会带上原对象的元数据，需要显式指定
+            metadata = {key: value for key, value in (stat.metadata or {}).items()
+                        if key.lower().startswith("x-amz-meta-")}
+            if stat.content_type:
+                metadata["Content-Type"] = stat.content_type
+            self.client.compose_object(bucket, target, [ComposeSource(bucket, source)], metadata=metadata)
+        self.invalidate_stat_cache(target)
+        self.invalidate_folder_cache(target)
+
     def rename_file(self, old_name: str, new_name: str) -> bool:
-        """重命名MinIO中的文件（通过复制和删除实现）"""
+        """重命名MinIO中的文件（在服务器端复制后删除原文件）"""
         try:
-            # 获取源对象
-            data = self.client.get_object(
-                bucket_name=self.config_manager.get_minio_config()["bucket"],
-                object_name=old_name
-            )
-            
-            # 获取源对象的元数据
-            stat = self.client.stat_object(
-                bucket_name=self.config_manager.get_minio_config()["bucket"],
-                object_name=old_name
-            )
-            
-            # 复制对象到新名称
-            self.client.put_object(
-                bucket_name=self.config_manager.get_minio_config()["bucket"],
-                object_name=new_name,
-                data=data,
-                length=stat.size,
-                content_type=stat.content_type,
-                metadata=stat.metadata
-            )
-            
-            # 删除原对象
+            self.copy_file(old_name, new_name)
             self.client.remove_object(
                 bucket_name=self.config_manager.get_minio_config()["bucket"],
                 object_name=old_name
             )
-            
+            self.invalidate_stat_cache(old_name)
+            self.invalidate_folder_cache(old_name)
             return True
-        except MinioException as e:
+        except (MinioException, ValueError) as e:
             print(f"重命名文件失败: {e}")
-            return False 
\ No newline at end of file
+            return False
+
+    def rename_prefix(self, old_prefix: str, new_prefix: str) -> Dict[str, list]:
+        """重命名文件夹：并发复制前缀下的所有对象，全部复制后批量删除原对象
+
+        返回{"renamed": [(原名称, 新名称, 大小)], "failed": [(原名称, 错误信息)]}；
+        复制失败的对象保留原样，不会被删除。
+        """
+        bucket = self.config_manager.get_minio_config()["bucket"]
+        objects = [(obj.object_name, obj.size)
+                   for obj in self.client.list_objects(bucket, prefix=old_prefix, recursive=True)]
+        copied, failed = [], []
+        with ThreadPoolExecutor(max_workers=self.COPY_WORKERS) as pool:
+            futures = {
+                pool.submit(self.copy_file, name, new_prefix + name[len(old_prefix):], size): (name, size)
+                for name, size in objects
+            }
+            for future in as_completed(futures):
+                name, size = futures[future]
+                try:
+                    future.result()
+                    copied.append((name, new_prefix + name[len(old_prefix):], size))
+                except (MinioException, ValueError) as e:
+                    print(f"复制文件失败: {name}, {e}")
+                    failed.append((name, str(e)))
+        errors = self.delete_files([name for name, _, _ in copied])
+        renamed = [item for item in copied if item[0] not in errors]
+        failed += [(name, f"已复制，但删除原文件失败: {message}") for name, message in errors.items()]
+        return {"renamed": renamed, "failed": failed}
+
+    def delete_files(self, object_names: List[str]) -> Dict[str, str]:
+        """批量删除文件，每次请求最多DELETE_BATCH_SIZE个；返回删除失败的{对象名: 错误信息}"""
+        bucket = self.config_manager.get_minio_config()["bucket"]
+        errors = {}
+        for start in range(0, len(object_names), self.DELETE_BATCH_SIZE):
+            batch = object_names[start:start + self.DELETE_BATCH_SIZE]
+            try:
+                # remove_objects是惰性的，遍历结果时才发出请求
+                for error in self.client.remove_objects(bucket, [DeleteObject(name) for name in batch]):
+                    errors[error.name] = error.message or error.code
+            except MinioException as e:
+                print(f"批量删除文件失败: {e}")
+                errors.update((name, str(e)) for name in batch)
+        for name in object_names:
+            self.invalidate_stat_cache(name)
+        self.invalidate_folder_cache()
+        return errors
+
+    def delete_prefix(self, prefix: str) -> Dict[str, Any]:
+        """删除前缀（文件夹）下的所有对象，返回{"deleted": [对象名], "errors": {对象名: 错误信息}}"""
+        bucket = self.config_manager.get_minio_config()["bucket"]
+        names = [obj.object_name for obj in self.client.list_objects(bucket, prefix=prefix, recursive=True)]
+        errors = self.delete_files(names)
+        return {"deleted": [name for name in names if name not in errors], "errors": errors}
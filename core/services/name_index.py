@@ -0,0 +1,154 @@
+import re
+import fnmatch
+from array import array
+from bisect import bisect_left
+from typing import List, Dict, Iterable, Callable, Optional, Set
+
+# 搜索模式
+SUBSTRING = "substring"
+PREFIX = "prefix"
+GLOB = "glob"
+REGEX = "regex"
+SEARCH_MODES = (SUBSTRING, PREFIX, GLOB, REGEX)
+
+_MAX_CHAR = chr(0x10FFFF)
+
+
+def _trigrams(text: str) -> Set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def compile_matcher(query: str, mode: str = SUBSTRING) -> Optional[Callable[[str], bool]]:
+    """将查询编译为判断单个对象名的函数（不区分大小写）；查询为空时返回None
+
+    正则表达式无效时抛出re.error。
+    """
+    if not query:
+        return None
+    if mode == REGEX:
+        # 大小写由IGNORECASE处理；转成小写会改变\D、\S、\W、\B、\Z等转义的含义
+        pattern = re.compile(query, re.IGNORECASE)
+        return lambda name: pattern.search(name) is not None
+    query = query.lower()
+    if mode == PREFIX:
+        return lambda name: name.lower().startswith(query)
+    if mode == GLOB:
+        pattern = re.compile(fnmatch.translate(query))
+        return lambda name: pattern.match(name.lower()) is not None
+    return lambda name: query in name.lower()
+
+
+class NameIndex:
+    """对象名索引，构建一次后可反复查询（不区分大小写）
+
+    - 前缀：在排序后的名称上二分查找
+    - 包含：用三字符组(trigram)倒排表求交集后再校验，查询少于3个字符时逐个比较
+    - 通配符：先用模式中的固定前缀和最长的固定片段缩小候选范围，再用正则校验
+    - 正则：逐个匹配
+    """
+
+    SCAN_LIMIT = 4096  # 候选少于该数量时直接校验，不再查倒排表
+
+    def __init__(self, names: Iterable[str], version: int = 0, rows: Optional[Iterable[int]] = None):
+        """rows为每个名称在目录中的行号，默认按名称的先后编号"""
+        self.version = version
+        names = list(names)
+        rows = range(len(names)) if rows is None else rows
+        keys = sorted((name.lower(), name, row) for name, row in zip(names, rows))
+        del names
+        self._keys: List[str] = [key for key, _, _ in keys]
+        # 只为大小写与小写形式不同的名称保存原名
+        self._originals: Dict[int, str] = {
+            i: name for i, (key, name, _) in enumerate(keys) if key != name
+        }
+        self.rows = array("q", (row for _, _, row in keys))  # 按名称排序后的目录行号
+        del keys
+        self._postings: Dict[str, array] = {}
+        for i, key in enumerate(self._keys):
+            for gram in _trigrams(key):
+                posting = self._postings.get(gram)
+                if posting is None:
+                    posting = self._postings[gram] = array("I")
+                posting.append(i)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def search(self, query: str, mode: str = SUBSTRING) -> Optional[Set[str]]:
+        """返回匹配的对象名集合；查询为空时返回None，表示不过滤
+
+        正则表达式无效时抛出re.error。
+        """
+        if not query:
+            return None
+        return {self._name(i) for i in self.search_ids(query, mode)}
+
+    def search_rows(self, query: str, mode: str = SUBSTRING) -> List[int]:
+        """返回匹配名称的目录行号"""
+        if not query:
+            return list(self.rows)
+        return [self.rows[i] for i in self.search_ids(query, mode)]
+
+    def search_ids(self, query: str, mode: str = SUBSTRING) -> Iterable[int]:
+        """返回匹配名称在排序后名称列表中的编号"""
+        if mode == REGEX:
+            # 正则不转小写，见compile_matcher
+            pattern = re.compile(query, re.IGNORECASE)
+            return [i for i, key in enumerate(self._keys) if pattern.search(self._name(i, key))]
+        query = query.lower()
+        if mode == PREFIX:
+            return range(*self._prefix_range(query))
+        if mode == GLOB:
+            return self._search_glob(query)
+        return self._search_substring(query)
+
+    def _name(self, i: int, key: Optional[str] = None) -> str:
+        original = self._originals.get(i)
+        if original is not None:
+            return original
+        return self._keys[i] if key is None else key
+
+    def _prefix_range(self, prefix: str):
+        return (bisect_left(self._keys, prefix),
+                bisect_left(self._keys, prefix + _MAX_CHAR))
+
+    def _candidates(self, text: str) -> Optional[Iterable[int]]:
+        """包含text的候选编号；text少于3个字符时返回None（无法用索引）"""
+        grams = _trigrams(text)
+        if not grams:
+            return None
+        postings = []
+        for gram in grams:
+            posting = self._postings.get(gram)
+            if posting is None:
+                return []
+            postings.append(posting)
+        postings.sort(key=len)
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            if len(candidates) <= 64:
+                break  # 候选已经很少，直接校验比继续求交集更快
+            candidates.intersection_update(posting)
+        return sorted(candidates)
+
+    def _search_substring(self, query: str) -> List[int]:
+        candidates = self._candidates(query)
+        if candidates is None:
+            return [i for i, key in enumerate(self._keys) if query in key]
+        return [i for i in candidates if query in self._keys[i]]
+
+    def _search_glob(self, query: str) -> List[int]:
+        pattern = re.compile(fnmatch.translate(query))
+        literals = [part for part in re.split(r"\*|\?|\[[^\]]*\]", query) if part]
+        candidates = None
+        if literals and query.startswith(literals[0]):
+            start, stop = self._prefix_range(literals[0])
+            candidates = range(start, stop)
+        longest = max(literals, key=len, default="")
+        if len(longest) >= 3 and (candidates is None or len(candidates) > self.SCAN_LIMIT):
+            by_trigram = self._candidates(longest)
+            if candidates is None or len(by_trigram) < len(candidates):
+                candidates = by_trigram
+        if candidates is None:
+            candidates = range(len(self._keys))
+        return [i for i in candidates if pattern.match(self._keys[i])]
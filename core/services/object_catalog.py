@@ -0,0 +1,419 @@
+import re
+import time
+from datetime import datetime, timezone
+from typing import List, Dict, Any, Optional, Set
+import numpy as np
+from PyQt5.QtCore import QObject, QThreadPool, QTimer, QCoreApplication, pyqtSignal
+from ..worker import Worker, StreamWorker
+from .minio_service import MinioService
+from .bucket_listener import BucketNotificationListener
+from .connection_manager import ConnectionManager
+from .object_table import ObjectTable
+from .name_index import NameIndex, SUBSTRING, GLOB, compile_matcher
+from .object_columns import ObjectColumns
+
+class ObjectCatalog(QObject):
+    """进程内共享的对象目录，所有文件页面共用同一份列表
+
+    - 启动时从本地SQLite目录加载，无需访问网络；连接建立前或离线时继续使用缓存的列表
+    - 列表在ttl秒内视为新鲜，refresh()不会重复列举
+    - 刷新进行中再次请求刷新时合并为同一次列举
+    - 通过存储桶事件通知和本地操作增量更新，不必在每次操作后重新列举
+    - 随每次变更增量维护存储桶及各前缀的用量，定期在后台全量核对
+    """
+    files_reset = pyqtSignal()  # 列表被整体替换
+    files_changed = pyqtSignal(object)  # 增量变更 {"added": [...], "updated": [...], "removed": [...]}
+    rows_changed = pyqtSignal(object)  # 内容被修改或被标记为删除的已有行号（新行总是追加在table末尾）
+    refresh_started = pyqtSignal()
+    refresh_finished = pyqtSignal()
+    error = pyqtSignal(str)
+
+    DEFAULT_TTL = 60  # 秒
+    EVENT_BATCH_INTERVAL = 300  # 事件合并为一次界面更新的间隔（毫秒）
+    INDEX_BUILD_DELAY = 1000  # 目录停止变化多久后重建名称索引（毫秒）
+    COMPACT_RATIO = 0.25  # 已删除行超过该比例时，在刷新结束后压缩目录
+
+    _instances: Dict[int, "ObjectCatalog"] = {}
+
+    @classmethod
+    def instance(cls, minio_service: MinioService) -> "ObjectCatalog":
+        """获取与minio_service对应的共享目录"""
+        key = id(minio_service)
+        if key not in cls._instances:
+            cls._instances[key] = cls(minio_service)
+        return cls._instances[key]
+
+    def __init__(self, minio_service: MinioService, ttl: float = DEFAULT_TTL):
+        super().__init__()
+        self.minio_service = minio_service
+        self.ttl = ttl
+        self.thread_pool = QThreadPool()
+        self.table = ObjectTable()  # 列式存储，百万级对象也只占用较少内存
+        self._loaded_at: Optional[float] = None
+        self._worker = None
+        self._refresh_pending = False
+        self._refresh_failed = False
+        self._refresh_on_connect = False
+        self._reload_after_refresh = False  # 用量核对不一致时，对账后从本地目录重新加载
+        self._started_at = 0.0
+        self._invalidated_at = 0.0
+        self._pending_events: Dict[str, Dict[str, Any]] = {}
+        self._total_size = 0
+        self._prefix_sizes: Dict[str, int] = {}
+        # 名称索引在首次搜索后才构建，目录持续变化（如刷新中）时等变化停止后再重建
+        self._name_index: Optional[NameIndex] = None
+        self._columns: Optional[ObjectColumns] = None
+        self._index_worker = None
+        self._index_timer = QTimer(self)
+        self._index_timer.setSingleShot(True)
+        self._index_timer.setInterval(self.INDEX_BUILD_DELAY)
+        self._index_timer.timeout.connect(self._build_name_index)
+        self.load_cached()
+
+        # 定期全量核对用量，发现偏差时重新对账
+        self._audit_timer = QTimer(self)
+        self._audit_timer.timeout.connect(self.audit_usage)
+        self.update_audit_interval()
+
+        # 事件先缓存，定时合并成一批再应用
+        self._event_timer = QTimer(self)
+        self._event_timer.setSingleShot(True)
+        self._event_timer.setInterval(self.EVENT_BATCH_INTERVAL)
+        self._event_timer.timeout.connect(self._flush_events)
+
+        self._listening = False
+        self.listener = BucketNotificationListener(minio_service)
+        self.listener.events_received.connect(self._queue_events)
+        self.listener.listening_changed.connect(self._set_listening)
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.stop_listening)
+
+        # 连接建立后才开始监听事件和对账
+        self.connection = ConnectionManager.instance(minio_service)
+        self.connection.state_changed.connect(self._handle_connection_state)
+        self._handle_connection_state(self.connection.state)
+
+    def load_cached(self):
+        """从本地目录加载上次的列表"""
+        self.table.clear()
+        self._total_size = 0
+        self._prefix_sizes = {}
+        for page in self.minio_service.iter_cached_files():
+            for file in page:
+                self.table.upsert(file)
+                self._account(file["name"], file["size"])
+        self._schedule_name_index()
+        self.files_reset.emit()
+
+    def files(self) -> List[Dict[str, Any]]:
+        """当前全部文件记录（按需从列式存储生成）"""
+        return list(self.table.records())
+
+    def get(self, name: str) -> Optional[Dict[str, Any]]:
+        row = self.table.find(name)
+        return None if row is None else self.table.record(row)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.table
+
+    def __len__(self):
+        return len(self.table)
+
+    def usage(self, prefix: str = "") -> int:
+        """存储桶（或某个以"/"结尾的前缀）下对象的总字节数"""
+        if not prefix:
+            return self._total_size
+        return self._prefix_sizes.get(prefix, 0)
+
+    def search(self, query: str, mode: str = SUBSTRING) -> Optional[Set[str]]:
+        """按名称搜索，返回匹配的对象名集合；查询为空时返回None，表示不过滤
+
+        索引与当前目录版本一致时直接查询索引，否则逐个匹配并在后台重建索引。
+        正则表达式无效时返回空集合。
+        """
+        if not query:
+            return None
+        try:
+            index = self._current_name_index()
+            if index is not None:
+                return index.search(query, mode)
+            matcher = compile_matcher(query, mode)
+            return {name for name in map(self.table.name, self.table.rows()) if matcher(name)}
+        except re.error:
+            return set()
+
+    def columns(self) -> ObjectColumns:
+        """当前版本的NumPy列快照，版本不变时重复使用"""
+        if self._columns is None or self._columns.version != self.table.version:
+            self._columns = ObjectColumns(self.table)
+        return self._columns
+
+    def select(self, pattern: str = "", mode: str = GLOB, size_min: Optional[int] = None,
+               size_max: Optional[int] = None, since: Optional[datetime] = None,
+               until: Optional[datetime] = None, extensions=None) -> List[str]:
+        """同时满足名称模式、大小范围、修改时间范围和扩展名集合的对象名
+
+        正则表达式无效时抛出re.error。
+        """
+        columns = self.columns()
+        mask = columns.mask(size_min, size_max, since, until, extensions)
+        if pattern:
+            mask &= self.name_mask(pattern, mode)
+        return [self.table.name(row) for row in np.flatnonzero(mask).tolist()]
+
+    def name_mask(self, pattern: str, mode: str = SUBSTRING) -> np.ndarray:
+        """名称匹配pattern的目录行（布尔数组，长度为总行数）；索引可用时直接查询索引
+
+        正则表达式无效时抛出re.error。
+        """
+        mask = np.zeros(self.table.row_count(), dtype=bool)
+        index = self._current_name_index()
+        if index is not None:
+            mask[np.array(index.search_rows(pattern, mode), dtype=np.int64)] = True
+        else:
+            matcher = compile_matcher(pattern, mode)
+            mask[[row for row in self.table.rows() if matcher(self.table.name(row))]] = True
+        return mask
+
+    def name_order(self) -> np.ndarray:
+        """按名称（不区分大小写）排序的现存行号；索引可用时直接使用索引中的顺序"""
+        index = self._current_name_index()
+        if index is not None:
+            return np.array(index.rows, dtype=np.int64)
+        rows = list(self.table.rows())
+        names = list(map(self.table.name, rows))
+        order = sorted(range(len(rows)), key=lambda i: (names[i].lower(), names[i]))
+        return np.array(rows, dtype=np.int64)[order]
+
+    def sort_rows(self, key: str = "name", descending: bool = False, mask: Optional[np.ndarray] = None,
+                  extension_key=None) -> np.ndarray:
+        """按列排序的现存行号，mask为可选的行过滤条件；相同值按名称排序"""
+        rows = self.name_order()
+        if mask is not None:
+            rows = rows[mask[rows]]
+        if key == "name":
+            return rows[::-1] if descending else rows
+        return self.columns().sort(rows, key, descending, extension_key)
+
+    def update_audit_interval(self):
+        """按配置中的间隔重新启动用量核对（修改设置后调用），0表示不核对"""
+        audit_minutes = self.minio_service.config_manager.get_storage_config().get("usage_audit_minutes", 30)
+        if audit_minutes > 0:
+            self._audit_timer.start(int(audit_minutes * 60 * 1000))
+        else:
+            self._audit_timer.stop()
+
+    def audit_usage(self):
+        """在后台全量统计存储桶大小，与增量维护的结果核对"""
+        if self._worker is not None or not self.connection.is_connected():
+            return
+        worker = Worker(self.minio_service.get_bucket_size)
+        worker.signals.result.connect(self._check_usage)
+        self.thread_pool.start(worker)
+
+    def is_listening(self) -> bool:
+        """是否正在接收存储桶事件"""
+        return self._listening
+
+    def stop_listening(self):
+        if self.listener.isRunning():
+            self.listener.stop()
+            self.listener.wait(2000)
+
+    def note_put(self, name: str, size: int, etag: Optional[str] = None):
+        """记录本地完成的上传/创建，无需重新列举"""
+        file = {
+            "name": name,
+            "size": size,
+            "last_modified": datetime.now(timezone.utc),
+            "etag": etag,
+            "content_type": None,
+            "metadata": {}
+        }
+        key = "updated" if name in self.table else "added"
+        self._apply_known({"added": [], "updated": [], "removed": [], key: [file]})
+
+    def note_removed(self, names: List[str]):
+        """记录本地完成的删除"""
+        removed = [name for name in names if name in self.table]
+        if removed:
+            self._apply_known({"added": [], "updated": [], "removed": removed})
+
+    def is_fresh(self) -> bool:
+        return self._loaded_at is not None and time.monotonic() - self._loaded_at < self.ttl
+
+    def is_refreshing(self) -> bool:
+        return self._worker is not None
+
+    def refresh(self, force: bool = False):
+        """与服务器对账；列表仍新鲜时忽略，已有刷新进行中时合并，未连接时等连接建立后再进行"""
+        if self._worker is not None:
+            # 共用进行中的列举；若其开始后目录被标记过期，结束后再补一次
+            if self._invalidated_at > self._started_at:
+                self._refresh_pending = True
+            return
+        if not force and self.is_fresh():
+            return
+        if not self.connection.is_connected():
+            self._refresh_on_connect = True
+            return
+
+        worker = StreamWorker(self.minio_service.sync_catalog)
+        worker.signals.page.connect(self.apply_delta)
+        worker.signals.exception.connect(self._handle_refresh_error)
+        worker.signals.finished.connect(self._handle_refresh_finished)
+        self._worker = worker
+        self._started_at = time.monotonic()
+        self._refresh_failed = False
+        self.refresh_started.emit()
+        self.thread_pool.start(worker)
+
+    def invalidate(self):
+        """标记列表已过期（例如文件被修改后），下次refresh()时重新列举"""
+        self._loaded_at = None
+        self._invalidated_at = time.monotonic()
+
+    def apply_delta(self, delta):
+        """将变更合并到内存列表并通知订阅者"""
+        changed_rows = []
+        for file in delta["added"] + delta["updated"]:
+            row = self.table.find(file["name"])
+            old_size = self.table.upsert(file)
+            if old_size is not None:
+                changed_rows.append(row)
+                self._account(file["name"], -old_size)
+            self._account(file["name"], file["size"])
+        for name in delta["removed"]:
+            row = self.table.find(name)
+            old_size = self.table.remove(name)
+            if old_size is not None:
+                changed_rows.append(row)
+                self._account(name, -old_size)
+        self._schedule_name_index()
+        self.rows_changed.emit(changed_rows)
+        self.files_changed.emit(delta)
+
+    def _account(self, name: str, size: int):
+        """将文件大小计入（size为负时移出）总用量及其所有上级前缀"""
+        self._total_size += size
+        index = name.find("/")
+        while index != -1:
+            prefix = name[:index + 1]
+            self._prefix_sizes[prefix] = self._prefix_sizes.get(prefix, 0) + size
+            index = name.find("/", index + 1)
+
+    def _check_usage(self, actual: Optional[int]):
+        if actual is None:
+            return  # 统计失败，等下次核对
+        if self._worker is None and actual != self._total_size:
+            # 对账只比较服务器和本地目录，内存中的偏差要在对账后重新加载才能消除
+            print(f"存储用量核对不一致: 目录 {self._total_size}, 实际 {actual}，重新列举")
+            self._reload_after_refresh = True
+            self.refresh(force=True)
+
+    def _apply_known(self, delta):
+        """应用确定的变更并写入本地目录"""
+        bucket = self.minio_service.config_manager.get_minio_config()["bucket"]
+        self.minio_service.catalog_store.apply(bucket, delta)
+        for file in delta["added"] + delta["updated"]:
+            self.minio_service.invalidate_stat_cache(file["name"])
+            self.minio_service.invalidate_folder_cache(file["name"])
+        for name in delta["removed"]:
+            self.minio_service.invalidate_stat_cache(name)
+            self.minio_service.invalidate_folder_cache(name)
+        self.apply_delta(delta)
+
+    def _current_name_index(self) -> Optional[NameIndex]:
+        """与当前版本一致的名称索引；尚未构建时安排在后台构建并返回None"""
+        index = self._name_index
+        if index is not None and index.version == self.table.version:
+            return index
+        if index is None and self._index_worker is None and not self._index_timer.isActive():
+            self._index_timer.start()
+        return None
+
+    def _schedule_name_index(self):
+        """目录变化后延迟重建已有的名称索引"""
+        if self._name_index is not None and self._index_worker is None:
+            self._index_timer.start()
+
+    def _build_name_index(self):
+        """在后台按当前版本构建名称索引"""
+        version = self.table.version
+        rows = list(self.table.rows())
+        names = list(map(self.table.name, rows))
+        worker = Worker(NameIndex, names, version, rows)
+        worker.signals.result.connect(self._set_name_index)
+        worker.signals.finished.connect(self._handle_index_finished)
+        self._index_worker = worker
+        self.thread_pool.start(worker)
+
+    def _set_name_index(self, index: NameIndex):
+        self._name_index = index
+
+    def _handle_index_finished(self):
+        self._index_worker = None
+        if self._name_index is not None and self._name_index.version != self.table.version:
+            self._index_timer.start()  # 构建期间目录又发生了变化
+
+    def _set_listening(self, listening: bool):
+        self._listening = listening
+
+    def _queue_events(self, records):
+        """缓存事件，同一对象只保留最后一次"""
+        for record in records:
+            change = BucketNotificationListener.record_to_change(record)
+            if change is not None:
+                self._pending_events[change["file"]["name"]] = change
+        if not self._event_timer.isActive():
+            self._event_timer.start()
+
+    def _flush_events(self):
+        """将缓存的事件合并成一次变更"""
+        events, self._pending_events = self._pending_events, {}
+        delta = {"added": [], "updated": [], "removed": []}
+        for name, change in events.items():
+            if change["removed"]:
+                if name in self.table:
+                    delta["removed"].append(name)
+            elif name in self.table:
+                delta["updated"].append(change["file"])
+            else:
+                delta["added"].append(change["file"])
+        if delta["added"] or delta["updated"] or delta["removed"]:
+            self._apply_known(delta)
+
+    def _handle_connection_state(self, state: str):
+        if state != ConnectionManager.CONNECTED:
+            return
+        if not self.listener.isRunning():
+            self.listener.start()
+        if self._refresh_on_connect:
+            self._refresh_on_connect = False
+            self.refresh(force=True)
+
+    def _handle_refresh_error(self, exc: Exception):
+        self._refresh_failed = True
+        if ConnectionManager.is_connection_error(exc):
+            # 连接中断：保留已有列表，重连后再对账
+            self._refresh_on_connect = True
+            self.connection.report_error(exc)
+        else:
+            self.error.emit(str(exc))
+
+    def _handle_refresh_finished(self):
+        self._worker = None
+        if not self._refresh_failed:
+            self._loaded_at = time.monotonic()
+            if self._reload_after_refresh:
+                self._reload_after_refresh = False
+                self.load_cached()
+        if self.table.dead_count() > max(1000, self.table.row_count() * self.COMPACT_RATIO):
+            # 行号会改变，订阅者需要整体重建
+            self.table.compact()
+            self.files_reset.emit()
+        self.refresh_finished.emit()
+        if self._refresh_pending:
+            self._refresh_pending = False
+            self.refresh(force=True)
@@ -0,0 +1,65 @@
+from datetime import datetime
+from typing import Callable, Iterable, Optional
+import numpy as np
+from .object_table import ObjectTable
+
+class ObjectColumns:
+    """目录某一版本的NumPy列快照，用于排序和多条件批量筛选
+
+    位置与目录行号一一对应（包括已删除的行，由live标记），直接从array复制，不逐行转换。
+    """
+    SORT_KEYS = ("name", "size", "mtime", "type")
+
+    def __init__(self, table: ObjectTable):
+        self.version = table.version
+        self.live = np.frombuffer(bytes(table.live), dtype=np.uint8).astype(bool)
+        self.sizes = np.array(table.sizes, dtype=np.int64)
+        self.mtimes = np.array(table.mtimes, dtype=np.float64)
+        self.extension_ids = np.array(table.extension_ids, dtype=np.int64)
+        self.extensions = list(table.extensions)
+
+    def __len__(self):
+        return len(self.live)
+
+    def sort(self, rows: np.ndarray, key: str, descending: bool = False,
+             extension_key: Optional[Callable[[str], object]] = None) -> np.ndarray:
+        """将行号数组按大小、修改时间或类型稳定排序，相同值保持rows中原来的先后顺序
+
+        key为"type"时按扩展名排序，extension_key可将扩展名映射为排序值（如文件类型名称）。
+        修改时间未知的对象总是排在最后。
+        """
+        if key == "size":
+            values = self.sizes[rows]
+        elif key == "mtime":
+            values = self.mtimes[rows]
+        elif key == "type":
+            labels = [extension_key(ext) if extension_key else ext for ext in self.extensions]
+            ranks = np.empty(len(labels), dtype=np.int64)
+            ranks[sorted(range(len(labels)), key=lambda i: labels[i])] = np.arange(len(labels))
+            values = ranks[self.extension_ids[rows]]
+        else:
+            raise ValueError(f"未知的排序列: {key}")
+        # NaN的相反数仍是NaN，无论升序降序都排在最后
+        return rows[np.argsort(-values if descending else values, kind="stable")]
+
+    def extension_mask(self, extension_ids: Iterable[int]) -> np.ndarray:
+        return np.isin(self.extension_ids, list(extension_ids))
+
+    def mask(self, size_min: Optional[int] = None, size_max: Optional[int] = None,
+             since: Optional[datetime] = None, until: Optional[datetime] = None,
+             extensions: Optional[Iterable[str]] = None) -> np.ndarray:
+        """现存且同时满足大小范围、修改时间范围和扩展名集合的行（布尔数组）"""
+        mask = self.live.copy()
+        if size_min is not None:
+            mask &= self.sizes >= size_min
+        if size_max is not None:
+            mask &= self.sizes <= size_max
+        if since is not None:
+            mask &= self.mtimes >= since.timestamp()
+        if until is not None:
+            mask &= self.mtimes <= until.timestamp()
+        if extensions is not None:
+            wanted = {ext.lower() if ext.startswith(".") or not ext else "." + ext.lower()
+                      for ext in extensions}
+            mask &= self.extension_mask(i for i, ext in enumerate(self.extensions) if ext in wanted)
+        return mask
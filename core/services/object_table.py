@@ -0,0 +1,281 @@
+import os
+import sys
+from array import array
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import List, Dict, Any, Iterator, Optional
+import humanize
+
+@lru_cache(maxsize=4096)
+def format_size(size: int) -> str:
+    """大小的显示文本（大量对象大小相同，缓存格式化结果）"""
+    return humanize.naturalsize(size)
+
+@lru_cache(maxsize=4096)
+def _format_minute(minute: int) -> str:
+    return datetime.fromtimestamp(minute * 60, tz=timezone.utc).strftime("%Y-%m-%d %H:%M")
+
+def format_time(timestamp: float) -> str:
+    """修改时间的显示文本，精确到分钟"""
+    return _format_minute(int(timestamp // 60))
+
+
+class ObjectTable:
+    """紧凑的列式对象目录
+
+    - 对象名拆成"前缀 + 文件名"，前缀字符串只保存一份
+    - 大小、修改时间、前缀编号和内容类型编号保存在array中，不为每个对象创建dict和datetime
+    - MD5形式的ETag按16字节保存在bytearray中，元数据只为非空的对象保存
+    - 显示文本在需要时才格式化
+    行号在对象的生命周期内保持不变：新对象总是追加在末尾，删除只把该行标记为已删除，
+    视图可以直接用行号定位对象；已删除的行在compact()时才真正移除。
+    """
+
+    def __init__(self):
+        self._prefixes: List[str] = []
+        self._prefix_ids: Dict[str, int] = {}
+        self._content_types: List[Optional[str]] = [None]
+        self._content_type_ids: Dict[Optional[str], int] = {None: 0}
+        self._rows: Dict[int, Dict[str, int]] = {}  # 前缀编号 -> {文件名: 行号}
+        self._prefix_col = array("I")
+        self._basenames: List[str] = []
+        self._sizes = array("q")
+        self._mtimes = array("d")  # UTC时间戳，未知时为NaN
+        self._content_type_col = array("I")
+        self._extensions: List[str] = [""]
+        self._extension_ids: Dict[str, int] = {"": 0}
+        self._extension_col = array("I")  # 小写扩展名编号
+        self._etag_col = bytearray()  # 每行16字节的MD5形式ETag
+        self._etags: Dict[int, Optional[str]] = {}  # 不是32位十六进制的ETag（如分片上传）
+        self._metadata: Dict[int, Dict[str, str]] = {}
+        self._live = bytearray()  # 每行1字节，0表示已删除
+        self._live_count = 0
+        self.version = 0  # 每次修改后递增，供索引等派生结构判断是否需要重建
+
+    def __len__(self):
+        """现存对象数（不含已删除的行）"""
+        return self._live_count
+
+    def row_count(self) -> int:
+        """总行数（含已删除的行）"""
+        return len(self._basenames)
+
+    def is_live(self, row: int) -> bool:
+        return bool(self._live[row])
+
+    def rows(self) -> Iterator[int]:
+        """现存对象的行号"""
+        live = self._live
+        return (row for row in range(len(live)) if live[row])
+
+    def dead_count(self) -> int:
+        return len(self._basenames) - self._live_count
+
+    def __contains__(self, name: str) -> bool:
+        return self.find(name) is not None
+
+    def find(self, name: str) -> Optional[int]:
+        """对象名所在的行号"""
+        prefix, basename = self._split(name)
+        prefix_id = self._prefix_ids.get(prefix)
+        if prefix_id is None:
+            return None
+        return self._rows[prefix_id].get(basename)
+
+    def under(self, prefix: str) -> Iterator[int]:
+        """名称以prefix开头的现存对象的行号；按前缀分组查找，不逐行比较名称"""
+        folder, start = self._split(prefix)
+        for prefix_id, folder_prefix in enumerate(self._prefixes):
+            if folder_prefix == folder:
+                rows = (row for basename, row in self._rows[prefix_id].items() if basename.startswith(start))
+            elif folder_prefix.startswith(prefix):
+                rows = self._rows[prefix_id].values()
+            else:
+                continue
+            for row in rows:
+                if self._live[row]:
+                    yield row
+
+    def name(self, row: int) -> str:
+        return self._prefixes[self._prefix_col[row]] + self._basenames[row]
+
+    def basename(self, row: int) -> str:
+        return self._basenames[row]
+
+    def size(self, row: int) -> int:
+        return self._sizes[row]
+
+    def mtime(self, row: int) -> Optional[float]:
+        timestamp = self._mtimes[row]
+        return None if timestamp != timestamp else timestamp
+
+    def extension(self, row: int) -> str:
+        return self._extensions[self._extension_col[row]]
+
+    @property
+    def sizes(self) -> array:
+        """大小列（只读）"""
+        return self._sizes
+
+    @property
+    def mtimes(self) -> array:
+        """修改时间列（只读，UTC时间戳，未知时为NaN）"""
+        return self._mtimes
+
+    @property
+    def extension_ids(self) -> array:
+        """扩展名编号列（只读），编号对应extensions中的位置"""
+        return self._extension_col
+
+    @property
+    def live(self) -> bytearray:
+        """行是否现存（只读）"""
+        return self._live
+
+    @property
+    def extensions(self) -> List[str]:
+        return self._extensions
+
+    def content_type(self, row: int) -> Optional[str]:
+        return self._content_types[self._content_type_col[row]]
+
+    def etag(self, row: int) -> Optional[str]:
+        if row in self._etags:
+            return self._etags[row]
+        return self._etag_col[row * 16:row * 16 + 16].hex()
+
+    def display_size(self, row: int) -> str:
+        return format_size(self._sizes[row])
+
+    def display_time(self, row: int) -> str:
+        timestamp = self.mtime(row)
+        return "" if timestamp is None else format_time(timestamp)
+
+    def record(self, row: int) -> Dict[str, Any]:
+        """按文件记录的格式取出一行"""
+        timestamp = self.mtime(row)
+        return {
+            "name": self.name(row),
+            "size": self._sizes[row],
+            "last_modified": None if timestamp is None else datetime.fromtimestamp(timestamp, tz=timezone.utc),
+            "etag": self.etag(row),
+            "content_type": self.content_type(row),
+            "metadata": dict(self._metadata.get(row, {}))
+        }
+
+    def records(self) -> Iterator[Dict[str, Any]]:
+        for row in self.rows():
+            yield self.record(row)
+
+    def upsert(self, record: Dict[str, Any]) -> Optional[int]:
+        """写入一条文件记录，返回被替换记录的大小（新对象返回None）"""
+        prefix, basename = self._split(record["name"])
+        prefix_id = self._prefix_ids.get(prefix)
+        if prefix_id is None:
+            prefix_id = len(self._prefixes)
+            self._prefixes.append(sys.intern(prefix))
+            self._prefix_ids[prefix] = prefix_id
+            self._rows[prefix_id] = {}
+        last_modified = record.get("last_modified")
+        timestamp = last_modified.timestamp() if last_modified else float("nan")
+        content_type_id = self._content_type_id(record.get("content_type"))
+
+        self.version += 1
+        row = self._rows[prefix_id].get(basename)
+        if row is not None:
+            old_size = self._sizes[row]
+            self._sizes[row] = record["size"]
+            self._mtimes[row] = timestamp
+            self._content_type_col[row] = content_type_id
+        else:
+            old_size = None
+            row = len(self._basenames)
+            self._rows[prefix_id][basename] = row
+            self._prefix_col.append(prefix_id)
+            self._basenames.append(basename)
+            self._sizes.append(record["size"])
+            self._mtimes.append(timestamp)
+            self._content_type_col.append(content_type_id)
+            self._extension_col.append(self._extension_id(basename))
+            self._etag_col.extend(bytes(16))
+            self._live.append(1)
+            self._live_count += 1
+        self._set_etag(row, record.get("etag"))
+        if record.get("metadata"):
+            self._metadata[row] = dict(record["metadata"])
+        else:
+            self._metadata.pop(row, None)
+        return old_size
+
+    def remove(self, name: str) -> Optional[int]:
+        """将对象所在的行标记为已删除，返回其大小（不存在时返回None）"""
+        row = self.find(name)
+        if row is None:
+            return None
+        del self._rows[self._prefix_col[row]][self._basenames[row]]
+        self._live[row] = 0
+        self._live_count -= 1
+        self._etags.pop(row, None)
+        self._metadata.pop(row, None)
+        self.version += 1
+        return self._sizes[row]
+
+    def compact(self):
+        """移除已删除的行，现存对象的行号会改变"""
+        keep = [row for row in range(len(self._live)) if self._live[row]]
+        if len(keep) == len(self._live):
+            return
+        new_rows = {old: new for new, old in enumerate(keep)}
+        self._prefix_col = array("I", (self._prefix_col[row] for row in keep))
+        self._basenames = [self._basenames[row] for row in keep]
+        self._sizes = array("q", (self._sizes[row] for row in keep))
+        self._mtimes = array("d", (self._mtimes[row] for row in keep))
+        self._content_type_col = array("I", (self._content_type_col[row] for row in keep))
+        self._extension_col = array("I", (self._extension_col[row] for row in keep))
+        self._etag_col = bytearray(b"".join(self._etag_col[row * 16:row * 16 + 16] for row in keep))
+        self._etags = {new_rows[row]: etag for row, etag in self._etags.items()}
+        self._metadata = {new_rows[row]: metadata for row, metadata in self._metadata.items()}
+        self._live = bytearray(b"\x01" * len(keep))
+        for prefix_rows in self._rows.values():
+            for basename, row in prefix_rows.items():
+                prefix_rows[basename] = new_rows[row]
+        self.version += 1
+
+    def clear(self):
+        version = self.version
+        self.__init__()
+        self.version = version + 1
+
+    def _set_etag(self, row: int, etag: Optional[str]):
+        try:
+            packed = bytes.fromhex(etag) if etag and len(etag) == 32 else None
+        except ValueError:
+            packed = None
+        if packed is not None and packed.hex() == etag:
+            self._etag_col[row * 16:row * 16 + 16] = packed
+            self._etags.pop(row, None)
+        else:
+            self._etags[row] = etag
+
+    @staticmethod
+    def _split(name: str):
+        """拆分为(以"/"结尾的前缀, 文件名)"""
+        index = name.rfind("/") + 1
+        return name[:index], name[index:]
+
+    def _extension_id(self, basename: str) -> int:
+        extension = os.path.splitext(basename)[1].lower()
+        extension_id = self._extension_ids.get(extension)
+        if extension_id is None:
+            extension_id = len(self._extensions)
+            self._extensions.append(extension)
+            self._extension_ids[extension] = extension_id
+        return extension_id
+
+    def _content_type_id(self, content_type: Optional[str]) -> int:
+        content_type_id = self._content_type_ids.get(content_type)
+        if content_type_id is None:
+            content_type_id = len(self._content_types)
+            self._content_types.append(content_type)
+            self._content_type_ids[content_type] = content_type_id
+        return content_type_id
@@ -0,0 +1,268 @@
+import queue
+import string
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Iterator, Optional, Tuple
+
+_SHARD_DONE = object()
+
+
+class _ChunkBudget:
+    """所有分片共用的已缓冲块数上限
+
+    等待输出的分片最多共缓冲limit块；正在输出的分片只受自身队列大小限制，
+    否则它可能因后面的分片占满额度而永远等待。
+    """
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.buffered = 0
+        self.current = 0  # 正在输出的分片序号
+        self._cond = threading.Condition()
+
+    def acquire(self, shard: int, stop: threading.Event) -> bool:
+        """为分片的一个块占用额度；消费者已停止时返回False"""
+        with self._cond:
+            while shard != self.current and self.buffered >= self.limit:
+                if stop.is_set():
+                    return False
+                self._cond.wait(0.2)
+            self.buffered += 1
+            return True
+
+    def release(self):
+        with self._cond:
+            self.buffered -= 1
+            self._cond.notify_all()
+
+    def advance(self, shard: int):
+        with self._cond:
+            self.current = shard
+            self._cond.notify_all()
+
+
+class ShardedLister:
+    """将一次递归列举拆分为多个分片并发执行，再按对象名顺序合并为一个有序流
+
+    先选出一组有序的切分点，相邻两个切分点之间的键区间 (start_after, stop_after] 作为一个分片：
+    - 按"/"分隔符逐层发现子文件夹，以最后一层的子文件夹为切分点；没有子文件夹的小文件夹
+      并入相邻的分片
+    - 某一层条目过多（扁平的目录）时，根据第一页的键和少量探测请求选出切分点
+    - 分片数最多为workers×MAX_SHARDS_PER_WORKER，切分点过多时均匀保留其中一部分，
+      相邻的小前缀合并为一个分片
+    各分片的区间首尾相接、互不重叠，按顺序依次输出各分片即可得到整体有序的结果。
+    每个分片最多预取QUEUE_CHUNKS块，等待输出的分片合计最多缓冲BUFFER_CHUNKS块。
+    """
+    MAX_DEPTH = 3  # 向下发现子文件夹的最大层数
+    LEVEL_LIMIT = 1000  # 单层条目超过该数量时改为按键空间切分
+    MAX_SHARDS_PER_WORKER = 4  # 分片数上限为workers的倍数
+    PROBE_DEPTH = 3  # 扁平目录的切分点最多比公共前缀深几位
+    QUEUE_CHUNKS = 8  # 每个分片预取的最大块数（背压）
+    BUFFER_CHUNKS = 32  # 所有等待输出的分片合计缓冲的最大块数
+    CHUNK_SIZE = 1000
+    # 按键空间切分时使用的边界字符，按字符类别分组（组内按码点排序）
+    CHAR_CLASSES = (string.digits, string.ascii_uppercase, string.ascii_lowercase)
+
+    def __init__(self, client, bucket: str, to_record, workers: int = 8):
+        self.client = client
+        self.bucket = bucket
+        self.to_record = to_record
+        self.workers = max(1, workers)
+
+    def iter_records(self, prefix: str = "") -> Iterator[Dict[str, Any]]:
+        """按对象名顺序产出prefix下的全部文件记录"""
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            shards = self._plan(prefix, pool)
+        if len(shards) == 1:
+            # 没有可用的切分点，直接串行列举
+            for obj in self._list(prefix, None):
+                yield self.to_record(obj)
+            return
+
+        stop = threading.Event()
+        budget = _ChunkBudget(self.BUFFER_CHUNKS)
+        queues = [queue.Queue(maxsize=self.QUEUE_CHUNKS) for _ in shards]
+        with ThreadPoolExecutor(max_workers=min(self.workers, len(shards))) as pool:
+            for index, (start_after, stop_after) in enumerate(shards):
+                pool.submit(self._fill, queues[index], stop, budget, index, prefix, start_after, stop_after)
+            try:
+                for index, q in enumerate(queues):
+                    budget.advance(index)
+                    while True:
+                        chunk = q.get()
+                        if chunk is _SHARD_DONE:
+                            break
+                        if isinstance(chunk, Exception):
+                            raise chunk
+                        budget.release()
+                        yield from chunk
+            finally:
+                stop.set()
+
+    def _plan(self, prefix: str, pool: ThreadPoolExecutor) -> List[Tuple[Optional[str], Optional[str]]]:
+        """选出切分点，返回首尾相接的区间 [(start_after, stop_after), ...]"""
+        bounds = []
+        folders = [prefix]
+        for depth in range(self.MAX_DEPTH):
+            next_folders = []
+            for folder, (sub_folders, names) in zip(folders, pool.map(self._list_level, folders)):
+                if sub_folders is None:
+                    bounds.extend(self._range_bounds(folder, names, pool))
+                else:
+                    next_folders.extend(sub_folders)
+            folders = next_folders
+            if not folders or len(folders) >= self.workers:
+                break
+        # 子文件夹的占位对象归入前一个分片，文件夹中的其余对象都大于它
+        bounds = sorted(set(bounds + folders))
+        limit = self.workers * self.MAX_SHARDS_PER_WORKER - 1
+        if len(bounds) > limit:
+            bounds = [bounds[len(bounds) * i // (limit + 1)] for i in range(1, limit + 1)]
+        starts = [None] + bounds
+        stops = bounds + [None]
+        return list(zip(starts, stops))
+
+    def _list_level(self, folder: str) -> Tuple[Optional[List[str]], List[str]]:
+        """列出一层，返回(子文件夹, 文件名)；条目数超过LEVEL_LIMIT时放弃，返回(None, 已列出的名称)"""
+        sub_folders, names = [], []
+        for obj in self.client.list_objects(self.bucket, prefix=folder, recursive=False):
+            if obj.object_name == folder:
+                continue  # 文件夹自身的占位对象
+            names.append(obj.object_name)
+            if obj.is_dir:
+                sub_folders.append(obj.object_name)
+            if len(names) > self.LEVEL_LIMIT:
+                return None, names
+        return sub_folders, names
+
+    def _range_bounds(self, folder: str, sample: List[str], pool: ThreadPoolExecutor) -> List[str]:
+        """为条目很多的folder选出切分点
+
+        sample是第一页中按顺序排列的名称。以其后半部分的公共前缀为准，去掉末尾与下一位同类的
+        字符（如img_0000501…中的"000"）得到词干，再逐位探测最后一个键在词干之后的前几位，
+        在第一页的位置与最后一个键之间按该类字符均匀插值：img_0000001~img_1000000
+        探测到img_100后切分为img_003、img_006……。下一位不是数字或字母时不切分。
+        """
+        names = [name[len(folder):] for name in sample]
+        tail = names[len(names) // 2:]
+        common = self._common_prefix(tail[0], tail[-1])
+        # 公共前缀之后的一位在第一页中出现过的字符类别
+        following = {name[len(common)] for name in tail if len(name) > len(common)}
+        chars = "".join(chars for chars in self.CHAR_CLASSES if following & set(chars))
+        if not chars:
+            return []
+        stem = common
+        while stem and stem[-1] in chars:
+            stem = stem[:-1]
+
+        target = self.workers * self.MAX_SHARDS_PER_WORKER
+        low = self._char_indexes(tail[0][len(stem):], chars)
+        known = tail[-1][len(stem):]  # 最后一个键不小于第一页的最后一个名称
+        high = []
+        while len(high) < self.PROBE_DEPTH:
+            index = self._last_char(folder + stem, high, chars, known, pool)
+            if index is None:
+                break
+            high.append(index)
+            if self._value(high, len(chars)) - self._value(low[:len(high)], len(chars)) >= target:
+                break
+        depth = len(high)
+        first = self._value(low[:depth], len(chars))
+        span = self._value(high, len(chars)) - first
+        count = min(target, span)
+        bounds = []
+        for i in range(1, count):
+            value = first + span * i // count
+            digits = []
+            for _ in range(depth):
+                value, index = divmod(value, len(chars))
+                digits.append(chars[index])
+            bounds.append(folder + stem + "".join(reversed(digits)))
+        return bounds
+
+    def _last_char(self, prefix: str, high: List[int], chars: str, known: str,
+                   pool: ThreadPoolExecutor) -> Optional[int]:
+        """最后一个以prefix+high开头的键在下一位上的字符编号
+
+        即chars中最大的c，使存在大于prefix+high+c的键；每轮并发探测若干个字符缩小范围。
+        """
+        path = "".join(chars[index] for index in high)
+        low, top = -1, len(chars)  # chars[low]已知存在更大的键，chars[top]已知不存在
+        if known.startswith(path) and len(known) > len(path) + 1 and known[len(path)] in chars:
+            low = chars.index(known[len(path)])
+        # 已知下界时先只探测下一个字符：目录不大时键通常都在第一页所在的范围内，一次请求即可确定
+        pivots = [low + 1] if low >= 0 else []
+        while top - low > 1:
+            if not pivots:
+                step = -(-(top - low) // (self.workers + 1))
+                pivots = list(range(low + step, top, step))
+            found = pool.map(lambda index: self._has_after(prefix + path, prefix + path + chars[index]), pivots)
+            for index, exists in zip(pivots, found):
+                if not exists:
+                    top = index
+                    break
+                low = index
+            pivots = []
+        return low if low >= 0 else None
+
+    def _has_after(self, prefix: str, start_after: str) -> bool:
+        """prefix下是否存在大于start_after的键（一次LIST请求）"""
+        for _ in self.client.list_objects(self.bucket, prefix=prefix, recursive=True, start_after=start_after):
+            return True
+        return False
+
+    @staticmethod
+    def _common_prefix(a: str, b: str) -> str:
+        length = 0
+        while length < min(len(a), len(b)) and a[length] == b[length]:
+            length += 1
+        return a[:length]
+
+    @staticmethod
+    def _char_indexes(text: str, chars: str) -> List[int]:
+        """各字符在chars中的编号，不在其中的按码点取最近的一端"""
+        return [chars.index(char) if char in chars else (0 if char < chars[0] else len(chars) - 1)
+                for char in text]
+
+    @staticmethod
+    def _value(indexes: List[int], base: int) -> int:
+        value = 0
+        for index in indexes:
+            value = value * base + index
+        return value
+
+    def _list(self, prefix: str, start_after: Optional[str]):
+        return self.client.list_objects(self.bucket, prefix=prefix, recursive=True,
+                                        start_after=start_after, include_user_meta=True)
+
+    def _fill(self, q: queue.Queue, stop: threading.Event, budget: _ChunkBudget, shard: int,
+              prefix: str, start_after: Optional[str], stop_after: Optional[str]):
+        """在工作线程中列举一个分片，按块放入队列"""
+        if stop.is_set():
+            return
+        try:
+            chunk = []
+            for obj in self._list(prefix, start_after):
+                if stop_after is not None and obj.object_name > stop_after:
+                    break
+                chunk.append(self.to_record(obj))
+                if len(chunk) >= self.CHUNK_SIZE:
+                    if not budget.acquire(shard, stop) or not self._put(q, stop, chunk):
+                        return
+                    chunk = []
+            if chunk and (not budget.acquire(shard, stop) or not self._put(q, stop, chunk)):
+                return
+            self._put(q, stop, _SHARD_DONE)
+        except Exception as e:
+            self._put(q, stop, e)
+
+    @staticmethod
+    def _put(q: queue.Queue, stop: threading.Event, item) -> bool:
+        """放入队列；消费者已停止时返回False"""
+        while not stop.is_set():
+            try:
+                q.put(item, timeout=0.2)
+                return True
+            except queue.Full:
+                continue
+        return False
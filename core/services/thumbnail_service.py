@@ -0,0 +1,211 @@
+import os
+import re
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Optional, Tuple
+from PyQt5.QtCore import QObject, QThreadPool, QCoreApplication, pyqtSignal
+from PyQt5.QtGui import QImage
+from ..worker import Worker
+from ..utils.image_thumbnail import make_thumbnail
+from ..utils.lru_cache import LRUCache
+from .minio_service import MinioService
+from .connection_manager import ConnectionManager
+
+class ThumbnailDiskCache:
+    """按ETag保存在本地磁盘上的缩略图，同一内容的对象只生成一次
+
+    文件名为"ETag_尺寸.jpg"，按ETag的前两个字符分目录。可以在多个线程中同时读写。
+    """
+
+    def __init__(self, root: str = os.path.join("cache", "thumbnails")):
+        self.root = root
+
+    def path(self, etag: str, size: int) -> Optional[str]:
+        key = re.sub(r"[^0-9A-Za-z-]", "", etag or "")
+        if not key:
+            return None
+        return os.path.join(self.root, key[:2], f"{key}_{size}.jpg")
+
+    def read(self, path: Optional[str]) -> Optional[bytes]:
+        if path is None:
+            return None
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return None
+        try:
+            os.utime(path)  # 按最近使用时间清理
+        except OSError:
+            pass
+        return data
+
+    def write(self, path: Optional[str], data: bytes):
+        """先写临时文件再替换，其他线程不会读到写了一半的文件"""
+        if path is None:
+            return
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temp_path = f"{path}.{os.getpid()}.{id(data)}.tmp"
+            with open(temp_path, "wb") as f:
+                f.write(data)
+            os.replace(temp_path, path)
+        except OSError as e:
+            print(f"写入缩略图缓存失败: {e}")
+
+    def prune(self, max_bytes: int) -> int:
+        """总大小超出max_bytes时删除最久未使用的缩略图，返回删除的文件数"""
+        entries = []
+        for directory, _, names in os.walk(self.root):
+            for name in names:
+                path = os.path.join(directory, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total <= max_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+                removed += 1
+            except OSError:
+                pass
+        return removed
+
+
+class ThumbnailService(QObject):
+    """图片缩略图的两级缓存和后台生成
+
+    - 内存：按字节预算的LRU，保存解码好的QImage，命中时直接返回
+    - 磁盘：按ETag缓存JPEG，再次查看时不访问网络
+    - 未命中时在线程池中下载原图，在进程池中解码和缩小（不占用界面线程和GIL）
+
+    结果通过thumbnail_ready信号在界面线程中发出。离线时只使用两级缓存。
+    """
+    thumbnail_ready = pyqtSignal(str, int)  # 对象名, 尺寸
+    thumbnail_failed = pyqtSignal(str, int, str)
+
+    DEFAULT_SIZE = 256
+    LOAD_THREADS = 8  # 同时下载原图的数量
+
+    _instances: Dict[int, "ThumbnailService"] = {}
+
+    @classmethod
+    def instance(cls, minio_service: MinioService) -> "ThumbnailService":
+        key = id(minio_service)
+        if key not in cls._instances:
+            cls._instances[key] = cls(minio_service)
+        return cls._instances[key]
+
+    def __init__(self, minio_service: MinioService):
+        super().__init__()
+        self.minio_service = minio_service
+        self.connection = ConnectionManager.instance(minio_service)
+        config = minio_service.config_manager.get_thumbnail_config()
+        self.size = config.get("size", self.DEFAULT_SIZE)
+        self.memory = LRUCache(int(config.get("memory_mb", 64) * 1024 * 1024),
+                               lambda image: image.sizeInBytes())
+        self.disk = ThumbnailDiskCache()
+        self.processes = config.get("processes", 0) or max(1, min(4, (os.cpu_count() or 2) - 1))
+        self.thread_pool = QThreadPool()
+        self.thread_pool.setMaxThreadCount(self.LOAD_THREADS)
+        self._executor = None
+        self._executor_lock = threading.Lock()
+        self._pending: Dict[Tuple[str, Optional[str], int], Worker] = {}
+        self._failed = set()  # 生成失败的(对象名, ETag, 尺寸)，不再重复请求
+
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.shutdown)
+        disk_mb = config.get("disk_mb", 512)
+        if disk_mb > 0:
+            self.thread_pool.start(Worker(self.disk.prune, int(disk_mb * 1024 * 1024)))
+
+    def get(self, name: str, etag: Optional[str], size: Optional[int] = None) -> Optional[QImage]:
+        """返回内存中的缩略图；没有时安排在后台生成，完成后发出thumbnail_ready"""
+        size = size or self.size
+        key = (name, etag, size)
+        image = self.memory.get(key)
+        if image is None and key not in self._pending and key not in self._failed:
+            worker = Worker(self._load, name, etag, size)
+            worker.signals.result.connect(lambda image: self._handle_loaded(key, image))
+            worker.signals.exception.connect(lambda exc: self._handle_failed(key, exc))
+            worker.signals.finished.connect(lambda: self._handle_finished(key, worker))
+            self._pending[key] = worker
+            self.thread_pool.start(worker)
+        return image
+
+    def retain(self, names):
+        """取消不在names中的尚未开始的请求（例如已滚出可见区域的图片）"""
+        names = set(names)
+        for key, worker in list(self._pending.items()):
+            if key[0] not in names:
+                worker.cancel()
+                del self._pending[key]
+
+    def shutdown(self):
+        self.thread_pool.clear()
+        for worker in self._pending.values():
+            worker.cancel()
+        self._pending.clear()
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+    def _process_pool(self) -> ProcessPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                # 使用spawn：界面进程中有多个线程，fork出的子进程可能继承被占用的锁
+                self._executor = ProcessPoolExecutor(self.processes, multiprocessing.get_context("spawn"))
+            return self._executor
+
+    def _discard_process_pool(self, pool: ProcessPoolExecutor):
+        with self._executor_lock:
+            if self._executor is pool:
+                self._executor = None
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    def _load(self, name: str, etag: Optional[str], size: int) -> QImage:
+        """在线程池中执行：依次查磁盘缓存、下载原图、在子进程中生成缩略图"""
+        path = self.disk.path(etag, size)
+        data = self.disk.read(path)
+        if data is None:
+            if self.connection.is_offline():
+                raise ConnectionError("未连接到MinIO服务器")
+            source = self.minio_service.read_file(name)
+            if source is None:
+                raise ValueError(f"读取文件失败: {name}")
+            pool = self._process_pool()
+            try:
+                data = pool.submit(make_thumbnail, source, size).result()
+            except BrokenProcessPool:
+                self._discard_process_pool(pool)  # 子进程异常退出，下次请求时重新创建
+                raise
+            self.disk.write(path, data)
+        image = QImage.fromData(data)
+        if image.isNull():
+            raise ValueError(f"无法解码缩略图: {name}")
+        return image
+
+    def _handle_loaded(self, key, image: QImage):
+        self.memory.put(key, image)
+        self.thumbnail_ready.emit(key[0], key[2])
+
+    def _handle_failed(self, key, exc: Exception):
+        if ConnectionManager.is_connection_error(exc):
+            self.connection.report_error(exc)  # 重连后可以再次请求
+        else:
+            self._failed.add(key)
+        self.thumbnail_failed.emit(key[0], key[2], str(exc))
+
+    def _handle_finished(self, key, worker: Worker):
+        if self._pending.get(key) is worker:
+            del self._pending[key]
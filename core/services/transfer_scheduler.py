@@ -0,0 +1,304 @@
+import os
+import heapq
+import itertools
+import threading
+from typing import Callable, Dict, List, Optional
+from PyQt5.QtCore import QObject, QThreadPool, QTimer, QCoreApplication, pyqtSignal
+from ..worker import Worker
+from .minio_service import MinioService
+from .connection_manager import ConnectionManager
+from .upload_engine import MultipartUploadEngine, ThroughputMeter
+from .download_engine import RangedDownloadEngine
+
+class TransferJob:
+    """传输队列中的一个任务；进度在传输线程中累加，在界面线程中读取"""
+    # 状态
+    QUEUED = "排队中"
+    RUNNING = "传输中"
+    PAUSED = "已暂停"
+    DONE = "已完成"
+    FAILED = "失败"
+    CANCELLED = "已取消"
+
+    def __init__(self, kind: str, name: str, size: int, run: Callable[["TransferJob"], object], priority: int = 0):
+        """run(job)在传输线程中执行，应通过job.add报告进度，并在job.should_stop()为真时尽快退出"""
+        self.kind = kind  # "upload" / "download"
+        self.name = name
+        self.size = size
+        self.run = run
+        self.priority = priority
+        self.state = self.QUEUED
+        self.sent = 0
+        self.result = None
+        self.error = ""
+        self._stop = None  # 请求停止的原因：PAUSED或CANCELLED
+        self._lock = threading.Lock()
+
+    def add(self, count: int):
+        with self._lock:
+            self.sent += count
+
+    def should_stop(self) -> bool:
+        return self._stop is not None
+
+    def is_finished(self) -> bool:
+        return self.state in (self.DONE, self.FAILED, self.CANCELLED)
+
+
+class TransferScheduler(QObject):
+    """有界的传输队列
+
+    - 固定数量的工作线程，无论排队多少文件，同时进行的传输数不变
+    - 按优先级（数值大的先开始）和提交顺序调度
+    - 小文件和大文件分两条队列：大文件最多占用workers-1个线程，总留一个给小文件，
+      大批大文件排在前面时小文件也不会一直等待
+    - 任务可以暂停、继续、取消；一批任务全部结束后发出一次汇总
+    """
+    progress_changed = pyqtSignal(object)  # {"files", "sent", "total", "speed", "eta"}
+    job_changed = pyqtSignal(object)  # 任务状态改变
+    jobs_reset = pyqtSignal()  # 开始新的一批，任务列表被清空
+    batch_finished = pyqtSignal(object)  # {状态: [任务, ...]}
+
+    PROGRESS_INTERVAL = 250  # 毫秒
+
+    _instances: Dict[int, "TransferScheduler"] = {}
+
+    @classmethod
+    def instance(cls, minio_service: MinioService) -> "TransferScheduler":
+        key = id(minio_service)
+        if key not in cls._instances:
+            cls._instances[key] = cls(minio_service)
+        return cls._instances[key]
+
+    def __init__(self, minio_service: MinioService):
+        super().__init__()
+        self.minio_service = minio_service
+        self.connection = ConnectionManager.instance(minio_service)
+        config = minio_service.config_manager.get_transfer_config()
+        part_size = int(config.get("part_size_mb", 16) * 1024 * 1024)
+        concurrency = config.get("concurrency", 4)
+        self.upload_engine = MultipartUploadEngine(minio_service, part_size=part_size, concurrency=concurrency)
+        self.download_engine = RangedDownloadEngine(minio_service, part_size=part_size, concurrency=concurrency)
+        # 不超过一个分片的文件算作小文件
+        self.small_file_limit = self.upload_engine.part_size
+        self.workers = max(1, config.get("workers", 4))
+        self.thread_pool = QThreadPool()
+        self.thread_pool.setMaxThreadCount(self.workers)
+        self.jobs: List[TransferJob] = []
+        # 随状态变化增量维护的汇总，任务完成和定时汇总时都不遍历整个任务列表
+        self._unfinished = 0
+        self._paused = 0
+        self._total_size = 0
+        self._finished_size = 0
+        self._active = set()  # 传输中的任务
+        self._queues = {True: [], False: []}  # 是否小文件 -> [(-优先级, 序号, 任务)]
+        self._order = itertools.count()
+        self._running = {True: 0, False: 0}
+        self.meter = ThroughputMeter()
+        self._timer = QTimer(self)
+        self._timer.setInterval(self.PROGRESS_INTERVAL)
+        self._timer.timeout.connect(self._emit_progress)
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.cancel_all)
+
+    # 提交任务
+
+    def upload(self, file_path: str, object_name: Optional[str] = None, priority: int = 0) -> TransferJob:
+        """将文件加入上传队列，object_name默认为文件名"""
+        object_name = object_name or os.path.basename(file_path)
+        engine = self.upload_engine
+        return self.submit(TransferJob(
+            "upload", object_name, os.path.getsize(file_path),
+            lambda job: engine.upload(file_path, object_name, job.add, job.should_stop),
+            priority
+        ))
+
+    def download(self, object_name: str, file_path: str, size: int, priority: int = 0) -> TransferJob:
+        """将对象加入下载队列；暂停或失败后再次下载同一对象到同一位置时从中断处继续"""
+        engine = self.download_engine
+        return self.submit(TransferJob(
+            "download", object_name, size,
+            lambda job: engine.download(object_name, file_path, job.add, job.should_stop),
+            priority
+        ))
+
+    def submit(self, job: TransferJob) -> TransferJob:
+        if not self.is_busy() and self.jobs:
+            # 上一批已经结束，开始新的一批
+            self.jobs = []
+            self._total_size = self._finished_size = 0
+            self.jobs_reset.emit()
+        if not self._timer.isActive():
+            self.meter = ThroughputMeter()
+            self._timer.start()
+        self.jobs.append(job)
+        self._unfinished += 1
+        self._total_size += job.size
+        self._enqueue(job)
+        self.job_changed.emit(job)
+        self._dispatch()
+        return job
+
+    # 控制任务
+
+    def pause(self, job: TransferJob):
+        """暂停任务；进行中的任务在当前数据块传输后停止。继续时上传重新开始，下载从已完成的分段继续"""
+        if job.state == TransferJob.QUEUED:
+            self._set_state(job, TransferJob.PAUSED)  # 从队列中取出时跳过
+        elif job.state == TransferJob.RUNNING:
+            job._stop = TransferJob.PAUSED
+
+    def resume(self, job: TransferJob):
+        if job.state == TransferJob.PAUSED:
+            job.sent = 0
+            self._set_state(job, TransferJob.QUEUED)
+            self._enqueue(job)
+            self._dispatch()
+
+    def cancel(self, job: TransferJob):
+        if job.state in (TransferJob.QUEUED, TransferJob.PAUSED):
+            self._finish(job, TransferJob.CANCELLED)
+        elif job.state == TransferJob.RUNNING:
+            job._stop = TransferJob.CANCELLED
+
+    def set_priority(self, job: TransferJob, priority: int):
+        """调整尚未开始的任务的优先级"""
+        job.priority = priority
+        if job.state == TransferJob.QUEUED:
+            self._enqueue(job)  # 旧的队列项在取出时因序号过期而被跳过
+            self.job_changed.emit(job)
+
+    def prioritize(self, jobs: List[TransferJob]):
+        """将任务排到所有排队任务之前"""
+        top = max((job.priority for job in self.jobs), default=0) + 1
+        for job in jobs:
+            self.set_priority(job, top)
+
+    def pause_all(self):
+        for job in self.jobs:
+            self.pause(job)
+
+    def resume_all(self):
+        for job in self.jobs:
+            self.resume(job)
+
+    def cancel_all(self):
+        for job in list(self.jobs):
+            self.cancel(job)
+
+    # 状态
+
+    def is_busy(self) -> bool:
+        return self._unfinished > 0
+
+    def has_paused(self) -> bool:
+        return self._paused > 0
+
+    def progress(self) -> Dict[str, object]:
+        """当前这批任务的汇总进度（已结束的任务按完成计算，使总进度不会回退）"""
+        sent = self._finished_size + sum(job.sent for job in self._active)
+        total = self._total_size
+        return {
+            "files": self._unfinished,
+            "sent": sent,
+            "total": total,
+            "speed": self.meter.speed(),
+            "eta": self.meter.eta(total - sent)
+        }
+
+    # 内部实现
+
+    def _is_small(self, job: TransferJob) -> bool:
+        return job.size <= self.small_file_limit
+
+    def _enqueue(self, job: TransferJob):
+        job._queue_key = next(self._order)
+        heapq.heappush(self._queues[self._is_small(job)], (-job.priority, job._queue_key, job))
+
+    def _peek(self, small: bool) -> Optional[TransferJob]:
+        """队列中第一个仍在排队的任务，顺便丢弃已暂停、已取消或已过期的项"""
+        queue = self._queues[small]
+        while queue:
+            _, key, job = queue[0]
+            if job.state == TransferJob.QUEUED and job._queue_key == key:
+                return job
+            heapq.heappop(queue)
+        return None
+
+    def _dispatch(self):
+        """在有空闲线程时按优先级启动任务，大文件最多占用workers-1个线程"""
+        max_large = max(1, self.workers - 1)
+        while self._running[True] + self._running[False] < self.workers:
+            small, large = self._peek(True), self._peek(False)
+            if large is not None and self._running[False] >= max_large:
+                large = None
+            if small is None and large is None:
+                return
+            if small is None or (large is not None and large.priority > small.priority):
+                job = large
+            else:
+                job = small
+            heapq.heappop(self._queues[self._is_small(job)])
+            self._start(job)
+
+    def _start(self, job: TransferJob):
+        job._stop = None
+        job.sent = 0
+        self._running[self._is_small(job)] += 1
+        self._set_state(job, TransferJob.RUNNING)
+        worker = Worker(job.run, job)
+        worker.signals.result.connect(lambda result: self._handle_succeeded(job, result))
+        worker.signals.exception.connect(lambda exc: self._handle_failed(job, exc))
+        self.thread_pool.start(worker)
+
+    def _handle_succeeded(self, job: TransferJob, result):
+        self._running[self._is_small(job)] -= 1
+        job.result = result
+        self._finish(job, TransferJob.DONE)
+
+    def _handle_failed(self, job: TransferJob, exc: Exception):
+        self._running[self._is_small(job)] -= 1
+        if job._stop == TransferJob.PAUSED:
+            self._set_state(job, TransferJob.PAUSED)
+            self._dispatch()
+            return
+        if job._stop == TransferJob.CANCELLED:
+            self._finish(job, TransferJob.CANCELLED)
+            return
+        self.connection.report_error(exc)
+        print(f"传输失败: {job.name}, {exc}")
+        job.error = str(exc)
+        self._finish(job, TransferJob.FAILED)
+
+    def _finish(self, job: TransferJob, state: str):
+        self._set_state(job, state)
+        self._dispatch()
+        if not self.is_busy():
+            self._timer.stop()
+            self.progress_changed.emit(self.progress())
+            summary = {key: [] for key in (TransferJob.DONE, TransferJob.FAILED, TransferJob.CANCELLED)}
+            for finished in self.jobs:
+                summary[finished.state].append(finished)
+            self.batch_finished.emit(summary)
+
+    def _set_state(self, job: TransferJob, state: str):
+        previous = job.state
+        if previous == TransferJob.RUNNING:
+            self._active.discard(job)
+        elif previous == TransferJob.PAUSED:
+            self._paused -= 1
+        if state == TransferJob.RUNNING:
+            self._active.add(job)
+        elif state == TransferJob.PAUSED:
+            self._paused += 1
+            job.sent = 0  # 继续时重新报告进度
+        if not job.is_finished() and state in (TransferJob.DONE, TransferJob.FAILED, TransferJob.CANCELLED):
+            self._unfinished -= 1
+            self._finished_size += job.size
+        job.state = state
+        self.job_changed.emit(job)
+
+    def _emit_progress(self):
+        self.meter.update(self.progress()["sent"])
+        self.progress_changed.emit(self.progress())
@@ -0,0 +1,181 @@
+import os
+import math
+import time
+import mimetypes
+import threading
+from collections import deque
+from datetime import timedelta
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+import certifi
+import urllib3
+from minio.datatypes import Part
+from .minio_service import MinioService
+
+class UploadCancelled(Exception):
+    """上传被取消"""
+
+
+class ThroughputMeter:
+    """按最近一段时间内的传输量计算速度和剩余时间"""
+
+    def __init__(self, window: float = 5.0):
+        self.window = window
+        self._samples = deque()  # (时间, 累计字节数)
+
+    def update(self, done: int, now: Optional[float] = None):
+        now = time.monotonic() if now is None else now
+        self._samples.append((now, done))
+        while len(self._samples) > 2 and now - self._samples[0][0] > self.window:
+            self._samples.popleft()
+
+    def speed(self) -> float:
+        """字节/秒"""
+        if len(self._samples) < 2:
+            return 0.0
+        (start, first), (end, last) = self._samples[0], self._samples[-1]
+        return (last - first) / (end - start) if end > start else 0.0
+
+    def eta(self, remaining: int) -> Optional[float]:
+        """剩余秒数，速度未知时为None"""
+        speed = self.speed()
+        return remaining / speed if speed > 0 else None
+
+
+class _PartReader:
+    """按块读取文件中的一段，供HTTP请求体流式发送；每读一块就计入进度"""
+
+    def __init__(self, file_path: str, offset: int, length: int, on_read: Callable[[int], None],
+                 cancelled: Callable[[], bool]):
+        self._file = open(file_path, "rb")
+        self._file.seek(offset)
+        self._remaining = length
+        self._on_read = on_read
+        self._cancelled = cancelled
+
+    def read(self, size: int = -1) -> bytes:
+        if self._cancelled():
+            raise UploadCancelled()
+        if size < 0 or size > self._remaining:
+            size = self._remaining
+        data = self._file.read(size)
+        self._remaining -= len(data)
+        if data:
+            self._on_read(len(data))
+        return data
+
+    def close(self):
+        self._file.close()
+
+
+class MultipartUploadEngine:
+    """分片并发上传
+
+    小于一个分片的文件用一次PUT上传，其余文件拆成多个分片并发上传。每个分片通过预签名URL
+    流式发送，按实际发出的字节数报告进度（而不是每完成一个分片跳一次）。
+    失败的分片单独重试，取消或失败时中止分片上传，服务器上不留下未完成的分片。
+    """
+    MIN_PART_SIZE = 5 * 1024 * 1024  # S3要求除最后一片外每片至少5MiB
+    MAX_PARTS = 10000
+    PART_RETRIES = 3
+
+    def __init__(self, minio_service: MinioService, part_size: int = 16 * 1024 * 1024, concurrency: int = 4):
+        self.minio_service = minio_service
+        self.part_size = max(self.MIN_PART_SIZE, part_size)
+        self.concurrency = max(1, concurrency)
+        config = minio_service.config_manager.get_minio_config()
+        self._http = urllib3.PoolManager(
+            maxsize=self.concurrency,
+            timeout=urllib3.Timeout(connect=10, read=300),
+            retries=False,  # 请求体是流，由分片级的重试负责
+            cert_reqs="CERT_REQUIRED" if config["secure"] else "CERT_NONE",
+            ca_certs=os.environ.get("SSL_CERT_FILE") or certifi.where()
+        )
+
+    @property
+    def bucket(self) -> str:
+        return self.minio_service.config_manager.get_minio_config()["bucket"]
+
+    def part_size_for(self, size: int) -> int:
+        """分片大小，文件很大时加大分片使分片数不超过上限"""
+        return max(self.part_size, math.ceil(size / self.MAX_PARTS))
+
+    def upload(self, file_path: str, object_name: str, on_progress: Callable[[int], None] = lambda n: None,
+               cancelled: Callable[[], bool] = lambda: False) -> str:
+        """上传文件，返回ETag；on_progress(新发送的字节数)在上传线程中调用
+
+        失败时抛出异常，取消时抛出UploadCancelled。
+        """
+        size = os.path.getsize(file_path)
+        content_type = mimetypes.guess_type(object_name)[0] or "application/octet-stream"
+        part_size = self.part_size_for(size)
+        if size <= part_size:
+            return self._put(file_path, object_name, 0, size, {}, content_type, on_progress, cancelled)
+
+        # minio没有公开分片上传的接口，这里调用的内部方法在7.2.x中签名稳定（requirements.txt中固定了版本）
+        client = self.minio_service.client
+        upload_id = client._create_multipart_upload(self.bucket, object_name, {"Content-Type": content_type})
+        failed = threading.Event()  # 一个分片失败后，其他分片不再继续发送
+        part_cancelled = lambda: failed.is_set() or cancelled()
+        try:
+            count = math.ceil(size / part_size)
+            with ThreadPoolExecutor(max_workers=min(self.concurrency, count)) as pool:
+                futures = [
+                    pool.submit(self._put, file_path, object_name, (number - 1) * part_size,
+                                min(part_size, size - (number - 1) * part_size),
+                                {"uploadId": upload_id, "partNumber": str(number)},
+                                None, on_progress, part_cancelled)
+                    for number in range(1, count + 1)
+                ]
+                try:
+                    etags = [future.result() for future in futures]
+                except BaseException:
+                    failed.set()
+                    for future in futures:
+                        future.cancel()
+                    raise
+            parts = [Part(number, etag) for number, etag in enumerate(etags, start=1)]
+            result = client._complete_multipart_upload(self.bucket, object_name, upload_id, parts)
+            return result.etag
+        except BaseException:
+            try:
+                client._abort_multipart_upload(self.bucket, object_name, upload_id)
+            except Exception as e:
+                print(f"中止分片上传失败: {e}")
+            raise
+
+    def close(self):
+        self._http.clear()
+
+    def _put(self, file_path: str, object_name: str, offset: int, length: int, query: Dict[str, str],
+             content_type: Optional[str], on_progress, cancelled) -> str:
+        """用预签名URL上传一段数据（整个小文件或一个分片），返回ETag；失败时重试"""
+        url = self.minio_service.client.get_presigned_url(
+            "PUT", self.bucket, object_name, expires=timedelta(hours=1), extra_query_params=query or None)
+        headers = {"Content-Length": str(length)}
+        if content_type:
+            headers["Content-Type"] = content_type
+        for attempt in range(1, self.PART_RETRIES + 1):
+            sent = 0
+
+            def count(n):
+                nonlocal sent
+                sent += n
+                on_progress(n)
+            body = _PartReader(file_path, offset, length, count, cancelled)
+            try:
+                response = self._http.request("PUT", url, body=body, headers=headers, chunked=False)
+            except urllib3.exceptions.HTTPError as e:
+                error = e
+            else:
+                if response.status == 200:
+                    return response.headers.get("ETag", "").strip('"')
+                error = OSError(f"HTTP {response.status}: {response.data[:200].decode(errors='replace')}")
+                if response.status < 500:
+                    raise error  # 签名、权限等客户端错误，重试也不会成功
+            finally:
+                body.close()
+            on_progress(-sent)  # 重试时这部分会重新发送
+            if attempt == self.PART_RETRIES:
+                raise error
+            time.sleep(attempt)
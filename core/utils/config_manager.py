@@ -17,13 +17,34 @@ class ConfigManager:
             "window_size": {
                 "width": 1200,
                 "height": 800
-            }
+            },
+            "startup_budget_ms": 1500  # 冷启动预算，启动耗时报告中与之比较
         },
         "commands": {
             "default_type": "download",
             "show_progress": True,
             "use_powershell": False,
             "auto_delete": False
+        },
+        "storage": {
+            "quota_gb": 1,
+            "usage_audit_minutes": 30
+        },
+        "thumbnails": {
+            "size": 256,  # 缩略图边长（像素）
+            "memory_mb": 64,  # 内存缓存预算
+            "disk_mb": 512,  # 磁盘缓存预算，超出时清理最久未使用的
+            "processes": 0  # 生成缩略图的进程数，0表示按CPU核数决定
+        },
+        "preview": {
+            "page_kb": 64,  # 文本预览每次读取的大小
+            "max_pages": 32  # 最多保留的页数，超出时丢弃另一端的页
+        },
+        "transfer": {
+            "part_size_mb": 16,  # 分片大小，不小于5
+            "concurrency": 4,  # 每个文件同时传输的分片数
+            "workers": 4,  # 同时传输的文件数，其中一个总是留给小文件
+            "asyncio_engine": False  # 可见文件的元数据改由asyncio存储引擎在一个事件循环中并发获取（需安装requirements-asyncio.txt）
         }
     }
 
@@ -71,6 +92,22 @@ class ConfigManager:
         """获取命令生成配置"""
         return self.config.get("commands", self.DEFAULT_CONFIG["commands"])
 
+    def get_storage_config(self) -> Dict[str, Any]:
+        """获取存储配额配置"""
+        return self.config.get("storage", self.DEFAULT_CONFIG["storage"])
+
+    def get_thumbnail_config(self) -> Dict[str, Any]:
+        """获取缩略图缓存配置"""
+        return self.config.get("thumbnails", self.DEFAULT_CONFIG["thumbnails"])
+
+    def get_preview_config(self) -> Dict[str, Any]:
+        """获取文件预览配置"""
+        return self.config.get("preview", self.DEFAULT_CONFIG["preview"])
+
+    def get_transfer_config(self) -> Dict[str, Any]:
+        """获取文件传输配置"""
+        return self.config.get("transfer", self.DEFAULT_CONFIG["transfer"])
+
     def update_minio_config(self, minio_config: Dict[str, Any]) -> bool:
         """更新MinIO配置"""
         self.config["minio"] = minio_config
@@ -84,4 +121,9 @@ class ConfigManager:
     def update_commands_config(self, commands_config: Dict[str, Any]) -> bool:
         """更新命令生成配置"""
         self.config["commands"] = commands_config
-        return self.save_config(self.config) 
\ No newline at end of file
+        return self.save_config(self.config)
+
+    def update_storage_config(self, storage_config: Dict[str, Any]) -> bool:
+        """更新存储配额配置"""
+        self.config["storage"] = storage_config
+        return self.save_config(self.config)
@@ -0,0 +1,24 @@
+import io
+from PIL import Image, ImageOps
+
+# 只依赖Pillow：在进程池的子进程中执行，不导入Qt
+
+
+def make_thumbnail(data: bytes, size: int, quality: int = 85) -> bytes:
+    """将图片解码并缩小到不超过size×size（保持比例、按EXIF方向旋转），返回JPEG数据"""
+    with Image.open(io.BytesIO(data)) as image:
+        # JPEG可以在解码时直接按比例缩小，大幅减少解码时间和内存
+        image.draft("RGB", (size, size))
+        image = ImageOps.exif_transpose(image)
+        image.thumbnail((size, size), Image.LANCZOS)
+        if image.mode != "RGB":
+            background = Image.new("RGB", image.size, (255, 255, 255))
+            if image.mode in ("RGBA", "LA", "P"):
+                image = image.convert("RGBA")
+                background.paste(image, mask=image.getchannel("A"))
+            else:
+                background.paste(image.convert("RGB"))
+            image = background
+        output = io.BytesIO()
+        image.save(output, "JPEG", quality=quality)
+        return output.getvalue()
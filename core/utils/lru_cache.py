@@ -0,0 +1,46 @@
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+class LRUCache:
+    """按总开销（如字节数）限制容量的LRU缓存，超出预算时淘汰最久未使用的项
+
+    不加锁，只应在一个线程（通常是界面线程）中使用。
+    """
+
+    def __init__(self, budget: int, cost: Callable[[Any], int] = lambda value: 1):
+        self.budget = budget
+        self.cost = cost
+        self.total = 0
+        self._items: "OrderedDict[Hashable, Any]" = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        value = self._items.get(key)
+        if value is not None:
+            self._items.move_to_end(key)
+        return value
+
+    def put(self, key: Hashable, value: Any):
+        self.discard(key)
+        size = self.cost(value)
+        if size > self.budget:
+            return  # 单项超出预算时不缓存
+        self._items[key] = value
+        self.total += size
+        while self.total > self.budget:
+            _, evicted = self._items.popitem(last=False)
+            self.total -= self.cost(evicted)
+
+    def discard(self, key: Hashable):
+        value = self._items.pop(key, None)
+        if value is not None:
+            self.total -= self.cost(value)
+
+    def clear(self):
+        self._items.clear()
+        self.total = 0
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._items
+
+    def __len__(self):
+        return len(self._items)
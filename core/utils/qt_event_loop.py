@@ -0,0 +1,28 @@
+import asyncio
+from typing import Optional
+
+# 可选依赖：qasync让Qt事件循环同时驱动asyncio协程
+try:
+    import qasync
+except ImportError:
+    qasync = None
+
+
+def install_qt_event_loop(app) -> Optional[asyncio.AbstractEventLoop]:
+    """安装由Qt驱动的asyncio事件循环，未安装qasync时返回None
+
+    安装后应使用loop.run_forever()代替app.exec_()。
+    """
+    if qasync is None:
+        return None
+    loop = qasync.QEventLoop(app)
+    asyncio.set_event_loop(loop)
+    return loop
+
+
+def current_qt_event_loop() -> Optional[asyncio.AbstractEventLoop]:
+    """已安装的Qt事件循环，没有时返回None"""
+    if qasync is None:
+        return None
+    loop = asyncio.get_event_loop_policy().get_event_loop()
+    return loop if isinstance(loop, qasync.QEventLoop) else None
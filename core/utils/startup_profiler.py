@@ -0,0 +1,56 @@
+import time
+from contextlib import contextmanager
+from typing import List, Tuple
+
+class StartupProfiler:
+    """记录启动过程各阶段的耗时（导入、连接服务、构建页面），用于检查冷启动预算
+
+    时间从第一次导入本模块算起，main.py应尽早导入。
+    """
+    # 阶段类别
+    IMPORT = "导入"
+    CONNECT = "连接"
+    PAGE = "页面"
+    OTHER = "其他"
+
+    _start = time.perf_counter()
+    _phases: List[Tuple[str, str, float]] = []  # (类别, 名称, 秒)
+    _finished_at = None
+
+    @classmethod
+    @contextmanager
+    def phase(cls, category: str, name: str):
+        """记录with块的耗时"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            cls._phases.append((category, name, time.perf_counter() - start))
+
+    @classmethod
+    def finish(cls) -> float:
+        """标记启动完成（窗口首次显示），返回从进程启动到现在的秒数；只记录第一次"""
+        if cls._finished_at is None:
+            cls._finished_at = time.perf_counter()
+        return cls._finished_at - cls._start
+
+    @classmethod
+    def phases(cls) -> List[Tuple[str, str, float]]:
+        return list(cls._phases)
+
+    @classmethod
+    def report(cls, budget_ms: float = 0) -> str:
+        """启动耗时报告：每个阶段一行，再按类别汇总；budget_ms大于0时与预算比较"""
+        total = cls.finish()
+        lines = ["启动耗时:"]
+        for category, name, seconds in cls._phases:
+            lines.append(f"  [{category}] {name}: {seconds * 1000:.0f} ms")
+        totals = {}
+        for category, _, seconds in cls._phases:
+            totals[category] = totals.get(category, 0) + seconds
+        summary = ", ".join(f"{category} {seconds * 1000:.0f} ms" for category, seconds in totals.items())
+        lines.append(f"  合计 {total * 1000:.0f} ms（{summary}）")
+        if budget_ms > 0:
+            status = "超出" if total * 1000 > budget_ms else "未超出"
+            lines.append(f"  预算 {budget_ms:.0f} ms，{status}")
+        return "\n".join(lines)
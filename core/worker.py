@@ -3,7 +3,9 @@ from PyQt5.QtCore import QRunnable, QObject, pyqtSignal
 class WorkerSignals(QObject):
     finished = pyqtSignal()
     error = pyqtSignal(str)
+    exception = pyqtSignal(object)  # 与error同时发出，供需要区分错误类型的调用方使用
     result = pyqtSignal(object)
+    page = pyqtSignal(object)
 
 class Worker(QRunnable):
     def __init__(self, fn, *args, **kwargs):
@@ -12,12 +14,35 @@ class Worker(QRunnable):
         self.args = args
         self.kwargs = kwargs
         self.signals = WorkerSignals()
+        self.cancelled = False
+
+    def cancel(self):
+        """请求取消，已产生的结果不再发出"""
+        self.cancelled = True
 
     def run(self):
         try:
+            if self.cancelled:
+                return  # 在排队期间已被取消
             result = self.fn(*self.args, **self.kwargs)
-            self.signals.result.emit(result)
+            if not self.cancelled:
+                self.signals.result.emit(result)
+        except Exception as e:
+            self.signals.exception.emit(e)
+            self.signals.error.emit(str(e))
+        finally:
+            self.signals.finished.emit()
+
+class StreamWorker(Worker):
+    """执行生成器函数，每产出一页数据就通过page信号发出"""
+    def run(self):
+        try:
+            for page in self.fn(*self.args, **self.kwargs):
+                if self.cancelled:
+                    break
+                self.signals.page.emit(page)
         except Exception as e:
+            self.signals.exception.emit(e)
             self.signals.error.emit(str(e))
         finally:
             self.signals.finished.emit()
@@ -1,17 +1,33 @@
 import sys
 import os
-from PyQt5.QtWidgets import QApplication
-from PyQt5.QtGui import QIcon
-from ui.main_window_new import MainWindow
+import multiprocessing
+from core.utils.startup_profiler import StartupProfiler  # 尽早导入，从此开始计时
+
+with StartupProfiler.phase(StartupProfiler.IMPORT, "PyQt5"):
+    from PyQt5.QtWidgets import QApplication
+    from PyQt5.QtGui import QIcon
+with StartupProfiler.phase(StartupProfiler.IMPORT, "主窗口"):
+    from ui.main_window_new import MainWindow
+    from core.utils.qt_event_loop import install_qt_event_loop
+    from core.utils.config_manager import ConfigManager
 
 def main():
     app = QApplication(sys.argv)
+    # 启用asyncio存储引擎并安装了qasync时，由Qt事件循环同时驱动引擎的协程（须在创建页面之前）
+    loop = None
+    if ConfigManager().get_transfer_config().get("asyncio_engine", False):
+        loop = install_qt_event_loop(app)
     
-    # 创建并显示主窗口
+    # 创建并显示主窗口（启动耗时在首次显示后输出）
     window = MainWindow()
     window.show()
     
-    sys.exit(app.exec_())
+    if loop is None:
+        sys.exit(app.exec_())
+    with loop:
+        loop.run_forever()
 
 if __name__ == '__main__':
+    # 缩略图在spawn子进程中生成；PyInstaller打包后子进程会重新运行本程序，须先交给multiprocessing处理
+    multiprocessing.freeze_support()
     main()
@@ -3,17 +3,14 @@ from PyQt5.QtWidgets import (
     QPushButton, QStackedWidget, QLabel, QFrame,
     QSizePolicy, QTabWidget
 )
-from PyQt5.QtCore import Qt, QSize
+from PyQt5.QtCore import Qt, QSize, QTimer
 from PyQt5.QtGui import QIcon, QFont
-from ui.pages.home_page import HomePage
-from ui.pages.command_page import CommandPage
-from ui.pages.file_manager_page import FileManagerPage
-from ui.pages.file_select_page import FileSelectPage
-from ui.pages.settings_page import SettingsPage
-from ui.pages.stats_page import StatsPage
+import importlib
 from core.utils.config_manager import ConfigManager
 from core.services.minio_service import MinioService
+from core.services.connection_manager import ConnectionManager
 from core.utils.logger import LogManager
+from core.utils.startup_profiler import StartupProfiler
 
 class ModernSidebarButton(QPushButton):
     def __init__(self, text="", icon=None, parent=None):
@@ -41,6 +38,14 @@ class ModernSidebarButton(QPushButton):
         """)
 
 class MainWindow(QMainWindow):
+    # 标签页：(属性名, 标题, 模块, 类名)。页面在第一次切换到该标签时才导入和构建
+    PAGES = [
+        ("command_page", "命令生成", "ui.pages.command_page", "CommandPage"),
+        ("file_manager_page", "文件管理", "ui.pages.file_manager_page", "FileManagerPage"),
+        ("stats_page", "统计信息", "ui.pages.stats_page", "StatsPage"),
+        ("settings_page", "设置", "ui.pages.settings_page", "SettingsPage"),
+    ]
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle("MinIO文件管理器")
@@ -48,7 +53,10 @@ class MainWindow(QMainWindow):
         
         # 初始化服务和管理器
         self.config_manager = ConfigManager()
-        self.minio_service = MinioService(self.config_manager)
+        with StartupProfiler.phase(StartupProfiler.CONNECT, "MinIO服务"):
+            self.minio_service = MinioService(self.config_manager)
+            # 在后台建立连接，连接建立前各页面显示本地缓存的列表
+            self.connection = ConnectionManager.instance(self.minio_service)
         self.log_manager = LogManager()
         
         # 创建中心部件
@@ -59,24 +67,69 @@ class MainWindow(QMainWindow):
         layout = QVBoxLayout()
         central_widget.setLayout(layout)
         
-        # 创建标签页
-        tab_widget = QTabWidget()
+        # 创建标签页，先放空的容器，页面按需构建
+        self.tab_widget = tab_widget = QTabWidget()
         layout.addWidget(tab_widget)
-        
-        # 创建各个页面
-        self.command_page = CommandPage(self.minio_service)
-        self.stats_page = StatsPage(self.log_manager)
-        self.settings_page = SettingsPage(self.config_manager)
-        self.file_manager_page = FileManagerPage(self.minio_service)
-        
-        # 连接命令页面和统计页面
-        self.stats_page.connect_command_page(self.command_page)
-        
-        # 添加标签页
-        tab_widget.addTab(self.command_page, "命令生成")
-        tab_widget.addTab(self.file_manager_page, "文件管理")
-        tab_widget.addTab(self.stats_page, "统计信息")
-        tab_widget.addTab(self.settings_page, "设置")
+        self.page_containers = []
+        for attr, title, _, _ in self.PAGES:
+            setattr(self, attr, None)
+            container = QWidget()
+            container_layout = QVBoxLayout(container)
+            container_layout.setContentsMargins(0, 0, 0, 0)
+            self.page_containers.append(container)
+            tab_widget.addTab(container, title)
+        tab_widget.currentChanged.connect(self.ensure_page)
+        self.ensure_page(tab_widget.currentIndex())
+        self.startup_reported = False
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if not self.startup_reported:
+            self.startup_reported = True
+            # 等首次绘制完成后再输出启动耗时
+            QTimer.singleShot(0, self.report_startup)
+
+    def report_startup(self):
+        budget_ms = self.config_manager.get_ui_config().get(
+            "startup_budget_ms", ConfigManager.DEFAULT_CONFIG["ui"]["startup_budget_ms"])
+        print(StartupProfiler.report(budget_ms))
+
+    def ensure_page(self, index: int):
+        """构建标签页对应的页面（只在第一次切换到该标签时执行）"""
+        if index < 0:
+            return None
+        attr, title, module_name, class_name = self.PAGES[index]
+        page = getattr(self, attr)
+        if page is not None:
+            return page
+        with StartupProfiler.phase(StartupProfiler.IMPORT, title):
+            page_class = getattr(importlib.import_module(module_name), class_name)
+        with StartupProfiler.phase(StartupProfiler.PAGE, title):
+            page = self.create_page(attr, page_class)
+        setattr(self, attr, page)
+        self.page_containers[index].layout().addWidget(page)
+        self.connect_pages(attr)
+        return page
+
+    def create_page(self, attr: str, page_class):
+        if attr == "stats_page":
+            return page_class(self.log_manager)
+        if attr == "settings_page":
+            return page_class(self.config_manager)
+        return page_class(self.minio_service)
+
+    def connect_pages(self, built: str):
+        """命令页面和统计页面中后构建的一个完成时，连接两者"""
+        if built in ("command_page", "stats_page") and self.command_page is not None \
+                and self.stats_page is not None:
+            self.stats_page.connect_command_page(self.command_page)
+        if built == "settings_page":
+            self.settings_page.settings_saved.connect(self.apply_settings)
+
+    def apply_settings(self):
+        """设置保存后让共享目录按新的间隔核对用量"""
+        from core.services.object_catalog import ObjectCatalog
+        ObjectCatalog.instance(self.minio_service).update_audit_interval()
     
     def switch_page(self, index):
         """切换页面并更新按钮状态"""
@@ -0,0 +1,104 @@
+from typing import Iterable, List
+from PyQt5.QtCore import Qt, QAbstractListModel, QModelIndex
+
+class CheckableFileModel(QAbstractListModel):
+    """带复选框的文件名列表
+
+    勾选状态保存在集合中，不为每个文件创建控件；全选、清除和取出勾选的文件都不经过视图。
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._files: List[str] = []
+        self._rows = {}  # 文件名 -> 行号
+        self._checked = set()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._files)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        name = self._files[index.row()]
+        if role in (Qt.DisplayRole, Qt.ToolTipRole):
+            return name
+        if role == Qt.CheckStateRole:
+            return Qt.Checked if name in self._checked else Qt.Unchecked
+        return None
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if role != Qt.CheckStateRole or not index.isValid():
+            return False
+        name = self._files[index.row()]
+        if value == Qt.Checked:
+            self._checked.add(name)
+        else:
+            self._checked.discard(name)
+        self.dataChanged.emit(index, index, [Qt.CheckStateRole])
+        return True
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable | Qt.ItemIsUserCheckable
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._rows
+
+    def files(self) -> List[str]:
+        return list(self._files)
+
+    def checked_files(self) -> List[str]:
+        """勾选的文件，按列表中的顺序"""
+        return [name for name in self._files if name in self._checked]
+
+    def add_files(self, names: Iterable[str], checked: bool = True) -> int:
+        """追加列表中还没有的文件，返回实际添加的数量"""
+        new = []
+        for name in names:
+            if name not in self._rows:
+                self._rows[name] = len(self._files) + len(new)
+                new.append(name)
+        if not new:
+            return 0
+        first = len(self._files)
+        self.beginInsertRows(QModelIndex(), first, first + len(new) - 1)
+        self._files.extend(new)
+        if checked:
+            self._checked.update(new)
+        self.endInsertRows()
+        return len(new)
+
+    def remove_rows(self, rows: Iterable[int]):
+        """移除指定的行，相邻的行合并为一次移除"""
+        rows = sorted(set(rows), reverse=True)
+        if not rows:
+            return
+        ranges = []
+        for row in rows:
+            if ranges and ranges[-1][0] == row + 1:
+                ranges[-1][0] = row
+            else:
+                ranges.append([row, row])
+        for first, last in ranges:
+            self.beginRemoveRows(QModelIndex(), first, last)
+            for name in self._files[first:last + 1]:
+                self._checked.discard(name)
+            del self._files[first:last + 1]
+            self.endRemoveRows()
+        self._rows = {name: row for row, name in enumerate(self._files)}
+
+    def set_all_checked(self, checked: bool):
+        if checked:
+            self._checked = set(self._files)
+        else:
+            self._checked.clear()
+        if self._files:
+            self.dataChanged.emit(self.index(0), self.index(len(self._files) - 1), [Qt.CheckStateRole])
+
+    def clear(self):
+        self.beginResetModel()
+        self._files.clear()
+        self._rows.clear()
+        self._checked.clear()
+        self.endResetModel()
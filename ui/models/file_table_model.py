@@ -0,0 +1,277 @@
+import re
+from typing import Callable, Optional
+import numpy as np
+from PyQt5.QtCore import Qt, QAbstractTableModel, QAbstractProxyModel, QModelIndex
+from core.services.name_index import SUBSTRING, compile_matcher
+
+class FileTableModel(QAbstractTableModel):
+    """以共享目录的行作为数据源的表格模型
+
+    不复制任何记录，视图请求哪个单元格才格式化哪个单元格。模型行号就是目录行号：
+    新对象追加在末尾，删除的对象只是不再显示，目录压缩后整体重置。
+    """
+    HEADERS = ["名称", "大小", "修改日期", "类型"]
+    SORT_KEYS = ("name", "size", "mtime", "type")
+
+    def __init__(self, catalog, type_of: Callable[[str], str], parent=None):
+        super().__init__(parent)
+        self.catalog = catalog
+        self.type_of = type_of  # 扩展名 -> 类型名称
+        self._row_count = catalog.table.row_count()
+        self._tooltips = {}  # 行号 -> 元数据提示
+        catalog.files_reset.connect(self.reset)
+        catalog.rows_changed.connect(self.update_rows)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._row_count
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        row = index.row()
+        table = self.catalog.table
+        if not index.isValid() or row >= table.row_count() or not table.is_live(row):
+            return None
+        column = index.column()
+        if role == Qt.DisplayRole:
+            if column == 0:
+                return table.name(row)
+            if column == 1:
+                return table.display_size(row)
+            if column == 2:
+                return table.display_time(row)
+            return self.type_of(table.extension(row))
+        if role == Qt.TextAlignmentRole and column == 1:
+            return int(Qt.AlignRight | Qt.AlignVCenter)
+        if role == Qt.ToolTipRole and column == 0:
+            return self._tooltips.get(row)
+        return None
+
+    def name(self, row: int) -> str:
+        return self.catalog.table.name(row)
+
+    def set_tooltip(self, row: int, text: str):
+        self._tooltips[row] = text
+        index = self.index(row, 0)
+        self.dataChanged.emit(index, index, [Qt.ToolTipRole])
+
+    def reset(self):
+        self.beginResetModel()
+        self._row_count = self.catalog.table.row_count()
+        self._tooltips.clear()
+        self.endResetModel()
+
+    def update_rows(self, rows):
+        """目录变更后通知视图：末尾追加的新行和内容变化（或被删除）的已有行"""
+        count = self.catalog.table.row_count()
+        if count > self._row_count:
+            self.beginInsertRows(QModelIndex(), self._row_count, count - 1)
+            self._row_count = count
+            self.endInsertRows()
+        if len(rows) == 0:
+            return
+        for row in rows:
+            self._tooltips.pop(row, None)
+        # 一次通知覆盖所有变化的行，代理模型在其中找出真正变化的行
+        self.dataChanged.emit(self.index(int(min(rows)), 0), self.index(int(max(rows)), len(self.HEADERS) - 1))
+
+
+class FileFilterProxyModel(QAbstractProxyModel):
+    """用一个行号数组表示过滤和排序结果的代理模型
+
+    过滤条件或排序方式改变时，在共享目录的名称索引和NumPy列上一次算出整个顺序；
+    源模型追加的行只追加到末尾（流式列举时不重新排序）；一批修改或删除的行在一次布局变化中处理。
+    """
+    # 变化范围不超过该行数时逐行判断是否符合条件，否则在NumPy列上整体计算
+    ROW_MATCH_LIMIT = 256
+
+    def __init__(self, catalog, type_of: Callable[[str], str], parent=None):
+        super().__init__(parent)
+        self.catalog = catalog
+        self.type_of = type_of
+        self._order = np.empty(0, dtype=np.int64)  # 代理行号 -> 源行号
+        self._positions: Optional[np.ndarray] = None  # 源行号 -> 代理行号，按需重建
+        self._pattern = ""
+        self._mode = SUBSTRING
+        self._file_type = None
+        self._sort_key = None
+        self._descending = False
+
+    def setSourceModel(self, model):
+        self.beginResetModel()
+        super().setSourceModel(model)
+        model.modelAboutToBeReset.connect(self.beginResetModel)
+        model.modelReset.connect(self._finish_reset)
+        model.rowsInserted.connect(self._source_rows_inserted)
+        model.dataChanged.connect(self._source_data_changed)
+        self._rebuild()
+        self.endResetModel()
+
+    def set_filter(self, pattern: str, mode: str = SUBSTRING, file_type: Optional[str] = None):
+        """设置名称搜索条件和文件类型（None表示所有类型）"""
+        self.beginResetModel()
+        self._pattern, self._mode, self._file_type = pattern, mode, file_type
+        self._rebuild()
+        self.endResetModel()
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        self.beginResetModel()
+        self._sort_key = FileTableModel.SORT_KEYS[column] if column >= 0 else None
+        self._descending = order == Qt.DescendingOrder
+        self._rebuild()
+        self.endResetModel()
+
+    def source_rows(self, proxy_rows) -> np.ndarray:
+        return self._order[np.asarray(proxy_rows, dtype=np.int64)]
+
+    def proxy_row(self, source_row: int) -> int:
+        """源行在代理中的行号，不显示时返回-1"""
+        positions = self._position_map()
+        return int(positions[source_row]) if source_row < len(positions) else -1
+
+    # QAbstractProxyModel接口
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._order)
+
+    def columnCount(self, parent=QModelIndex()):
+        return len(FileTableModel.HEADERS)
+
+    def index(self, row, column, parent=QModelIndex()):
+        if parent.isValid() or not (0 <= row < len(self._order)) or not (0 <= column < self.columnCount()):
+            return QModelIndex()
+        return self.createIndex(row, column)
+
+    def parent(self, index=None):
+        return QModelIndex()
+
+    def mapToSource(self, proxy_index):
+        if not proxy_index.isValid():
+            return QModelIndex()
+        return self.sourceModel().index(int(self._order[proxy_index.row()]), proxy_index.column())
+
+    def mapFromSource(self, source_index):
+        if not source_index.isValid():
+            return QModelIndex()
+        row = self.proxy_row(source_index.row())
+        return QModelIndex() if row < 0 else self.index(row, source_index.column())
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal:
+            return self.sourceModel().headerData(section, orientation, role)
+        if role == Qt.DisplayRole:
+            return section + 1
+        return None
+
+    # 内部实现
+
+    def _finish_reset(self):
+        self._rebuild()
+        self.endResetModel()
+
+    def _rebuild(self):
+        """按当前条件重新计算整个顺序"""
+        mask = self._mask()
+        if self._sort_key is None:
+            self._order = np.flatnonzero(mask)
+        else:
+            self._order = self.catalog.sort_rows(self._sort_key, self._descending, mask, self.type_of)
+        self._positions = None
+
+    def _mask(self) -> np.ndarray:
+        """每个源行是否符合当前条件"""
+        columns = self.catalog.columns()
+        mask = columns.live.copy()
+        if self._pattern:
+            try:
+                mask &= self.catalog.name_mask(self._pattern, self._mode)
+            except re.error:
+                mask[:] = False
+        if self._file_type is not None:
+            mask &= columns.extension_mask(
+                i for i, ext in enumerate(columns.extensions) if self.type_of(ext) == self._file_type)
+        return mask
+
+    def _position_map(self) -> np.ndarray:
+        if self._positions is None or len(self._positions) < self.catalog.table.row_count():
+            positions = np.full(self.catalog.table.row_count(), -1, dtype=np.int64)
+            positions[self._order] = np.arange(len(self._order))
+            self._positions = positions
+        return self._positions
+
+    def _matcher(self):
+        try:
+            match_name = compile_matcher(self._pattern, self._mode)
+        except re.error:
+            return lambda row: False
+        table = self.catalog.table
+
+        def matches(row):
+            if not table.is_live(row):
+                return False
+            if match_name is not None and not match_name(table.name(row)):
+                return False
+            return self._file_type is None or self.type_of(table.extension(row)) == self._file_type
+        return matches
+
+    def _source_rows_inserted(self, parent, first, last):
+        """源模型追加的行：符合条件的追加到末尾"""
+        matches = self._matcher()
+        rows = [row for row in range(first, last + 1) if matches(row)]
+        if not rows:
+            return
+        start = len(self._order)
+        self.beginInsertRows(QModelIndex(), start, start + len(rows) - 1)
+        self._order = np.concatenate([self._order, np.array(rows, dtype=np.int64)])
+        if self._positions is not None:
+            self._positions = None
+        self.endInsertRows()
+
+    def _source_data_changed(self, top_left, bottom_right, roles=()):
+        """源模型修改的行：不再符合条件（或已删除）的移除，新符合条件的追加，其余只刷新显示
+
+        移除和追加在一次布局变化中完成，刷新显示只发出一次dataChanged。
+        """
+        first, last = top_left.row(), bottom_right.row()
+        rows = np.arange(first, last + 1)
+        proxy_rows = self._position_map()[rows]
+        shown = proxy_rows >= 0
+        if roles and Qt.DisplayRole not in roles:
+            self._emit_changed(proxy_rows[shown], roles)
+            return
+        if len(rows) <= self.ROW_MATCH_LIMIT:
+            matches = self._matcher()
+            visible = np.fromiter((matches(row) for row in range(first, last + 1)), dtype=bool, count=len(rows))
+        else:
+            visible = self._mask()[first:last + 1]
+        removed = proxy_rows[shown & ~visible]
+        added = rows[~shown & visible]
+        if len(removed) or len(added):
+            self._update_order(removed, added)
+        else:
+            self._emit_changed(proxy_rows[shown])
+
+    def _update_order(self, removed: np.ndarray, added: np.ndarray):
+        """删除代理行removed并在末尾追加源行added，保持其余行的相对顺序和视图中的选择"""
+        self.layoutAboutToBeChanged.emit()
+        keep = np.ones(len(self._order), dtype=bool)
+        keep[removed] = False
+        new_rows = np.cumsum(keep) - 1  # 保留的行在新顺序中的位置
+        self._order = np.concatenate([self._order[keep], added.astype(np.int64)])
+        self._positions = None
+        old_indexes = self.persistentIndexList()
+        new_indexes = [self.index(int(new_rows[index.row()]), index.column()) if keep[index.row()] else QModelIndex()
+                       for index in old_indexes]
+        self.changePersistentIndexList(old_indexes, new_indexes)
+        self.layoutChanged.emit()
+
+    def _emit_changed(self, proxy_rows: np.ndarray, roles=()):
+        if len(proxy_rows):
+            self.dataChanged.emit(self.index(int(proxy_rows.min()), 0),
+                                  self.index(int(proxy_rows.max()), self.columnCount() - 1), list(roles))
@@ -0,0 +1,66 @@
+from typing import Callable, Iterable, Set
+from PyQt5.QtCore import Qt, QIdentityProxyModel, QSize
+from PyQt5.QtGui import QColor, QPixmap
+from PyQt5.QtWidgets import QApplication, QStyle
+
+class ThumbnailProxyModel(QIdentityProxyModel):
+    """在文件列表（过滤和排序后的代理模型）上加缩略图，供网格视图使用
+
+    只有视图绘制到的图片才会请求缩略图；缩略图生成后只刷新对应的一格。
+    """
+
+    def __init__(self, catalog, thumbnails, is_image: Callable[[str], bool], parent=None):
+        super().__init__(parent)
+        self.catalog = catalog
+        self.thumbnails = thumbnails
+        self.is_image = is_image  # 扩展名 -> 是否为图片
+        self.painted: Set[str] = set()  # 上次clear_painted()之后视图请求过缩略图的对象名
+        size = thumbnails.size
+        self._placeholder = QPixmap(size, size)
+        self._placeholder.fill(QColor("#f0f0f0"))
+        self._file_icon = QApplication.style().standardIcon(QStyle.SP_FileIcon).pixmap(QSize(size // 2, size // 2))
+        thumbnails.thumbnail_ready.connect(self._thumbnail_ready)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or index.column() != 0:
+            return super().data(index, role)
+        row = self.table_row(index)
+        table = self.catalog.table
+        if row < 0 or not table.is_live(row):
+            return None
+        if role == Qt.DisplayRole:
+            return table.basename(row)
+        if role == Qt.ToolTipRole:
+            return table.name(row)
+        if role == Qt.DecorationRole:
+            if not self.is_image(table.extension(row)):
+                return self._file_icon
+            name = table.name(row)
+            self.painted.add(name)
+            image = self.thumbnails.get(name, table.etag(row))
+            return self._placeholder if image is None else image
+        return super().data(index, role)
+
+    def table_row(self, index) -> int:
+        """代理中的行对应的目录行号"""
+        source = self.mapToSource(index)
+        return self.sourceModel().mapToSource(source).row() if source.isValid() else -1
+
+    def names(self, rows: Iterable[int]):
+        """代理行号对应的对象名"""
+        table = self.catalog.table
+        return [table.name(self.table_row(self.index(row, 0))) for row in rows]
+
+    def clear_painted(self):
+        self.painted.clear()
+
+    def _thumbnail_ready(self, name: str, size: int):
+        if size != self.thumbnails.size:
+            return
+        table_row = self.catalog.table.find(name)
+        if table_row is None:
+            return
+        row = self.sourceModel().proxy_row(table_row)
+        if row >= 0:
+            index = self.index(row, 0)
+            self.dataChanged.emit(index, index, [Qt.DecorationRole])
@@ -0,0 +1,78 @@
+from typing import List
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex
+import humanize
+
+class TransferJobModel(QAbstractTableModel):
+    """传输队列中的任务列表
+
+    状态改变时只刷新对应的一行；进度随调度器的定时汇总整体刷新一次，视图只重绘可见的行。
+    """
+    HEADERS = ["名称", "类型", "大小", "进度", "状态", "优先级"]
+    KINDS = {"upload": "上传", "download": "下载"}
+
+    def __init__(self, scheduler, parent=None):
+        super().__init__(parent)
+        self.scheduler = scheduler
+        self._rows = {id(job): row for row, job in enumerate(scheduler.jobs)}
+        scheduler.jobs_reset.connect(self._reset)
+        scheduler.job_changed.connect(self._job_changed)
+        scheduler.progress_changed.connect(self._progress_changed)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.HEADERS[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or index.row() >= len(self._rows):
+            return None
+        job = self.scheduler.jobs[index.row()]
+        column = index.column()
+        if role == Qt.DisplayRole:
+            if column == 0:
+                return job.name
+            if column == 1:
+                return self.KINDS.get(job.kind, job.kind)
+            if column == 2:
+                return humanize.naturalsize(job.size, binary=True)
+            if column == 3:
+                return f"{job.sent * 100 // job.size}%" if job.size else "0%"
+            if column == 4:
+                return f"{job.state}: {job.error}" if job.error else job.state
+            if column == 5:
+                return job.priority
+        if role == Qt.ToolTipRole and column in (0, 4):
+            return job.error or job.name
+        return None
+
+    def job(self, row: int):
+        return self.scheduler.jobs[row]
+
+    def jobs(self, rows) -> List:
+        return [self.scheduler.jobs[row] for row in rows]
+
+    def _reset(self):
+        self.beginResetModel()
+        self._rows = {}
+        self.endResetModel()
+
+    def _job_changed(self, job):
+        row = self._rows.get(id(job))
+        if row is None:
+            # 新提交的任务总是追加在末尾
+            row = len(self._rows)
+            self.beginInsertRows(QModelIndex(), row, row)
+            self._rows[id(job)] = row
+            self.endInsertRows()
+            return
+        self.dataChanged.emit(self.index(row, 0), self.index(row, len(self.HEADERS) - 1))
+
+    def _progress_changed(self, _):
+        if self._rows:
+            self.dataChanged.emit(self.index(0, 3), self.index(len(self._rows) - 1, 3))
@@ -0,0 +1,130 @@
+from PyQt5.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QFormLayout, QLineEdit, QComboBox,
+    QDoubleSpinBox, QDateEdit, QCheckBox, QLabel, QPushButton
+)
+from PyQt5.QtCore import QDate, QTimer
+import re
+from datetime import datetime, time
+from core.services.name_index import SEARCH_MODES, GLOB
+
+class BulkSelectDialog(QDialog):
+    """按名称、扩展名、大小和修改时间批量选择文件，条件由共享目录的列快照一次算出"""
+
+    def __init__(self, catalog, parent=None):
+        super().__init__(parent)
+        self.catalog = catalog
+        self.matches = []
+        self.init_ui()
+
+    def init_ui(self):
+        self.setWindowTitle("批量选择")
+        self.setMinimumWidth(420)
+        layout = QVBoxLayout()
+        form = QFormLayout()
+
+        # 名称模式
+        pattern_layout = QHBoxLayout()
+        self.pattern_input = QLineEdit()
+        self.pattern_input.setPlaceholderText("例如 backup/*.zip，留空表示不限")
+        self.mode_combo = QComboBox()
+        self.mode_combo.addItems(["包含", "前缀", "通配符", "正则"])
+        self.mode_combo.setCurrentIndex(SEARCH_MODES.index(GLOB))
+        pattern_layout.addWidget(self.pattern_input)
+        pattern_layout.addWidget(self.mode_combo)
+        form.addRow("名称:", pattern_layout)
+
+        # 扩展名
+        self.extensions_input = QLineEdit()
+        self.extensions_input.setPlaceholderText("例如 zip, 7z，留空表示不限")
+        form.addRow("扩展名:", self.extensions_input)
+
+        # 大小范围（MB，0表示不限）
+        size_layout = QHBoxLayout()
+        self.size_min = self.create_size_spin()
+        self.size_max = self.create_size_spin()
+        size_layout.addWidget(self.size_min)
+        size_layout.addWidget(QLabel("至"))
+        size_layout.addWidget(self.size_max)
+        form.addRow("大小:", size_layout)
+
+        # 修改时间范围，默认最近7天
+        date_layout = QHBoxLayout()
+        self.date_check = QCheckBox()
+        self.date_from = QDateEdit(QDate.currentDate().addDays(-7))
+        self.date_to = QDateEdit(QDate.currentDate())
+        for date_edit in (self.date_from, self.date_to):
+            date_edit.setCalendarPopup(True)
+            date_edit.setDisplayFormat("yyyy-MM-dd")
+        date_layout.addWidget(self.date_check)
+        date_layout.addWidget(self.date_from)
+        date_layout.addWidget(QLabel("至"))
+        date_layout.addWidget(self.date_to)
+        form.addRow("修改时间:", date_layout)
+
+        layout.addLayout(form)
+
+        self.count_label = QLabel()
+        layout.addWidget(self.count_label)
+
+        btn_layout = QHBoxLayout()
+        btn_layout.addStretch()
+        self.select_btn = QPushButton("选择")
+        self.select_btn.setDefault(True)
+        self.select_btn.clicked.connect(self.accept)
+        cancel_btn = QPushButton("取消")
+        cancel_btn.clicked.connect(self.reject)
+        btn_layout.addWidget(self.select_btn)
+        btn_layout.addWidget(cancel_btn)
+        layout.addLayout(btn_layout)
+        self.setLayout(layout)
+
+        # 条件变化后稍等再统计，避免每次按键都重新计算
+        self.update_timer = QTimer(self)
+        self.update_timer.setSingleShot(True)
+        self.update_timer.setInterval(200)
+        self.update_timer.timeout.connect(self.update_matches)
+        self.pattern_input.textChanged.connect(lambda _: self.update_timer.start())
+        self.extensions_input.textChanged.connect(lambda _: self.update_timer.start())
+        self.mode_combo.currentIndexChanged.connect(lambda _: self.update_timer.start())
+        self.size_min.valueChanged.connect(lambda _: self.update_timer.start())
+        self.size_max.valueChanged.connect(lambda _: self.update_timer.start())
+        self.date_check.toggled.connect(lambda _: self.update_timer.start())
+        self.date_from.dateChanged.connect(lambda _: self.update_timer.start())
+        self.date_to.dateChanged.connect(lambda _: self.update_timer.start())
+        self.update_matches()
+
+    def create_size_spin(self):
+        spin = QDoubleSpinBox()
+        spin.setRange(0, 1024 * 1024)
+        spin.setDecimals(1)
+        spin.setSuffix(" MB")
+        spin.setSpecialValueText("不限")
+        return spin
+
+    def update_matches(self):
+        """按当前条件重新筛选并显示匹配数量"""
+        try:
+            self.matches = self.catalog.select(**self.criteria())
+            self.count_label.setText(f"匹配: {len(self.matches)} 个文件")
+        except re.error as e:
+            self.matches = []
+            self.count_label.setText(f"正则表达式无效: {e}")
+        self.select_btn.setEnabled(bool(self.matches))
+
+    def criteria(self):
+        """当前条件，对应ObjectCatalog.select的参数"""
+        extensions = [ext.strip() for ext in re.split(r"[,，\s]+", self.extensions_input.text()) if ext.strip()]
+        criteria = {
+            "pattern": self.pattern_input.text(),
+            "mode": SEARCH_MODES[self.mode_combo.currentIndex()],
+            "size_min": int(self.size_min.value() * 1024 * 1024) if self.size_min.value() else None,
+            "size_max": int(self.size_max.value() * 1024 * 1024) if self.size_max.value() else None,
+            "extensions": extensions or None
+        }
+        if self.date_check.isChecked():
+            criteria["since"] = datetime.combine(self.date_from.date().toPyDate(), time.min).astimezone()
+            criteria["until"] = datetime.combine(self.date_to.date().toPyDate(), time.max).astimezone()
+        return criteria
+
+    def selected_files(self):
+        return self.matches
@@ -3,25 +3,34 @@ from PyQt5.QtWidgets import (
     QTextEdit, QLabel, QFrame, QComboBox,
     QCheckBox, QScrollArea, QMessageBox, QLineEdit,
     QGridLayout, QSpinBox, QApplication, QFileDialog,
-    QListWidget, QListWidgetItem, QDialog,
+    QListView, QDialog,
     QTreeWidget, QTreeWidgetItem, QHeaderView
 )
 from PyQt5.QtCore import Qt, pyqtSignal
 from PyQt5.QtGui import QFont
 import os
+import re
 import platform
 from core.command_builder import CommandBuilder
 from core.services.minio_service import MinioService
 from core.utils.config_manager import ConfigManager
 from core.utils.logger import LogManager
+from core.services.object_catalog import ObjectCatalog
+from core.services.name_index import SEARCH_MODES, compile_matcher
+from ui.pages.bulk_select_dialog import BulkSelectDialog
+from ui.models.file_check_model import CheckableFileModel
 import pyperclip
 from datetime import timedelta
 
 class FileSelectDialog(QDialog):
+    REMOVE_ONE_BY_ONE = 16  # 一次删除的项目不超过该数量时逐个移除
+
     def __init__(self, minio_service):
         super().__init__()
         self.minio_service = minio_service
         self.selected_files = []
+        self.name_items = {}  # 文件名 -> 列表项
+        self.catalog = ObjectCatalog.instance(minio_service)
         self.init_ui()
         
     def init_ui(self):
@@ -39,6 +48,12 @@ class FileSelectDialog(QDialog):
         self.search_input.textChanged.connect(self.filter_files)
         filter_layout.addWidget(QLabel("搜索:"))
         filter_layout.addWidget(self.search_input)
+
+        # 搜索方式，顺序与SEARCH_MODES一致
+        self.search_mode_combo = QComboBox()
+        self.search_mode_combo.addItems(["包含", "前缀", "通配符", "正则"])
+        self.search_mode_combo.currentIndexChanged.connect(lambda _: self.filter_files())
+        filter_layout.addWidget(self.search_mode_combo)
         
         # 文件类型过滤
         self.type_combo = QComboBox()
@@ -74,6 +89,10 @@ class FileSelectDialog(QDialog):
         self.select_all_btn.setCheckable(True)
         self.select_all_btn.clicked.connect(self.toggle_select_all)
         
+        # 按条件批量勾选
+        self.bulk_select_btn = QPushButton("批量选择")
+        self.bulk_select_btn.clicked.connect(self.bulk_select)
+        
         # 刷新按钮
         self.refresh_btn = QPushButton("刷新列表")
         self.refresh_btn.clicked.connect(self.refresh_files)
@@ -84,6 +103,7 @@ class FileSelectDialog(QDialog):
         self.cancel_btn = QPushButton("取消")
         
         btn_layout.addWidget(self.select_all_btn)
+        btn_layout.addWidget(self.bulk_select_btn)
         btn_layout.addWidget(self.refresh_btn)
         btn_layout.addStretch()
         btn_layout.addWidget(self.select_btn)
@@ -96,8 +116,12 @@ class FileSelectDialog(QDialog):
         self.select_btn.clicked.connect(self.accept)
         self.cancel_btn.clicked.connect(self.reject)
         
-        # 加载文件列表
-        self.refresh_files()
+        # 加载文件列表（共享目录已有缓存时立即显示）
+        self.catalog.files_reset.connect(self.show_catalog_files)
+        self.catalog.files_changed.connect(self.apply_delta)
+        self.catalog.error.connect(self.show_catalog_error)
+        self.show_catalog_files()
+        self.catalog.refresh()
         
     def get_file_type(self, filename):
         """获取文件类型"""
@@ -119,39 +143,131 @@ class FileSelectDialog(QDialog):
         return f"{size:.1f} TB"
         
     def refresh_files(self):
-        """刷新文件列表"""
-        try:
-            self.file_tree.clear()
-            files = self.minio_service.list_files()
-            for file in files:
-                item = QTreeWidgetItem(self.file_tree)
-                item.setFlags(item.flags() | Qt.ItemIsUserCheckable)  # 启用复选框
-                item.setCheckState(0, Qt.Unchecked)  # 设置复选框初始状态
-                item.setText(0, file["name"])
-                item.setText(1, self.format_size(file["size"]))
-                item.setText(2, file["last_modified"].strftime("%Y-%m-%d %H:%M"))
-                item.setText(3, self.get_file_type(file["name"]))
-            self.filter_files()
-        except Exception as e:
-            QMessageBox.warning(self, "错误", f"获取文件列表失败: {str(e)}")
+        """刷新文件列表（由共享目录在后台与服务器对账）"""
+        self.catalog.refresh(force=True)
+
+    def show_catalog_files(self):
+        """用共享目录中的全部文件重建列表"""
+        self.file_tree.clear()
+        self.name_items.clear()
+        self.append_files(self.catalog.files())
+
+    def apply_delta(self, delta):
+        """将目录变更应用到列表，只改动发生变化的项目"""
+        for file in delta["updated"]:
+            item = self.name_items.get(file["name"])
+            if item is not None:
+                self.set_item(item, file)
+        if delta["added"]:
+            self.append_files(delta["added"])
+        if delta["removed"]:
+            self.remove_items(delta["removed"])
+
+    def remove_items(self, names):
+        """从列表中移除对象；数量多时一次取出全部项目再放回保留的，不逐项查找位置"""
+        items = [item for item in (self.name_items.pop(name, None) for name in names) if item is not None]
+        if len(items) <= self.REMOVE_ONE_BY_ONE:
+            for item in items:
+                self.file_tree.takeTopLevelItem(self.file_tree.indexOfTopLevelItem(item))
+            return
+        removed = {id(item) for item in items}
+        root = self.file_tree.invisibleRootItem()
+        hidden = {id(root.child(i)) for i in range(root.childCount()) if root.child(i).isHidden()}
+        kept = [item for item in root.takeChildren() if id(item) not in removed]
+        self.file_tree.addTopLevelItems(kept)
+        for item in kept:
+            if id(item) in hidden:
+                item.setHidden(True)
+
+    def show_catalog_error(self, message):
+        if self.isVisible():
+            QMessageBox.warning(self, "错误", f"获取文件列表失败: {message}")
+
+    def append_files(self, files):
+        """将一页文件追加到列表"""
+        match_name = self.name_matcher()
+        file_type = self.type_combo.currentText()
+        items = []
+        for file in files:
+            item = QTreeWidgetItem()
+            item.setFlags(item.flags() | Qt.ItemIsUserCheckable)  # 启用复选框
+            item.setCheckState(0, Qt.Unchecked)  # 设置复选框初始状态
+            self.set_item(item, file)
+            self.name_items[file["name"]] = item
+            items.append(item)
+        # 一次性添加整页，避免逐项触发信号
+        self.file_tree.addTopLevelItems(items)
+        for item in items:
+            item.setHidden(not self.item_matches(item, match_name, file_type))
+
+    def set_item(self, item, file):
+        """设置列表项的内容"""
+        item.setText(0, file["name"])
+        item.setText(1, self.format_size(file["size"]))
+        # 目录中修改时间未知的对象没有last_modified
+        item.setText(2, file["last_modified"].strftime("%Y-%m-%d %H:%M") if file["last_modified"] else "")
+        item.setText(3, self.get_file_type(file["name"]))
+
+    def done(self, result):
+        """关闭对话框时取消对共享目录的订阅"""
+        self.catalog.files_reset.disconnect(self.show_catalog_files)
+        self.catalog.files_changed.disconnect(self.apply_delta)
+        self.catalog.error.disconnect(self.show_catalog_error)
+        super().done(result)
             
     def filter_files(self):
-        """根据搜索文本和文件类型过滤文件"""
-        search_text = self.search_input.text().lower()
+        """根据搜索文本和文件类型过滤文件，只批量更新显示状态发生变化的项目"""
+        matches = self.catalog.search(self.search_input.text(), self.search_mode())
+        match_name = None if matches is None else matches.__contains__
         file_type = self.type_combo.currentText()
-        
-        for i in range(self.file_tree.topLevelItemCount()):
-            item = self.file_tree.topLevelItem(i)
-            filename = item.text(0).lower()
-            type_text = item.text(3)
-            
-            # 检查是否匹配搜索条件
-            matches_search = not search_text or search_text in filename
-            matches_type = file_type == "全部文件" or file_type == type_text
-            
-            # 显示或隐藏项目
-            item.setHidden(not (matches_search and matches_type))
+
+        self.file_tree.setUpdatesEnabled(False)
+        try:
+            for i in range(self.file_tree.topLevelItemCount()):
+                item = self.file_tree.topLevelItem(i)
+                hidden = not self.item_matches(item, match_name, file_type)
+                if item.isHidden() != hidden:
+                    item.setHidden(hidden)
+        finally:
+            self.file_tree.setUpdatesEnabled(True)
+
+    def search_mode(self):
+        return SEARCH_MODES[self.search_mode_combo.currentIndex()]
+
+    def name_matcher(self):
+        """当前搜索条件对应的单个文件名匹配函数，搜索为空时返回None"""
+        try:
+            return compile_matcher(self.search_input.text(), self.search_mode())
+        except re.error:
+            return lambda name: False
+
+    def item_matches(self, item, match_name, file_type):
+        """检查项目是否匹配搜索条件和文件类型"""
+        filename = item.text(0)
+        type_text = item.text(3)
+        matches_search = match_name is None or match_name(filename)
+        matches_type = file_type == "全部文件" or file_type == type_text
+        return matches_search and matches_type
             
+    def bulk_select(self):
+        """按条件批量勾选文件，勾选完成后只更新一次计数"""
+        dialog = BulkSelectDialog(self.catalog, self)
+        if dialog.exec_() != QDialog.Accepted:
+            return
+        # 清除搜索和类型过滤，使勾选的文件都可见
+        self.search_input.clear()
+        self.type_combo.setCurrentIndex(0)
+        self.file_tree.blockSignals(True)
+        try:
+            for name in dialog.selected_files():
+                item = self.name_items.get(name)
+                if item is not None:
+                    item.setCheckState(0, Qt.Checked)
+        finally:
+            self.file_tree.blockSignals(False)
+        self.file_tree.viewport().update()
+        self.update_selection_count()
+
     def toggle_select_all(self, checked):
         """全选/取消全选"""
         for i in range(self.file_tree.topLevelItemCount()):
@@ -177,63 +293,44 @@ class FileSelectDialog(QDialog):
                 selected.append(item.text(0))
         return selected
 
-class FileListWidget(QListWidget):
-    """自定义的文件列表控件，支持复选框"""
+class FileListWidget(QListView):
+    """带复选框的文件列表控件，勾选状态由CheckableFileModel保存"""
     def __init__(self):
         super().__init__()
-        self.setSelectionMode(QListWidget.NoSelection)  # 禁用默认选择模式
+        self.file_model = CheckableFileModel(self)
+        self.setModel(self.file_model)
+        self.setUniformItemSizes(True)  # 所有行等高，滚动时不逐行计算尺寸
+        self.setSelectionMode(QListView.ExtendedSelection)  # 高亮的行可以从列表中移除
         
     def add_file(self, filename):
-        """添加一个带复选框的文件项"""
-        item = QListWidgetItem()
-        self.addItem(item)
-        
-        widget = QWidget()
-        layout = QHBoxLayout()
-        layout.setContentsMargins(5, 2, 5, 2)
-        
-        checkbox = QCheckBox()
-        checkbox.setText(filename)
-        checkbox.setChecked(True)  # 默认选中
-        
-        layout.addWidget(checkbox)
-        layout.addStretch()
-        
-        widget.setLayout(layout)
-        item.setSizeHint(widget.sizeHint())
-        self.setItemWidget(item, widget)
+        """添加一个文件（默认勾选），已在列表中的文件忽略"""
+        self.file_model.add_files([filename])
+
+    def add_files(self, filenames):
+        """批量添加文件，返回新添加的数量"""
+        return self.file_model.add_files(filenames)
+
+    def contains(self, filename) -> bool:
+        return filename in self.file_model
         
     def get_selected_files(self):
-        """获取所有选中的文件"""
-        selected_files = []
-        for i in range(self.count()):
-            item = self.item(i)
-            widget = self.itemWidget(item)
-            if widget:  # 确保widget存在
-                checkbox = widget.layout().itemAt(0).widget()
-                if checkbox and checkbox.isChecked():  # 确保checkbox存在且被选中
-                    selected_files.append(checkbox.text())
-        return selected_files
+        """获取所有勾选的文件"""
+        return self.file_model.checked_files()
         
     def clear_selection(self):
-        """清除所有选择"""
-        for i in range(self.count()):
-            item = self.item(i)
-            widget = self.itemWidget(item)
-            if widget:  # 确保widget存在
-                checkbox = widget.layout().itemAt(0).widget()
-                if checkbox:  # 确保checkbox存在
-                    checkbox.setChecked(False)
+        """取消勾选所有文件"""
+        self.file_model.set_all_checked(False)
             
     def select_all(self):
-        """选择所有文件"""
-        for i in range(self.count()):
-            item = self.item(i)
-            widget = self.itemWidget(item)
-            if widget:  # 确保widget存在
-                checkbox = widget.layout().itemAt(0).widget()
-                if checkbox:  # 确保checkbox存在
-                    checkbox.setChecked(True)
+        """勾选所有文件"""
+        self.file_model.set_all_checked(True)
+
+    def remove_highlighted(self):
+        """从列表中移除高亮的行"""
+        self.file_model.remove_rows(index.row() for index in self.selectionModel().selectedRows())
+
+    def clear(self):
+        self.file_model.clear()
 
 class CommandPage(QWidget):
     # 添加命令生成完成的信号
@@ -361,17 +458,12 @@ class CommandPage(QWidget):
         """添加文件"""
         dialog = FileSelectDialog(self.minio_service)
         if dialog.exec_() == QDialog.Accepted:
-            selected_files = dialog.get_selected_files()
-            for file in selected_files:
-                # 检查是否已经添加
-                items = self.file_list.findItems(file, Qt.MatchExactly)
-                if not items:
-                    self.file_list.add_file(file)
+            # 已在列表中的文件会被忽略
+            self.file_list.add_files(dialog.get_selected_files())
             
     def remove_files(self):
         """移除选中的文件"""
-        for item in self.file_list.selectedItems():
-            self.file_list.takeItem(self.file_list.row(item))
+        self.file_list.remove_highlighted()
             
     def clear_files(self):
         """清空文件列表"""
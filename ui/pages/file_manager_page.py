@@ -1,46 +1,79 @@
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
-    QLineEdit, QTableWidget, QTableWidgetItem, QHeaderView,
+    QLineEdit, QTableView, QListView, QAbstractItemView, QHeaderView,
     QLabel, QComboBox, QProgressBar, QFrame, QMenu,
-    QMessageBox, QFileDialog, QInputDialog, QApplication
+    QMessageBox, QFileDialog, QInputDialog, QApplication,
+    QStackedWidget, QTreeWidget, QTreeWidgetItem, QShortcut
 )
-from PyQt5.QtCore import Qt, QSize, pyqtSignal, QThread
-from PyQt5.QtGui import QIcon, QClipboard
+from PyQt5.QtCore import Qt, QSize, QThreadPool, QTimer, QItemSelection, QItemSelectionModel
+from PyQt5.QtGui import QIcon, QClipboard, QKeySequence
 import os
+import re
 import humanize
 from datetime import datetime, timedelta
 from core.services.minio_service import MinioService
 from core.utils.config_manager import ConfigManager
-
-class FileUploadThread(QThread):
-    progress = pyqtSignal(str, int)  # 文件名, 进度
-    finished = pyqtSignal(bool, str)  # 成功/失败, 消息
-
-    def __init__(self, minio_service, file_path):
-        super().__init__()
-        self.minio_service = minio_service
-        self.file_path = file_path
-
-    def run(self):
-        try:
-            filename = os.path.basename(self.file_path)
-            self.progress.emit(filename, 50)
-            success = self.minio_service.upload_file(self.file_path)
-            self.progress.emit(filename, 100)
-            if success:
-                self.finished.emit(True, f"文件 {filename} 上传成功")
-            else:
-                self.finished.emit(False, f"文件 {filename} 上传失败")
-        except Exception as e:
-            self.finished.emit(False, f"上传错误: {str(e)}")
+from core.services.object_catalog import ObjectCatalog
+from core.services.name_index import SEARCH_MODES, compile_matcher
+from core.worker import Worker
+from core.services.async_minio_service import AsyncMinioService
+from core.services.asyncio_engine import AsyncioMinioEngine
+from core.services.connection_manager import ConnectionManager
+from core.services.thumbnail_service import ThumbnailService
+from core.services.transfer_scheduler import TransferScheduler, TransferJob
+from core.services.folder_sync import scan_local
+from ui.pages.bulk_select_dialog import BulkSelectDialog
+from ui.models.file_table_model import FileTableModel, FileFilterProxyModel
+from ui.models.thumbnail_model import ThumbnailProxyModel
+from ui.pages.image_preview_dialog import ImagePreviewDialog
+from ui.pages.text_preview_dialog import TextPreviewDialog
+from ui.pages.transfer_queue_dialog import TransferQueueDialog
+from ui.pages.sync_dialog import FolderSyncDialog
 
 class FileManagerPage(QWidget):
     def __init__(self, minio_service: MinioService):
         super().__init__()
         self.minio_service = minio_service
-        self.upload_threads = []
+        self.thread_pool = QThreadPool()
+        self.metadata_requested = set()  # 已请求过元数据的文件名
+        self.expanded_prefixes = set()  # 目录视图中已展开的文件夹
+        self.tree_generation = 0
+        # 所有页面共用同一份对象目录，列表视图直接以目录为数据源
+        self.catalog = ObjectCatalog.instance(minio_service)
+        # 下载、重命名等网络操作都在后台执行，界面线程不等待
+        self.async_service = AsyncMinioService.instance(minio_service)
+        # 启用时大量小对象请求（stat）在一个事件循环中并发，不为每个请求占用线程
+        self.asyncio_engine = AsyncioMinioEngine.instance(minio_service)
+        self.connection = ConnectionManager.instance(minio_service)
+        self.thumbnails = ThumbnailService.instance(minio_service)
+        # 上传排队执行，同时传输的文件数固定
+        self.transfers = TransferScheduler.instance(minio_service)
+        self.transfer_dialog = None
         self.setup_ui()
-        self.refresh_files()
+        QShortcut(QKeySequence.Delete, self, self.delete_selected)
+
+        # 目录连续变更时合并为一次状态栏更新
+        self.status_timer = QTimer(self)
+        self.status_timer.setSingleShot(True)
+        self.status_timer.setInterval(200)
+        self.status_timer.timeout.connect(self.update_status_bar)
+
+        self.catalog.files_reset.connect(self.show_catalog_files)
+        self.catalog.files_changed.connect(self.apply_delta)
+        self.catalog.files_reset.connect(self.status_timer.start)
+        self.catalog.files_changed.connect(lambda _: self.status_timer.start())
+        self.catalog.error.connect(self.show_catalog_error)
+        self.async_service.operations_changed.connect(self.update_busy_indicator)
+        self.update_busy_indicator(self.async_service.operation_names())
+        self.transfers.progress_changed.connect(self.update_transfer_progress)
+        self.transfers.job_changed.connect(self.handle_transfer_changed)
+        self.transfers.batch_finished.connect(self.report_transfers)
+        self.update_transfer_progress(self.transfers.progress())
+        self.connection.state_changed.connect(self.update_connection_status)
+        self.connection.error.connect(lambda _: self.update_connection_status(self.connection.state))
+        self.update_connection_status(self.connection.state)
+        self.update_status_bar()
+        self.catalog.refresh()
 
     def setup_ui(self):
         layout = QVBoxLayout(self)
@@ -50,8 +83,12 @@ class FileManagerPage(QWidget):
         # 顶部工具栏
         self.create_toolbar(layout)
         
-        # 文件表格
-        self.create_file_table(layout)
+        # 文件表格和目录树
+        self.view_stack = QStackedWidget()
+        self.create_file_table(self.view_stack)
+        self.create_folder_tree(self.view_stack)
+        self.create_thumbnail_grid(self.view_stack)
+        layout.addWidget(self.view_stack)
         
         # 底部状态栏
         self.create_status_bar(layout)
@@ -83,6 +120,19 @@ class FileManagerPage(QWidget):
             }
         """)
         self.search_input.textChanged.connect(self.filter_files)
+
+        # 搜索方式，顺序与SEARCH_MODES一致
+        self.search_mode_combo = QComboBox()
+        self.search_mode_combo.addItems(["包含", "前缀", "通配符", "正则"])
+        self.search_mode_combo.setStyleSheet("""
+            QComboBox {
+                padding: 8px;
+                border: 1px solid #ddd;
+                border-radius: 4px;
+                background-color: white;
+            }
+        """)
+        self.search_mode_combo.currentIndexChanged.connect(lambda _: self.filter_files())
         
         # 过滤器
         self.filter_combo = QComboBox()
@@ -98,8 +148,21 @@ class FileManagerPage(QWidget):
         """)
         self.filter_combo.currentTextChanged.connect(self.filter_files)
 
-        # 上传按钮
-        self.upload_btn = QPushButton("上传文件")
+        # 视图切换：列表视图显示整个存储桶，目录视图按文件夹逐层展开
+        self.view_combo = QComboBox()
+        self.view_combo.addItems(["列表视图", "目录视图", "网格视图"])
+        self.view_combo.setStyleSheet("""
+            QComboBox {
+                padding: 8px;
+                border: 1px solid #ddd;
+                border-radius: 4px;
+                background-color: white;
+            }
+        """)
+        self.view_combo.currentIndexChanged.connect(self.switch_view)
+
+        # 上传按钮：上传文件、上传文件夹或同步文件夹
+        self.upload_btn = QPushButton("上传")
         self.upload_btn.setStyleSheet("""
             QPushButton {
                 padding: 8px 15px;
@@ -112,7 +175,11 @@ class FileManagerPage(QWidget):
                 background-color: #0056b3;
             }
         """)
-        self.upload_btn.clicked.connect(self.upload_files)
+        upload_menu = QMenu(self.upload_btn)
+        upload_menu.addAction("上传文件", self.upload_files)
+        upload_menu.addAction("上传文件夹", self.upload_folder)
+        upload_menu.addAction("同步文件夹...", self.sync_folder)
+        self.upload_btn.setMenu(upload_menu)
 
         # 新建文件夹按钮
         self.new_folder_btn = QPushButton("新建文件夹")
@@ -130,6 +197,22 @@ class FileManagerPage(QWidget):
         """)
         self.new_folder_btn.clicked.connect(self.create_folder)
 
+        # 批量选择按钮
+        self.bulk_select_btn = QPushButton("批量选择")
+        self.bulk_select_btn.setStyleSheet("""
+            QPushButton {
+                padding: 8px 15px;
+                background-color: #17a2b8;
+                color: white;
+                border: none;
+                border-radius: 4px;
+            }
+            QPushButton:hover {
+                background-color: #138496;
+            }
+        """)
+        self.bulk_select_btn.clicked.connect(self.bulk_select)
+
         # 刷新按钮
         self.refresh_btn = QPushButton("刷新")
         self.refresh_btn.setStyleSheet("""
@@ -147,30 +230,38 @@ class FileManagerPage(QWidget):
         self.refresh_btn.clicked.connect(self.refresh_files)
 
         toolbar_layout.addWidget(self.search_input, 2)
+        toolbar_layout.addWidget(self.search_mode_combo)
         toolbar_layout.addWidget(self.filter_combo, 1)
+        toolbar_layout.addWidget(self.view_combo)
         toolbar_layout.addWidget(self.upload_btn)
         toolbar_layout.addWidget(self.new_folder_btn)
+        toolbar_layout.addWidget(self.bulk_select_btn)
         toolbar_layout.addWidget(self.refresh_btn)
         
         parent_layout.addWidget(toolbar)
 
     def create_file_table(self, parent_layout):
-        self.file_table = QTableWidget()
-        self.file_table.setColumnCount(4)
-        self.file_table.setHorizontalHeaderLabels(["名称", "大小", "修改日期", "类型"])
+        # 表格只为可见行格式化数据；过滤和排序由代理模型在目录的列上一次算出
+        self.file_model = FileTableModel(self.catalog, self.get_file_type, self)
+        self.file_proxy = FileFilterProxyModel(self.catalog, self.get_file_type, self)
+        self.file_proxy.setSourceModel(self.file_model)
+        self.file_table = QTableView()
+        self.file_table.setModel(self.file_proxy)
+        self.file_table.verticalHeader().setVisible(False)
+        self.file_table.verticalHeader().setDefaultSectionSize(32)
         
         # 设置表格样式
         self.file_table.setStyleSheet("""
-            QTableWidget {
+            QTableView {
                 border: 1px solid #ddd;
                 border-radius: 5px;
                 background-color: white;
                 gridline-color: #f0f0f0;
             }
-            QTableWidget::item {
+            QTableView::item {
                 padding: 8px;
             }
-            QTableWidget::item:selected {
+            QTableView::item:selected {
                 background-color: #e3f2fd;
                 color: black;
             }
@@ -192,13 +283,122 @@ class FileManagerPage(QWidget):
         self.file_table.setColumnWidth(1, 100)
         self.file_table.setColumnWidth(2, 150)
         self.file_table.setColumnWidth(3, 100)
+        self.file_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.file_table.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        self.file_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+
+        # 点击表头时按原始值排序（大小按字节、日期按时间戳），而不是按显示文本
+        header.setSortIndicator(-1, Qt.AscendingOrder)
+        self.file_table.setSortingEnabled(True)
 
         # 启用右键菜单
         self.file_table.setContextMenuPolicy(Qt.CustomContextMenu)
         self.file_table.customContextMenuRequested.connect(self.show_context_menu)
 
+        # 滚动停止后再为可见行获取元数据
+        self.metadata_timer = QTimer(self)
+        self.metadata_timer.setSingleShot(True)
+        self.metadata_timer.setInterval(200)
+        self.metadata_timer.timeout.connect(self.load_visible_metadata)
+        self.file_table.verticalScrollBar().valueChanged.connect(lambda _: self.metadata_timer.start())
+
         parent_layout.addWidget(self.file_table)
 
+    def create_folder_tree(self, parent_layout):
+        self.folder_tree = QTreeWidget()
+        self.folder_tree.setHeaderLabels(["名称", "大小", "修改日期", "类型"])
+        self.folder_tree.setStyleSheet("""
+            QTreeWidget {
+                border: 1px solid #ddd;
+                border-radius: 5px;
+                background-color: white;
+            }
+            QTreeWidget::item {
+                padding: 4px;
+            }
+            QTreeWidget::item:selected {
+                background-color: #e3f2fd;
+                color: black;
+            }
+            QHeaderView::section {
+                background-color: #f8f9fa;
+                padding: 8px;
+                border: none;
+                border-bottom: 1px solid #ddd;
+            }
+        """)
+        header = self.folder_tree.header()
+        header.setSectionResizeMode(0, QHeaderView.Stretch)
+        header.setStretchLastSection(False)
+        self.folder_tree.setColumnWidth(1, 100)
+        self.folder_tree.setColumnWidth(2, 150)
+        self.folder_tree.setColumnWidth(3, 100)
+
+        # 文件夹只在展开时才列举
+        self.folder_tree.itemExpanded.connect(self.expand_folder)
+        self.folder_tree.itemCollapsed.connect(
+            lambda item: self.expanded_prefixes.discard(item.data(0, Qt.UserRole)))
+        self.folder_tree.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        self.folder_tree.setContextMenuPolicy(Qt.CustomContextMenu)
+        self.folder_tree.customContextMenuRequested.connect(self.show_tree_context_menu)
+
+        parent_layout.addWidget(self.folder_tree)
+
+    def create_thumbnail_grid(self, parent_layout):
+        """图片网格：与列表视图共用过滤和排序结果，只为可见的图片生成缩略图"""
+        self.thumbnail_model = ThumbnailProxyModel(
+            self.catalog, self.thumbnails, lambda ext: self.get_file_type(ext) == "图片", self)
+        self.thumbnail_model.setSourceModel(self.file_proxy)
+        size = self.thumbnails.size
+        self.thumbnail_grid = QListView()
+        self.thumbnail_grid.setViewMode(QListView.IconMode)
+        self.thumbnail_grid.setModel(self.thumbnail_model)
+        self.thumbnail_grid.setIconSize(QSize(size, size))
+        self.thumbnail_grid.setGridSize(QSize(size + 24, size + 40))
+        self.thumbnail_grid.setUniformItemSizes(True)
+        self.thumbnail_grid.setMovement(QListView.Static)
+        self.thumbnail_grid.setResizeMode(QListView.Adjust)
+        self.thumbnail_grid.setLayoutMode(QListView.Batched)
+        self.thumbnail_grid.setBatchSize(500)
+        self.thumbnail_grid.setWordWrap(True)
+        self.thumbnail_grid.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.thumbnail_grid.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        self.thumbnail_grid.setStyleSheet("""
+            QListView {
+                border: 1px solid #ddd;
+                border-radius: 5px;
+                background-color: white;
+            }
+        """)
+        self.thumbnail_grid.doubleClicked.connect(
+            lambda index: self.preview_file(self.thumbnail_model.names([index.row()])[0]))
+        self.thumbnail_grid.setContextMenuPolicy(Qt.CustomContextMenu)
+        self.thumbnail_grid.customContextMenuRequested.connect(self.show_grid_context_menu)
+
+        # 滚动停止后取消已滚出可见区域的缩略图请求
+        self.thumbnail_timer = QTimer(self)
+        self.thumbnail_timer.setSingleShot(True)
+        self.thumbnail_timer.setInterval(150)
+        self.thumbnail_timer.timeout.connect(self.retain_visible_thumbnails)
+        self.thumbnail_grid.verticalScrollBar().valueChanged.connect(self.grid_scrolled)
+
+        parent_layout.addWidget(self.thumbnail_grid)
+
+    def show_grid_context_menu(self, position):
+        index = self.thumbnail_grid.indexAt(position)
+        if index.isValid():
+            filename = self.thumbnail_model.names([index.row()])[0]
+            self.exec_file_menu(filename, self.thumbnail_grid.viewport().mapToGlobal(position))
+
+    def grid_scrolled(self):
+        # 滚动后重新绘制的就是可见的图片
+        self.thumbnail_model.clear_painted()
+        self.thumbnail_timer.start()
+
+    def retain_visible_thumbnails(self):
+        """只保留当前可见的图片的缩略图请求"""
+        self.thumbnails.retain(self.thumbnail_model.painted)
+
     def create_status_bar(self, parent_layout):
         status_bar = QFrame()
         status_bar.setStyleSheet("""
@@ -225,55 +425,306 @@ class FileManagerPage(QWidget):
             }
         """)
         
+        # 后台操作进行中时显示忙碌状态，可以取消
+        self.busy_label = QLabel()
+        self.busy_progress = QProgressBar()
+        self.busy_progress.setRange(0, 0)
+        self.busy_progress.setMaximumWidth(100)
+        self.busy_progress.setTextVisible(False)
+        self.cancel_btn = QPushButton("取消")
+        self.cancel_btn.clicked.connect(lambda: self.async_service.cancel_all())
+
+        # 传输进度、速度和剩余时间
+        self.transfer_label = QLabel()
+        self.transfer_progress = QProgressBar()
+        self.transfer_progress.setRange(0, 1000)
+        self.transfer_progress.setMaximumWidth(150)
+        self.transfer_progress.setTextVisible(False)
+        self.transfer_pause_btn = QPushButton("全部暂停")
+        self.transfer_pause_btn.clicked.connect(self.toggle_transfers_paused)
+        self.transfer_queue_btn = QPushButton("传输队列")
+        self.transfer_queue_btn.clicked.connect(self.show_transfer_queue)
+        self.transfer_cancel_btn = QPushButton("全部取消")
+        self.transfer_cancel_btn.clicked.connect(lambda: self.transfers.cancel_all())
+
+        # 连接建立前或离线时提示正在显示缓存的列表
+        self.connection_label = QLabel()
+        self.connection_label.setStyleSheet("color: #dc3545;")
+        self.reconnect_btn = QPushButton("重新连接")
+        self.reconnect_btn.clicked.connect(lambda: self.connection.reconnect_now())
+
         # 文件统计
         self.stats_label = QLabel("总文件数：0")
         
         status_layout.addWidget(storage_label)
         status_layout.addWidget(self.storage_progress)
         status_layout.addStretch()
+        status_layout.addWidget(self.transfer_label)
+        status_layout.addWidget(self.transfer_progress)
+        status_layout.addWidget(self.transfer_pause_btn)
+        status_layout.addWidget(self.transfer_queue_btn)
+        status_layout.addWidget(self.transfer_cancel_btn)
+        status_layout.addWidget(self.connection_label)
+        status_layout.addWidget(self.reconnect_btn)
+        status_layout.addWidget(self.busy_label)
+        status_layout.addWidget(self.busy_progress)
+        status_layout.addWidget(self.cancel_btn)
         status_layout.addWidget(self.stats_label)
         
         parent_layout.addWidget(status_bar)
 
     def refresh_files(self):
-        """刷新文件列表"""
-        try:
-            # 获取文件列表
-            files = self.minio_service.list_files()
-            
-            # 清空表格
-            self.file_table.setRowCount(0)
-            
-            # 添加文件到表格
-            for file in files:
-                row = self.file_table.rowCount()
-                self.file_table.insertRow(row)
-                
-                # 文件名
-                name_item = QTableWidgetItem(file["name"])
-                self.file_table.setItem(row, 0, name_item)
-                
-                # 文件大小
-                size = humanize.naturalsize(file["size"])
-                size_item = QTableWidgetItem(size)
-                size_item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
-                self.file_table.setItem(row, 1, size_item)
-                
-                # 修改日期
-                date = datetime.strftime(file["last_modified"], "%Y-%m-%d %H:%M")
-                date_item = QTableWidgetItem(date)
-                self.file_table.setItem(row, 2, date_item)
-                
-                # 文件类型
-                ext = os.path.splitext(file["name"])[1].lower()
-                type_item = QTableWidgetItem(self.get_file_type(ext))
-                self.file_table.setItem(row, 3, type_item)
-            
-            # 更新状态栏
-            self.update_status_bar()
-            
-        except Exception as e:
-            QMessageBox.critical(self, "错误", f"刷新文件列表失败: {str(e)}")
+        """刷新文件列表（由共享目录在后台与服务器对账）"""
+        if self.is_tree_view():
+            self.refresh_tree()
+            self.catalog.invalidate()  # 切回列表视图时再对账
+            return
+        self.catalog.refresh(force=True)
+
+    def refresh_after_change(self, put=(), removed=()):
+        """文件被修改后直接修补共享目录，不再重新列举整个存储桶
+
+        put为(对象名, 大小)列表；其他客户端的修改由存储桶事件通知同步。
+        """
+        for name, size in put:
+            self.catalog.note_put(name, size)
+        self.catalog.note_removed(list(removed))
+        if self.is_tree_view():
+            self.refresh_tree()
+
+    # 后台操作的名称，用于忙碌状态的显示
+    OPERATION_NAMES = {
+        "list_folder": "列出文件夹",
+        "download_file": "下载",
+        "read_range": "读取预览",
+        "rename_file": "重命名",
+        "rename_prefix": "重命名文件夹",
+        "delete_file": "删除",
+        "delete_files": "删除",
+        "delete_prefix": "删除文件夹",
+        "create_folder": "新建文件夹",
+        "get_presigned_url": "生成分享链接",
+    }
+
+    def update_busy_indicator(self, operations):
+        """显示进行中的后台操作"""
+        busy = bool(operations)
+        self.busy_label.setVisible(busy)
+        self.busy_progress.setVisible(busy)
+        self.cancel_btn.setVisible(busy)
+        if busy:
+            names = "、".join(sorted({self.OPERATION_NAMES.get(name, name) for name in operations}))
+            self.busy_label.setText(f"正在{names}（{len(operations)}）...")
+
+    def update_connection_status(self, state: str):
+        """显示连接状态，已连接时隐藏"""
+        self.connection_label.setVisible(state != ConnectionManager.CONNECTED)
+        self.reconnect_btn.setVisible(state == ConnectionManager.OFFLINE)
+        if state == ConnectionManager.CONNECTING:
+            self.connection_label.setText("正在连接服务器，显示缓存的列表")
+        elif state == ConnectionManager.OFFLINE:
+            retry = self.connection.seconds_until_retry()
+            self.connection_label.setText(f"离线，显示缓存的列表（{retry}秒后重连）")
+            self.connection_label.setToolTip(self.connection.last_error)
+
+    def show_catalog_error(self, message):
+        if self.isVisible():
+            QMessageBox.critical(self, "错误", f"刷新文件列表失败: {message}")
+
+    def show_catalog_files(self):
+        """目录整体重建后（模型已自动重置）重新获取可见行的元数据"""
+        self.metadata_requested.clear()
+        self.metadata_timer.start()
+
+    def apply_delta(self, delta):
+        """目录变更已由模型通知表格，这里只让变化的文件重新获取元数据"""
+        for file in delta["updated"]:
+            self.metadata_requested.discard(file["name"])
+        if delta["added"]:
+            self.metadata_timer.start()
+
+    def bulk_select(self):
+        """按条件批量选中表格中的文件"""
+        dialog = BulkSelectDialog(self.catalog, self)
+        if dialog.exec_() != BulkSelectDialog.Accepted:
+            return
+        if self.view_stack.currentWidget() is not self.file_table:
+            self.view_combo.setCurrentIndex(0)
+        # 清除搜索和类型过滤，使选中的行都可见
+        self.search_input.clear()
+        self.filter_combo.setCurrentIndex(0)
+        table = self.catalog.table
+        rows = sorted(row for row in (self.file_proxy.proxy_row(table.find(name))
+                                      for name in dialog.selected_files() if name in table)
+                      if row >= 0)
+
+        # 相邻的行合并成一个区间，一次性设置选择
+        selection = QItemSelection()
+        model = self.file_proxy
+        last_column = model.columnCount() - 1
+        start = previous = None
+        for row in rows:
+            if start is not None and row != previous + 1:
+                selection.select(model.index(start, 0), model.index(previous, last_column))
+                start = None
+            if start is None:
+                start = row
+            previous = row
+        if start is not None:
+            selection.select(model.index(start, 0), model.index(previous, last_column))
+        self.file_table.selectionModel().select(selection, QItemSelectionModel.ClearAndSelect)
+        if rows:
+            self.file_table.scrollTo(model.index(rows[0], 0))
+
+    def is_tree_view(self) -> bool:
+        return self.view_stack.currentWidget() is self.folder_tree
+
+    def switch_view(self, index: int):
+        """切换列表视图、目录视图和网格视图"""
+        self.view_stack.setCurrentIndex(index)
+        if not self.is_tree_view():
+            self.catalog.refresh()
+        elif self.folder_tree.topLevelItemCount() == 0:
+            self.refresh_tree()
+
+    def refresh_tree(self):
+        """重新列举根目录，之前展开的文件夹会在重新出现时再次展开"""
+        self.minio_service.invalidate_folder_cache()
+        self.tree_generation += 1  # 使尚未返回的旧列举结果失效
+        self.folder_tree.clear()
+        self.load_folder(None, "")
+
+    def load_folder(self, parent_item, prefix: str):
+        """在后台列出一层目录"""
+        generation = self.tree_generation
+        operation = self.async_service.list_folder(prefix)
+        operation.succeeded.connect(
+            lambda result: self.populate_folder(parent_item, result, generation))
+        operation.failed.connect(
+            lambda msg: QMessageBox.critical(self, "错误", f"列出文件夹失败: {msg}"))
+
+    def populate_folder(self, parent_item, result, generation):
+        """将一层目录的列举结果添加到目录树"""
+        if generation != self.tree_generation:
+            return
+        folders, files = result
+        if parent_item is not None:
+            parent_item.takeChildren()  # 移除"加载中"占位项
+        items = []
+        for prefix in folders:
+            item = QTreeWidgetItem([
+                prefix.rstrip("/").rpartition("/")[2] + "/",
+                humanize.naturalsize(self.catalog.usage(prefix)),
+                "",
+                "文件夹"
+            ])
+            item.setTextAlignment(1, Qt.AlignRight | Qt.AlignVCenter)
+            item.setData(0, Qt.UserRole, prefix)
+            item.setChildIndicatorPolicy(QTreeWidgetItem.ShowIndicator)
+            items.append(item)
+        for file in files:
+            ext = os.path.splitext(file["name"])[1].lower()
+            item = QTreeWidgetItem([
+                file["name"].rpartition("/")[2],
+                humanize.naturalsize(file["size"]),
+                datetime.strftime(file["last_modified"], "%Y-%m-%d %H:%M"),
+                self.get_file_type(ext)
+            ])
+            item.setData(0, Qt.UserRole, file["name"])
+            item.setTextAlignment(1, Qt.AlignRight | Qt.AlignVCenter)
+            items.append(item)
+
+        if parent_item is None:
+            self.folder_tree.addTopLevelItems(items)
+        else:
+            parent_item.addChildren(items)
+        self.filter_tree_items(items)
+
+        for item in items[:len(folders)]:
+            if item.data(0, Qt.UserRole) in self.expanded_prefixes:
+                item.setExpanded(True)
+
+    def expand_folder(self, item):
+        """展开文件夹时才列举其内容"""
+        prefix = item.data(0, Qt.UserRole)
+        self.expanded_prefixes.add(prefix)
+        if item.childCount() == 0:
+            item.addChild(QTreeWidgetItem(["加载中..."]))
+            self.load_folder(item, prefix)
+
+    def filter_tree_items(self, items):
+        """对目录树中已加载的文件应用搜索和类型过滤（文件夹始终显示）"""
+        self.apply_tree_filter(items, self.name_matcher(), self.filter_combo.currentText())
+
+    def apply_tree_filter(self, items, match_name, file_type):
+        for item in items:
+            if item.childIndicatorPolicy() == QTreeWidgetItem.ShowIndicator:
+                self.apply_tree_filter([item.child(i) for i in range(item.childCount())],
+                                       match_name, file_type)
+                continue
+            name = item.data(0, Qt.UserRole)
+            if name is None:
+                continue
+            match_search = match_name is None or match_name(name)
+            match_type = file_type == "所有文件" or file_type == item.text(3)
+            hidden = not (match_search and match_type)
+            if item.isHidden() != hidden:
+                item.setHidden(hidden)
+
+    def show_tree_context_menu(self, position):
+        """目录视图中文件和文件夹的右键菜单"""
+        item = self.folder_tree.itemAt(position)
+        if item is None:
+            return
+        name = item.data(0, Qt.UserRole)
+        if not name:
+            return
+        if item.childIndicatorPolicy() == QTreeWidgetItem.ShowIndicator:
+            menu = QMenu()
+            rename = menu.addAction("重命名文件夹")
+            delete = menu.addAction("删除文件夹")
+            action = menu.exec_(self.folder_tree.viewport().mapToGlobal(position))
+            if action == rename:
+                self.rename_folder(name)
+            elif action == delete:
+                self.delete_folder(name)
+            return
+        self.exec_file_menu(name, self.folder_tree.viewport().mapToGlobal(position))
+
+    def load_visible_metadata(self):
+        """在后台获取当前可见行的内容类型和元数据"""
+        first = self.file_table.rowAt(0)
+        if first < 0:
+            return
+        last = self.file_table.rowAt(self.file_table.viewport().height() - 1)
+        if last < 0:
+            last = self.file_proxy.rowCount() - 1
+
+        rows = [int(row) for row in self.file_proxy.source_rows(range(first, last + 1))]
+        names = [name for name in map(self.file_model.name, rows) if name not in self.metadata_requested]
+        if not names:
+            return
+
+        self.metadata_requested.update(names)
+        if self.asyncio_engine is not None:
+            operation = self.asyncio_engine.runner.run("获取元数据", self.asyncio_engine.stat_files(names), timeout=60)
+            operation.succeeded.connect(self.apply_metadata)
+            return
+        worker = Worker(self.minio_service.stat_files, names)
+        worker.signals.result.connect(self.apply_metadata)
+        self.thread_pool.start(worker)
+
+    def apply_metadata(self, stats):
+        """将获取到的元数据显示为文件名的提示信息"""
+        for name, info in stats.items():
+            row = self.catalog.table.find(name)
+            if row is None or info is None:
+                continue
+            tooltip = f"内容类型: {info['content_type']}"
+            if info["metadata"]:
+                meta = "\n".join(f"{k}: {v}" for k, v in info["metadata"].items())
+                tooltip += f"\n{meta}"
+            self.file_model.set_tooltip(row, tooltip)
 
     def get_file_type(self, ext: str) -> str:
         """根据扩展名获取文件类型"""
@@ -291,35 +742,52 @@ class FileManagerPage(QWidget):
             return "其他"
 
     def filter_files(self):
-        """根据搜索文本和类型过滤文件"""
-        search_text = self.search_input.text().lower()
+        """根据搜索文本和类型过滤文件
+
+        列表视图的过滤结果由代理模型通过共享目录的索引一次算出。
+        """
         file_type = self.filter_combo.currentText()
-        
-        for row in range(self.file_table.rowCount()):
-            filename = self.file_table.item(row, 0).text().lower()
-            type_item = self.file_table.item(row, 3).text()
-            
-            # 检查是否匹配搜索文本和文件类型
-            match_search = search_text in filename
-            match_type = file_type == "所有文件" or file_type == type_item
-            
-            # 显示或隐藏行
-            self.file_table.setRowHidden(row, not (match_search and match_type))
+        self.file_proxy.set_filter(self.search_input.text(), self.search_mode(),
+                                   None if file_type == "所有文件" else file_type)
+        self.status_timer.start()
+        self.metadata_timer.start()
+
+        self.folder_tree.setUpdatesEnabled(False)
+        try:
+            self.filter_tree_items([self.folder_tree.topLevelItem(i)
+                                    for i in range(self.folder_tree.topLevelItemCount())])
+        finally:
+            self.folder_tree.setUpdatesEnabled(True)
+
+    def search_mode(self) -> str:
+        return SEARCH_MODES[self.search_mode_combo.currentIndex()]
+
+    def name_matcher(self):
+        """当前搜索条件对应的单个文件名匹配函数，搜索为空时返回None"""
+        try:
+            return compile_matcher(self.search_input.text(), self.search_mode())
+        except re.error:
+            return lambda name: False
 
     def update_status_bar(self):
         """更新状态栏信息"""
         try:
-            # 获取存储桶大小
-            total_size = self.minio_service.get_bucket_size()
-            used_percent = min(total_size / (1024 * 1024 * 1024) * 100, 100)  # 假设有1GB限制
-            
-            self.storage_progress.setValue(int(used_percent))
-            self.storage_progress.setFormat(f"{humanize.naturalsize(total_size)} / 1 GB")
+            # 存储桶大小由共享目录增量维护，无需重新列举
+            total_size = self.catalog.usage()
+            quota_gb = self.minio_service.config_manager.get_storage_config().get("quota_gb", 0)
+            if quota_gb > 0:
+                quota = quota_gb * 1024 * 1024 * 1024
+                used_percent = min(total_size / quota * 100, 100)
+                self.storage_progress.setValue(int(used_percent))
+                self.storage_progress.setFormat(
+                    f"{humanize.naturalsize(total_size)} / {humanize.naturalsize(quota, binary=True)}")
+            else:
+                self.storage_progress.setValue(0)
+                self.storage_progress.setFormat(f"{humanize.naturalsize(total_size)} / 无限制")
             
             # 更新文件统计
-            visible_count = sum(1 for row in range(self.file_table.rowCount())
-                              if not self.file_table.isRowHidden(row))
-            total_count = self.file_table.rowCount()
+            visible_count = self.file_proxy.rowCount()
+            total_count = len(self.catalog)
             
             self.stats_label.setText(f"显示: {visible_count} / 总数: {total_count}")
             
@@ -339,23 +807,95 @@ class FileManagerPage(QWidget):
             return
             
         for file_path in files:
-            # 创建上传线程
-            thread = FileUploadThread(self.minio_service, file_path)
-            thread.progress.connect(self.update_upload_progress)
-            thread.finished.connect(self.handle_upload_finished)
-            
-            self.upload_threads.append(thread)
-            thread.start()
+            self.transfers.upload(file_path)
 
-    def update_upload_progress(self, filename: str, progress: int):
-        """更新上传进度"""
-        # TODO: 添加进度显示UI
+    def upload_folder(self):
+        """上传整个文件夹，保留目录结构：对象名为 文件夹名/相对路径"""
+        folder = QFileDialog.getExistingDirectory(self, "选择要上传的文件夹")
+        if not folder:
+            return
+        # 大的目录树扫描较慢，在后台进行
+        worker = Worker(scan_local, folder)
+        worker.signals.result.connect(lambda files: self.upload_scanned(folder, files))
+        worker.signals.error.connect(lambda message: QMessageBox.warning(self, "错误", f"读取文件夹失败: {message}"))
+        self.thread_pool.start(worker)
 
-    def handle_upload_finished(self, success: bool, message: str):
-        """处理上传完成事件"""
-        if success:
-            self.refresh_files()
-        QMessageBox.information(self, "上传完成", message)
+    def upload_scanned(self, folder, files):
+        """将扫描到的文件加入上传队列"""
+        if not files:
+            QMessageBox.information(self, "提示", "文件夹中没有文件")
+            return
+        prefix = os.path.basename(os.path.normpath(folder)) + "/"
+        for relative in sorted(files):
+            self.transfers.upload(os.path.join(folder, *relative.split("/")), prefix + relative)
+
+    def sync_folder(self):
+        """比较本地文件夹和存储桶，预览差异后只传输新增或修改的文件"""
+        if not self.connection.is_connected():
+            QMessageBox.warning(self, "警告", "未连接到MinIO服务器，无法同步")
+            return
+        folder = QFileDialog.getExistingDirectory(self, "选择要同步的文件夹")
+        if not folder:
+            return
+        bucket = self.minio_service.config_manager.get_minio_config()["bucket"]
+        FolderSyncDialog(self.minio_service, self.transfers, folder, bucket, self).exec_()
+
+    def update_transfer_progress(self, progress):
+        """在状态栏显示这批传输的总进度、速度和剩余时间"""
+        active = progress["files"] > 0
+        for widget in (self.transfer_label, self.transfer_progress, self.transfer_pause_btn,
+                       self.transfer_queue_btn, self.transfer_cancel_btn):
+            widget.setVisible(active)
+        if not active:
+            return
+        total = progress["total"]
+        self.transfer_progress.setValue(int(progress["sent"] * 1000 / total) if total else 0)
+        paused = self.transfers.has_paused()
+        self.transfer_pause_btn.setText("全部继续" if paused else "全部暂停")
+        text = (f"剩余 {progress['files']} 个文件："
+                f"{humanize.naturalsize(progress['sent'], binary=True)} / "
+                f"{humanize.naturalsize(total, binary=True)}，"
+                f"{progress['speed'] / (1024 * 1024):.1f} MB/s")
+        if progress["eta"] is not None:
+            minutes, seconds = divmod(int(progress["eta"]), 60)
+            text += f"，剩余 {minutes:02d}:{seconds:02d}"
+        if paused:
+            text += "（有暂停的任务）"
+        self.transfer_label.setText(text)
+
+    def toggle_transfers_paused(self):
+        if self.transfers.has_paused():
+            self.transfers.resume_all()
+        else:
+            self.transfers.pause_all()
+        self.update_transfer_progress(self.transfers.progress())
+
+    def show_transfer_queue(self):
+        if self.transfer_dialog is None:
+            self.transfer_dialog = TransferQueueDialog(self.transfers, self)
+        self.transfer_dialog.show()
+        self.transfer_dialog.raise_()
+
+    def handle_transfer_changed(self, job):
+        """上传完成的文件直接加入目录，不必重新列出整个存储桶"""
+        if job.kind == "upload" and job.state == TransferJob.DONE:
+            self.catalog.note_put(job.name, job.size, job.result)
+
+    def report_transfers(self, summary):
+        """一批传输全部结束后显示一次汇总"""
+        if self.is_tree_view():
+            self.refresh_tree()
+        done, failed, cancelled = (summary[state] for state in
+                                   (TransferJob.DONE, TransferJob.FAILED, TransferJob.CANCELLED))
+        if not failed and not cancelled:
+            QMessageBox.information(self, "传输完成", f"{len(done)} 个文件全部传输成功")
+            return
+        lines = [f"成功 {len(done)} 个，失败 {len(failed)} 个，取消 {len(cancelled)} 个"]
+        # 失败的文件很多时只列出前面一部分，避免消息框超出屏幕
+        lines += [f"{job.name}: {job.error}" for job in failed[:20]]
+        if len(failed) > 20:
+            lines.append(f"……另有 {len(failed) - 20} 个文件失败")
+        QMessageBox.warning(self, "传输完成", "\n".join(lines))
 
     def create_folder(self):
         """创建新文件夹"""
@@ -366,17 +906,30 @@ class FileManagerPage(QWidget):
         )
         
         if ok and folder_name:
-            try:
-                if self.minio_service.create_folder(folder_name):
-                    self.refresh_files()
-                    QMessageBox.information(self, "成功", "文件夹创建成功")
-                else:
-                    QMessageBox.warning(self, "警告", "文件夹创建失败")
-            except Exception as e:
-                QMessageBox.critical(self, "错误", f"创建文件夹失败: {str(e)}")
+            operation = self.async_service.create_folder(folder_name)
+            operation.succeeded.connect(
+                lambda success: self.handle_folder_created(success, folder_name))
+            operation.failed.connect(
+                lambda msg: QMessageBox.critical(self, "错误", f"创建文件夹失败: {msg}"))
+
+    def handle_folder_created(self, success: bool, folder_name: str):
+        if success:
+            self.refresh_after_change(put=[(folder_name.rstrip("/") + "/", 0)])
+            QMessageBox.information(self, "成功", "文件夹创建成功")
+        else:
+            QMessageBox.warning(self, "警告", "文件夹创建失败")
 
     def show_context_menu(self, position):
         """显示右键菜单"""
+        index = self.file_table.indexAt(position)
+        if not index.isValid():
+            return
+
+        filename = self.file_model.name(self.file_proxy.mapToSource(index).row())
+        self.exec_file_menu(filename, self.file_table.viewport().mapToGlobal(position))
+
+    def exec_file_menu(self, filename: str, global_pos):
+        """显示文件操作菜单并执行所选操作"""
         menu = QMenu()
         menu.setStyleSheet("""
             QMenu {
@@ -392,24 +945,20 @@ class FileManagerPage(QWidget):
             }
         """)
         
-        # 获取选中的项
-        items = self.file_table.selectedItems()
-        if not items:
-            return
-            
-        row = items[0].row()
-        filename = self.file_table.item(row, 0).text()
-        
         # 添加菜单项
         download = menu.addAction("下载")
         preview = menu.addAction("预览")
         share = menu.addAction("生成分享链接")
         menu.addSeparator()
         rename = menu.addAction("重命名")
-        delete = menu.addAction("删除")
+        # 右键点在多选的文件上时删除所有选中的文件
+        selected, _ = self.selected_files()
+        if filename not in selected or len(selected) < 2:
+            selected = [filename]
+        delete = menu.addAction("删除" if len(selected) == 1 else f"删除选中的 {len(selected)} 个文件")
         
         # 显示菜单并处理选择
-        action = menu.exec_(self.file_table.mapToGlobal(position))
+        action = menu.exec_(global_pos)
         
         if action == download:
             self.download_file(filename)
@@ -420,7 +969,7 @@ class FileManagerPage(QWidget):
         elif action == rename:
             self.rename_file(filename)
         elif action == delete:
-            self.delete_file(filename)
+            self.delete_files(selected)
 
     def download_file(self, filename: str):
         """下载文件"""
@@ -432,18 +981,24 @@ class FileManagerPage(QWidget):
         )
         
         if save_path:
-            try:
-                if self.minio_service.download_file(filename, save_path):
-                    QMessageBox.information(self, "成功", "文件下载成功")
-                else:
-                    QMessageBox.warning(self, "警告", "文件下载失败")
-            except Exception as e:
-                QMessageBox.critical(self, "错误", f"下载文件失败: {str(e)}")
+            # 大文件分段并发下载，进度和结果与上传一起显示在状态栏和传输汇总中
+            row = self.catalog.table.find(filename)
+            size = self.catalog.table.size(row) if row is not None else 0
+            self.transfers.download(filename, save_path, size)
 
     def preview_file(self, filename: str):
-        """预览文件"""
-        # TODO: 实现文件预览功能
-        QMessageBox.information(self, "提示", "文件预览功能开发中")
+        """预览文件：图片显示缩略图，其他文件按页读取为文本或十六进制"""
+        row = self.catalog.table.find(filename)
+        if row is None:
+            return
+        table = self.catalog.table
+        if self.get_file_type(table.extension(row)) == "图片":
+            dialog = ImagePreviewDialog(self.thumbnails, filename, table.etag(row), self)
+        else:
+            config = self.minio_service.config_manager.get_preview_config()
+            dialog = TextPreviewDialog(self.async_service, filename, table.size(row),
+                                       config.get("page_kb", 64) * 1024, config.get("max_pages", 32), self)
+        dialog.exec_()
 
     def rename_file(self, filename: str):
         """重命名文件"""
@@ -455,54 +1010,148 @@ class FileManagerPage(QWidget):
         )
         
         if ok and new_name and new_name != filename:
-            try:
-                if self.minio_service.rename_file(filename, new_name):
-                    self.refresh_files()
-                    QMessageBox.information(self, "成功", "文件重命名成功")
+            operation = self.async_service.rename_file(filename, new_name)
+            operation.succeeded.connect(
+                lambda success: self.handle_rename_finished(success, filename, new_name))
+            operation.failed.connect(
+                lambda msg: QMessageBox.critical(self, "错误", f"重命名失败: {msg}"))
+
+    def handle_rename_finished(self, success: bool, filename: str, new_name: str):
+        if success:
+            old = self.catalog.get(filename)
+            self.refresh_after_change(put=[(new_name, old["size"] if old else 0)], removed=[filename])
+            QMessageBox.information(self, "成功", "文件重命名成功")
+        else:
+            QMessageBox.warning(self, "警告", "文件重命名失败")
+
+    def rename_folder(self, prefix: str):
+        """重命名文件夹：在服务器端并发复制其中的所有文件，再批量删除原文件"""
+        parent, _, name = prefix.rstrip("/").rpartition("/")
+        new_name, ok = QInputDialog.getText(self, "重命名文件夹", "请输入新的文件夹名称：", text=name)
+        new_name = new_name.strip().strip("/")
+        if not ok or not new_name or new_name == name:
+            return
+        new_prefix = (parent + "/" if parent else "") + new_name + "/"
+        if next(self.catalog.table.under(new_prefix), None) is not None:
+            QMessageBox.warning(self, "警告", f"文件夹 {new_prefix} 已存在")
+            return
+        operation = self.async_service.rename_prefix(prefix, new_prefix)
+        operation.succeeded.connect(lambda result: self.handle_folder_renamed(prefix, new_prefix, result))
+        operation.failed.connect(
+            lambda msg: QMessageBox.critical(self, "错误", f"重命名文件夹失败: {msg}"))
+
+    def handle_folder_renamed(self, prefix: str, new_prefix: str, result):
+        renamed, failed = result["renamed"], result["failed"]
+        if prefix in self.expanded_prefixes:
+            self.expanded_prefixes.add(new_prefix)
+        self.refresh_after_change(put=[(new, size) for _, new, size in renamed],
+                                  removed=[old for old, _, _ in renamed])
+        if not failed:
+            QMessageBox.information(self, "成功", f"文件夹已重命名，共 {len(renamed)} 个文件")
+            return
+        lines = [f"成功 {len(renamed)} 个，失败 {len(failed)} 个"]
+        lines += [f"{name}: {message}" for name, message in failed[:20]]
+        if len(failed) > 20:
+            lines.append(f"……另有 {len(failed) - 20} 个文件失败")
+        QMessageBox.warning(self, "重命名文件夹", "\n".join(lines))
+
+    def selected_files(self):
+        """当前视图中选中的(文件名列表, 文件夹前缀列表)；只有目录视图能选中文件夹"""
+        if self.is_tree_view():
+            files, prefixes = [], []
+            for item in self.folder_tree.selectedItems():
+                name = item.data(0, Qt.UserRole)
+                if not name:
+                    continue
+                if item.childIndicatorPolicy() == QTreeWidgetItem.ShowIndicator:
+                    prefixes.append(name)
                 else:
-                    QMessageBox.warning(self, "警告", "文件重命名失败")
-            except Exception as e:
-                QMessageBox.critical(self, "错误", f"重命名失败: {str(e)}")
+                    files.append(name)
+            return files, prefixes
+        if self.view_stack.currentWidget() is self.thumbnail_grid:
+            rows = [index.row() for index in self.thumbnail_grid.selectionModel().selectedIndexes()]
+            return self.thumbnail_model.names(sorted(rows)), []
+        # 按选择区间成批换算行号，选中整张表也不逐行查询
+        files = []
+        for selection_range in self.file_table.selectionModel().selection():
+            rows = self.file_proxy.source_rows(range(selection_range.top(), selection_range.bottom() + 1))
+            files.extend(self.file_model.name(int(row)) for row in rows)
+        return files, []
+
+    def delete_selected(self):
+        """删除选中的文件和文件夹（Delete键）"""
+        files, prefixes = self.selected_files()
+        if len(prefixes) == 1 and not files:
+            self.delete_folder(prefixes[0])
+        elif files and not prefixes:
+            self.delete_files(files)
+        elif prefixes:
+            QMessageBox.information(self, "提示", "请分别删除文件夹和文件，每次删除一个文件夹")
 
-    def delete_file(self, filename: str):
-        """删除文件"""
+    def delete_files(self, filenames):
+        """批量删除文件：每次请求最多删除1000个，全部结束后一次更新列表"""
+        filenames = list(dict.fromkeys(filenames))
+        if not filenames:
+            return
+        if len(filenames) == 1:
+            question = f"确定要删除 {filenames[0]} 吗？"
+        else:
+            preview = "\n".join(filenames[:10]) + ("\n……" if len(filenames) > 10 else "")
+            question = f"确定要删除这 {len(filenames)} 个文件吗？\n\n{preview}"
+        if QMessageBox.question(self, "确认删除", question, QMessageBox.Yes | QMessageBox.No) != QMessageBox.Yes:
+            return
+        operation = self.async_service.delete_files(filenames)
+        operation.succeeded.connect(lambda errors: self.handle_delete_finished(
+            [name for name in filenames if name not in errors], errors))
+        operation.failed.connect(
+            lambda msg: QMessageBox.critical(self, "错误", f"删除文件失败: {msg}"))
+
+    def delete_folder(self, prefix: str):
+        """删除文件夹及其中的所有文件"""
+        count = sum(1 for _ in self.catalog.table.under(prefix))
         reply = QMessageBox.question(
             self,
             "确认删除",
-            f"确定要删除 {filename} 吗？",
+            f"确定要删除文件夹 {prefix} 及其中的 {count} 个文件吗？",
             QMessageBox.Yes | QMessageBox.No
         )
-        
-        if reply == QMessageBox.Yes:
-            try:
-                if self.minio_service.delete_file(filename):
-                    self.refresh_files()
-                    QMessageBox.information(self, "成功", "文件删除成功")
-                else:
-                    QMessageBox.warning(self, "警告", "文件删除失败")
-            except Exception as e:
-                QMessageBox.critical(self, "错误", f"删除文件失败: {str(e)}")
+        if reply != QMessageBox.Yes:
+            return
+        operation = self.async_service.delete_prefix(prefix)
+        operation.succeeded.connect(
+            lambda result: self.handle_delete_finished(result["deleted"], result["errors"]))
+        operation.failed.connect(
+            lambda msg: QMessageBox.critical(self, "错误", f"删除文件夹失败: {msg}"))
+
+    def handle_delete_finished(self, deleted, errors):
+        """从目录中一次移除所有已删除的文件，并汇总显示删除失败的文件"""
+        self.refresh_after_change(removed=deleted)
+        if not errors:
+            QMessageBox.information(self, "成功", f"已删除 {len(deleted)} 个文件")
+            return
+        lines = [f"已删除 {len(deleted)} 个，失败 {len(errors)} 个"]
+        lines += [f"{name}: {message}" for name, message in list(errors.items())[:20]]
+        if len(errors) > 20:
+            lines.append(f"……另有 {len(errors) - 20} 个文件删除失败")
+        QMessageBox.warning(self, "删除完成", "\n".join(lines))
 
     def share_file(self, filename: str):
-        """生成文件分享链接"""
-        try:
-            # 生成24小时有效的预签名URL
-            url = self.minio_service.get_presigned_url(
-                filename,
-                expires=timedelta(hours=24)
-            )
+        """生成文件分享链接（24小时有效）"""
+        operation = self.async_service.get_presigned_url(filename, expires=timedelta(hours=24))
+        operation.succeeded.connect(self.handle_share_url)
+        operation.failed.connect(
+            lambda msg: QMessageBox.critical(self, "错误", f"生成分享链接失败: {msg}"))
+
+    def handle_share_url(self, url):
+        if url:
+            # 复制链接到剪贴板
+            clipboard = QApplication.clipboard()
+            clipboard.setText(url)
             
-            if url:
-                # 复制链接到剪贴板
-                clipboard = QApplication.clipboard()
-                clipboard.setText(url)
-                
-                QMessageBox.information(
-                    self,
-                    "分享成功",
-                    "分享链接已复制到剪贴板\n链接有效期：24小时"
-                )
-            else:
-                QMessageBox.warning(self, "警告", "生成分享链接失败")
-        except Exception as e:
-            QMessageBox.critical(self, "错误", f"生成分享链接失败: {str(e)}") 
\ No newline at end of file
+            QMessageBox.information(
+                self,
+                "分享成功",
+                "分享链接已复制到剪贴板\n链接有效期：24小时"
+            )
+        else:
+            QMessageBox.warning(self, "警告", "生成分享链接失败")
@@ -3,18 +3,24 @@ from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
                              QLineEdit, QComboBox, QMessageBox, QFrame)
 from PyQt5.QtCore import Qt, pyqtSignal
 import os
+import re
 from datetime import datetime
+from core.services.object_catalog import ObjectCatalog
+from core.services.name_index import SEARCH_MODES, compile_matcher
 
 class FileSelectPage(QWidget):
     """文件选择页面，支持多文件选择、搜索和过滤"""
     
     # 定义信号
     files_selected = pyqtSignal(list)  # 当文件被选中时发出信号
+    REMOVE_ONE_BY_ONE = 16  # 一次删除的项目不超过该数量时逐个移除
     
     def __init__(self, minio_service):
         super().__init__()
         self.minio_service = minio_service
         self.selected_files = []
+        self.name_items = {}  # 文件名 -> 列表项
+        self.catalog = ObjectCatalog.instance(minio_service)
         self.init_ui()
         
     def init_ui(self):
@@ -29,6 +35,12 @@ class FileSelectPage(QWidget):
         self.search_input.textChanged.connect(self.filter_files)
         toolbar.addWidget(QLabel("搜索:"))
         toolbar.addWidget(self.search_input)
+
+        # 搜索方式，顺序与SEARCH_MODES一致
+        self.search_mode_combo = QComboBox()
+        self.search_mode_combo.addItems(["包含", "前缀", "通配符", "正则"])
+        self.search_mode_combo.currentIndexChanged.connect(lambda _: self.filter_files())
+        toolbar.addWidget(self.search_mode_combo)
         
         # 文件类型过滤
         self.type_combo = QComboBox()
@@ -83,8 +95,12 @@ class FileSelectPage(QWidget):
         
         self.setLayout(layout)
         
-        # 初始加载文件
-        self.refresh_files()
+        # 初始加载文件（共享目录已有缓存时立即显示）
+        self.catalog.files_reset.connect(self.show_catalog_files)
+        self.catalog.files_changed.connect(self.apply_delta)
+        self.catalog.error.connect(self.show_catalog_error)
+        self.show_catalog_files()
+        self.catalog.refresh()
         
     def get_file_type(self, filename):
         """获取文件类型"""
@@ -106,36 +122,102 @@ class FileSelectPage(QWidget):
         return f"{size:.1f} TB"
         
     def refresh_files(self):
-        """刷新文件列表"""
-        try:
-            self.file_tree.clear()
-            files = self.minio_service.list_files()
-            for file in files:
-                item = QTreeWidgetItem(self.file_tree)
-                item.setText(0, file["name"])
-                item.setText(1, self.format_size(file["size"]))
-                item.setText(2, file["last_modified"].strftime("%Y-%m-%d %H:%M"))
-                item.setText(3, self.get_file_type(file["name"]))
-            self.filter_files()
-        except Exception as e:
-            QMessageBox.warning(self, "错误", f"获取文件列表失败: {str(e)}")
-            
+        """刷新文件列表（由共享目录在后台与服务器对账）"""
+        self.catalog.refresh(force=True)
+
+    def show_catalog_files(self):
+        """用共享目录中的全部文件重建列表"""
+        self.file_tree.clear()
+        self.name_items.clear()
+        self.append_files(self.catalog.files())
+
+    def apply_delta(self, delta):
+        """将目录变更应用到列表，只改动发生变化的项目"""
+        for file in delta["updated"]:
+            item = self.name_items.get(file["name"])
+            if item is not None:
+                self.set_item(item, file)
+        if delta["added"]:
+            self.append_files(delta["added"])
+        if delta["removed"]:
+            self.remove_items(delta["removed"])
+
+    def remove_items(self, names):
+        """从列表中移除对象；数量多时一次取出全部项目再放回保留的，不逐项查找位置"""
+        items = [item for item in (self.name_items.pop(name, None) for name in names) if item is not None]
+        if len(items) <= self.REMOVE_ONE_BY_ONE:
+            for item in items:
+                self.file_tree.takeTopLevelItem(self.file_tree.indexOfTopLevelItem(item))
+            return
+        removed = {id(item) for item in items}
+        root = self.file_tree.invisibleRootItem()
+        hidden = {id(root.child(i)) for i in range(root.childCount()) if root.child(i).isHidden()}
+        kept = [item for item in root.takeChildren() if id(item) not in removed]
+        self.file_tree.addTopLevelItems(kept)
+        for item in kept:
+            if id(item) in hidden:
+                item.setHidden(True)
+
+    def show_catalog_error(self, message):
+        if self.isVisible():
+            QMessageBox.warning(self, "错误", f"获取文件列表失败: {message}")
+
+    def append_files(self, files):
+        """将一页文件追加到列表"""
+        match_name = self.name_matcher()
+        file_type = self.type_combo.currentText()
+        items = []
+        for file in files:
+            item = QTreeWidgetItem()
+            self.set_item(item, file)
+            self.name_items[file["name"]] = item
+            items.append(item)
+        # 一次性添加整页，避免逐项触发信号
+        self.file_tree.addTopLevelItems(items)
+        for item in items:
+            item.setHidden(not self.item_matches(item, match_name, file_type))
+
+    def set_item(self, item, file):
+        """设置列表项的内容"""
+        item.setText(0, file["name"])
+        item.setText(1, self.format_size(file["size"]))
+        # 目录中修改时间未知的对象没有last_modified
+        item.setText(2, file["last_modified"].strftime("%Y-%m-%d %H:%M") if file["last_modified"] else "")
+        item.setText(3, self.get_file_type(file["name"]))
+
     def filter_files(self):
-        """根据搜索文本和文件类型过滤文件"""
-        search_text = self.search_input.text().lower()
+        """根据搜索文本和文件类型过滤文件，只批量更新显示状态发生变化的项目"""
+        matches = self.catalog.search(self.search_input.text(), self.search_mode())
+        match_name = None if matches is None else matches.__contains__
         file_type = self.type_combo.currentText()
-        
-        for i in range(self.file_tree.topLevelItemCount()):
-            item = self.file_tree.topLevelItem(i)
-            filename = item.text(0).lower()
-            type_text = item.text(3)
-            
-            # 检查是否匹配搜索条件
-            matches_search = not search_text or search_text in filename
-            matches_type = file_type == "全部文件" or file_type == type_text
-            
-            # 显示或隐藏项目
-            item.setHidden(not (matches_search and matches_type))
+
+        self.file_tree.setUpdatesEnabled(False)
+        try:
+            for i in range(self.file_tree.topLevelItemCount()):
+                item = self.file_tree.topLevelItem(i)
+                hidden = not self.item_matches(item, match_name, file_type)
+                if item.isHidden() != hidden:
+                    item.setHidden(hidden)
+        finally:
+            self.file_tree.setUpdatesEnabled(True)
+
+    def search_mode(self):
+        return SEARCH_MODES[self.search_mode_combo.currentIndex()]
+
+    def name_matcher(self):
+        """当前搜索条件对应的单个文件名匹配函数，搜索为空时返回None"""
+        try:
+            return compile_matcher(self.search_input.text(), self.search_mode())
+        except re.error:
+            return lambda name: False
+
+    def item_matches(self, item, match_name, file_type):
+        """检查项目是否匹配搜索条件和文件类型"""
+        filename = item.text(0)
+        type_text = item.text(3)
+        matches_search = match_name is None or match_name(filename)
+        matches_type = file_type == "全部文件" or file_type == type_text
+        return matches_search and matches_type
             
     def toggle_select_all(self, checked):
         """全选/取消全选"""
@@ -0,0 +1,48 @@
+from PyQt5.QtWidgets import QDialog, QVBoxLayout, QLabel, QScrollArea
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QPixmap
+
+class ImagePreviewDialog(QDialog):
+    """图片预览：使用缩略图服务生成的大尺寸缩略图，再次打开时直接读取缓存"""
+    PREVIEW_SIZE = 1280
+
+    def __init__(self, thumbnails, name: str, etag, parent=None):
+        super().__init__(parent)
+        self.thumbnails = thumbnails
+        self.name = name
+        self.etag = etag
+        self.setWindowTitle(f"预览 - {name}")
+        self.resize(900, 700)
+
+        layout = QVBoxLayout(self)
+        self.image_label = QLabel("正在加载...")
+        self.image_label.setAlignment(Qt.AlignCenter)
+        scroll = QScrollArea()
+        scroll.setWidgetResizable(True)
+        scroll.setAlignment(Qt.AlignCenter)
+        scroll.setWidget(self.image_label)
+        layout.addWidget(scroll)
+
+        thumbnails.thumbnail_ready.connect(self.handle_ready)
+        thumbnails.thumbnail_failed.connect(self.handle_failed)
+        image = thumbnails.get(name, etag, self.PREVIEW_SIZE)
+        if image is not None:
+            self.show_image(image)
+
+    def show_image(self, image):
+        self.image_label.setPixmap(QPixmap.fromImage(image))
+
+    def handle_ready(self, name: str, size: int):
+        if name == self.name and size == self.PREVIEW_SIZE:
+            image = self.thumbnails.memory.get((name, self.etag, size))
+            if image is not None:
+                self.show_image(image)
+
+    def handle_failed(self, name: str, size: int, message: str):
+        if name == self.name and size == self.PREVIEW_SIZE:
+            self.image_label.setText(f"加载预览失败: {message}")
+
+    def done(self, result):
+        self.thumbnails.thumbnail_ready.disconnect(self.handle_ready)
+        self.thumbnails.thumbnail_failed.disconnect(self.handle_failed)
+        super().done(result)
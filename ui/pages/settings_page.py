@@ -1,15 +1,20 @@
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QFormLayout,
     QLineEdit, QPushButton, QLabel, QFrame,
-    QCheckBox, QMessageBox, QGroupBox
+    QCheckBox, QMessageBox, QGroupBox, QDoubleSpinBox, QSpinBox
 )
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, pyqtSignal
 from core.utils.config_manager import ConfigManager
+from core.services.minio_service import MinioService
+from core.services.async_minio_service import OperationRunner
 
 class SettingsPage(QWidget):
+    settings_saved = pyqtSignal()
+
     def __init__(self, config_manager: ConfigManager):
         super().__init__()
         self.config_manager = config_manager
+        self.operations = OperationRunner(1, self)  # 连接测试在后台执行
         self.setup_ui()
         self.load_settings()
 
@@ -23,6 +28,9 @@ class SettingsPage(QWidget):
         
         # 命令生成设置
         self.create_command_settings(layout)
+
+        # 存储配额设置
+        self.create_storage_settings(layout)
         
         # 保存按钮
         self.create_save_button(layout)
@@ -127,6 +135,44 @@ class SettingsPage(QWidget):
         group.setLayout(layout)
         parent_layout.addWidget(group)
 
+    def create_storage_settings(self, parent_layout):
+        group = QGroupBox("存储设置")
+        group.setStyleSheet("""
+            QGroupBox {
+                font-size: 14px;
+                font-weight: bold;
+                padding-top: 10px;
+            }
+            QGroupBox::title {
+                subcontrol-origin: margin;
+                left: 10px;
+                padding: 0 5px;
+            }
+        """)
+
+        layout = QFormLayout()
+        layout.setSpacing(10)
+        layout.setContentsMargins(15, 20, 15, 15)
+
+        # 存储配额，0表示不限制
+        self.quota_gb = QDoubleSpinBox()
+        self.quota_gb.setRange(0, 1024 * 1024)
+        self.quota_gb.setDecimals(1)
+        self.quota_gb.setSuffix(" GB")
+        self.quota_gb.setSpecialValueText("无限制")
+
+        # 后台全量核对用量的间隔，0表示不核对
+        self.usage_audit_minutes = QSpinBox()
+        self.usage_audit_minutes.setRange(0, 24 * 60)
+        self.usage_audit_minutes.setSuffix(" 分钟")
+        self.usage_audit_minutes.setSpecialValueText("不核对")
+
+        layout.addRow("存储配额:", self.quota_gb)
+        layout.addRow("用量核对间隔:", self.usage_audit_minutes)
+
+        group.setLayout(layout)
+        parent_layout.addWidget(group)
+
     def create_save_button(self, parent_layout):
         # 创建按钮容器
         button_container = QFrame()
@@ -152,7 +198,7 @@ class SettingsPage(QWidget):
         save_btn.clicked.connect(self.save_settings)
 
         # 创建测试连接按钮
-        test_btn = QPushButton("测试连接")
+        self.test_btn = test_btn = QPushButton("测试连接")
         test_btn.setStyleSheet("""
             QPushButton {
                 padding: 10px 20px;
@@ -166,6 +212,9 @@ class SettingsPage(QWidget):
             QPushButton:hover {
                 background-color: #218838;
             }
+            QPushButton:disabled {
+                background-color: #6c757d;
+            }
         """)
         test_btn.clicked.connect(self.test_connection)
 
@@ -191,6 +240,11 @@ class SettingsPage(QWidget):
         self.use_powershell.setChecked(cmd_config["use_powershell"])
         self.auto_delete.setChecked(cmd_config["auto_delete"])
 
+        # 加载存储设置
+        storage_config = self.config_manager.get_storage_config()
+        self.quota_gb.setValue(storage_config.get("quota_gb", 0))
+        self.usage_audit_minutes.setValue(storage_config.get("usage_audit_minutes", 30))
+
     def save_settings(self):
         """保存设置到配置管理器"""
         try:
@@ -212,24 +266,41 @@ class SettingsPage(QWidget):
             }
             self.config_manager.update_commands_config(cmd_config)
 
+            # 保存存储设置
+            storage_config = {
+                "quota_gb": self.quota_gb.value(),
+                "usage_audit_minutes": self.usage_audit_minutes.value()
+            }
+            self.config_manager.update_storage_config(storage_config)
+            self.settings_saved.emit()
+
             QMessageBox.information(self, "成功", "设置已保存")
         except Exception as e:
             QMessageBox.critical(self, "错误", f"保存设置失败: {str(e)}")
 
     def test_connection(self):
-        """测试MinIO连接"""
-        try:
-            from minio import Minio
-            client = Minio(
-                endpoint=self.endpoint.text(),
-                access_key=self.access_key.text(),
-                secret_key=self.secret_key.text(),
-                secure=self.secure.isChecked()
-            )
-            
-            # 尝试列出文件
-            list(client.list_objects(self.bucket.text(), prefix="", recursive=True))
-            
-            QMessageBox.information(self, "成功", "连接测试成功")
-        except Exception as e:
-            QMessageBox.critical(self, "错误", f"连接测试失败: {str(e)}")
\ No newline at end of file
+        """测试MinIO连接（在后台执行，测试期间按钮不可用）"""
+        config = {
+            "endpoint": self.endpoint.text(),
+            "access_key": self.access_key.text(),
+            "secret_key": self.secret_key.text(),
+            "bucket": self.bucket.text(),
+            "secure": self.secure.isChecked()
+        }
+        self.test_btn.setEnabled(False)
+        self.test_btn.setText("测试中...")
+        operation = self.operations.submit("test_connection", MinioService.check_connection, config, timeout=15)
+        operation.succeeded.connect(self.handle_test_succeeded)
+        operation.failed.connect(self.handle_test_failed)
+
+    def handle_test_succeeded(self, _):
+        self.reset_test_button()
+        QMessageBox.information(self, "成功", "连接测试成功")
+
+    def handle_test_failed(self, message: str):
+        self.reset_test_button()
+        QMessageBox.critical(self, "错误", f"连接测试失败: {message}")
+
+    def reset_test_button(self):
+        self.test_btn.setEnabled(True)
+        self.test_btn.setText("测试连接")
@@ -11,7 +11,6 @@ import os
 from datetime import datetime
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-import numpy as np
 import matplotlib as mpl
 import platform
 from matplotlib.font_manager import FontProperties
@@ -0,0 +1,122 @@
+import os
+from PyQt5.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QFormLayout, QLineEdit, QComboBox, QCheckBox,
+    QLabel, QPushButton, QListView, QMessageBox
+)
+from PyQt5.QtCore import QStringListModel, QThreadPool
+import humanize
+from core.worker import Worker
+from core.services.folder_sync import (
+    SyncPlan, FolderSync, list_remote, BOTH, UPLOAD_ONLY, DOWNLOAD_ONLY, UPLOAD, DOWNLOAD
+)
+
+class FolderSyncDialog(QDialog):
+    """比较本地文件夹和存储桶中的前缀，先列出要执行的操作（不传输任何文件），确认后再同步"""
+    DIRECTIONS = [(BOTH, "双向"), (UPLOAD_ONLY, "仅上传"), (DOWNLOAD_ONLY, "仅下载")]
+
+    def __init__(self, minio_service, scheduler, root: str, bucket: str, parent=None):
+        super().__init__(parent)
+        self.minio_service = minio_service
+        self.scheduler = scheduler
+        self.root = root
+        self.bucket = bucket
+        self.plan = None
+        self.generation = 0  # 重新比较时丢弃旧的结果
+        self.thread_pool = QThreadPool.globalInstance()
+        self.setWindowTitle("同步文件夹")
+        self.resize(700, 550)
+
+        layout = QVBoxLayout(self)
+        form = QFormLayout()
+        form.addRow("本地文件夹:", QLabel(root))
+        self.prefix_input = QLineEdit(os.path.basename(os.path.normpath(root)) + "/")
+        form.addRow("远端前缀:", self.prefix_input)
+        self.direction_combo = QComboBox()
+        self.direction_combo.addItems([label for _, label in self.DIRECTIONS])
+        form.addRow("方向:", self.direction_combo)
+        self.hash_check = QCheckBox("大小相同时比较MD5（较慢）")
+        form.addRow("", self.hash_check)
+        layout.addLayout(form)
+
+        self.summary_label = QLabel("点击“比较”查看需要同步的文件")
+        layout.addWidget(self.summary_label)
+        self.changes_model = QStringListModel(self)
+        self.changes_view = QListView()
+        self.changes_view.setModel(self.changes_model)
+        self.changes_view.setUniformItemSizes(True)
+        layout.addWidget(self.changes_view)
+
+        buttons = QHBoxLayout()
+        self.compare_btn = QPushButton("比较")
+        self.compare_btn.clicked.connect(self.compare)
+        self.sync_btn = QPushButton("开始同步")
+        self.sync_btn.setEnabled(False)
+        self.sync_btn.clicked.connect(self.start_sync)
+        close_btn = QPushButton("关闭")
+        close_btn.clicked.connect(self.reject)
+        buttons.addStretch()
+        buttons.addWidget(self.compare_btn)
+        buttons.addWidget(self.sync_btn)
+        buttons.addWidget(close_btn)
+        layout.addLayout(buttons)
+
+        self.prefix_input.textChanged.connect(self.invalidate)
+        self.direction_combo.currentIndexChanged.connect(self.invalidate)
+        self.hash_check.toggled.connect(self.invalidate)
+
+    def prefix(self) -> str:
+        prefix = self.prefix_input.text().strip().strip("/")
+        return prefix + "/" if prefix else ""
+
+    def invalidate(self):
+        self.plan = None
+        self.sync_btn.setEnabled(False)
+
+    def compare(self):
+        """在后台重新列举远端前缀、扫描本地文件并比较，不使用可能过期的目录"""
+        self.generation += 1
+        generation = self.generation
+        plan = SyncPlan(self.root, self.prefix(), self.bucket, self.DIRECTIONS[self.direction_combo.currentIndex()][0])
+        self.invalidate()
+        self.compare_btn.setEnabled(False)
+        self.summary_label.setText("正在比较...")
+        worker = Worker(self.compute_plan, plan, self.hash_check.isChecked())
+        worker.signals.result.connect(lambda _: self.show_plan(plan, generation))
+        worker.signals.error.connect(lambda message: self.show_error(message, generation))
+        self.thread_pool.start(worker)
+
+    def compute_plan(self, plan: SyncPlan, check_hash: bool):
+        """在工作线程中执行"""
+        plan.compute(list_remote(self.minio_service, plan.prefix), check_hash)
+
+    def show_error(self, message: str, generation: int):
+        if generation == self.generation:
+            self.compare_btn.setEnabled(True)
+            self.summary_label.setText(f"比较失败: {message}")
+
+    def show_plan(self, plan: SyncPlan, generation: int):
+        if generation != self.generation:
+            return
+        self.compare_btn.setEnabled(True)
+        self.plan = plan
+        arrows = {UPLOAD: "↑ 上传", DOWNLOAD: "↓ 下载"}
+        lines = [f"{arrows[action]}  {path}  （{reason}）" for action, path, reason in plan.actions]
+        lines += [f"－ 跳过  {path}  （{reason}）" for path, reason in plan.skipped]
+        self.changes_model.setStringList(lines)
+        self.summary_label.setText(
+            f"上传 {plan.count(UPLOAD)} 个（{humanize.naturalsize(plan.total_size(UPLOAD), binary=True)}），"
+            f"下载 {plan.count(DOWNLOAD)} 个（{humanize.naturalsize(plan.total_size(DOWNLOAD), binary=True)}），"
+            f"未变化 {plan.unchanged} 个，跳过 {len(plan.skipped)} 个")
+        self.sync_btn.setEnabled(True)
+
+    def start_sync(self):
+        if self.plan is None:
+            return
+        if not self.plan.actions:
+            # 没有要传输的文件，但仍然记录状态，下次比较时可以识别修改和删除
+            self.plan.save_state()
+            QMessageBox.information(self, "同步", "两边已经一致")
+            self.accept()
+            return
+        FolderSync(self.plan, self.scheduler).start()
+        self.accept()
@@ -0,0 +1,201 @@
+from collections import deque
+from PyQt5.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QPlainTextEdit, QPushButton, QLabel
+)
+from PyQt5.QtGui import QFont, QTextCursor
+import humanize
+
+class TextPreviewDialog(QDialog):
+    """大文件的分页预览：用Range请求按页读取，滚动到边缘时再读取相邻的页
+
+    只保留最多max_pages页，超出时丢弃另一端的页，多GB的日志文件也只占用固定内存。
+    文本按整行分页，避免在多字节字符或行中间截断；含有NUL字节的文件以十六进制显示。
+    """
+    HEX_WIDTH = 16  # 十六进制显示时每行的字节数
+    LOAD_MARGIN = 3  # 滚动条距边缘多少行时加载相邻的页
+
+    def __init__(self, async_service, name: str, size: int, page_size: int = 64 * 1024,
+                 max_pages: int = 32, parent=None):
+        super().__init__(parent)
+        self.async_service = async_service
+        self.name = name
+        self.size = size
+        self.page_size = max(self.HEX_WIDTH, page_size - page_size % self.HEX_WIDTH)
+        self.max_pages = max(2, max_pages)
+        self.binary = None  # 读取第一页后确定
+        self.start = self.end = 0  # 已加载内容在文件中的字节范围
+        self.pages = deque()  # 每页的(字节数, 字符数, 行数)，与文档中的顺序一致
+        self.operation = None
+        self.scroll_to_end = False
+        self.setWindowTitle(f"预览 - {name}")
+        self.resize(900, 700)
+
+        layout = QVBoxLayout(self)
+        toolbar = QHBoxLayout()
+        self.head_btn = QPushButton("开头")
+        self.head_btn.clicked.connect(self.show_head)
+        self.tail_btn = QPushButton("末尾")
+        self.tail_btn.clicked.connect(self.show_tail)
+        self.status_label = QLabel()
+        toolbar.addWidget(self.head_btn)
+        toolbar.addWidget(self.tail_btn)
+        toolbar.addStretch()
+        toolbar.addWidget(self.status_label)
+        layout.addLayout(toolbar)
+
+        self.text_edit = QPlainTextEdit()
+        self.text_edit.setReadOnly(True)
+        self.text_edit.setLineWrapMode(QPlainTextEdit.NoWrap)
+        self.text_edit.setFont(QFont("Monospace", 10))
+        self.text_edit.verticalScrollBar().valueChanged.connect(self.check_scroll)
+        layout.addWidget(self.text_edit)
+
+        self.show_head()
+
+    def show_head(self):
+        """从文件开头显示"""
+        self.reset(0)
+        self.load_forward()
+
+    def show_tail(self):
+        """显示文件末尾，向上滚动时再读取前面的页"""
+        self.reset(self.size)
+        self.scroll_to_end = True
+        self.load_backward()
+
+    def reset(self, offset: int):
+        if self.operation is not None:
+            self.operation.cancel()
+            self.operation = None
+        self.start = self.end = offset
+        self.pages.clear()
+        self.text_edit.clear()
+
+    def check_scroll(self, value: int):
+        bar = self.text_edit.verticalScrollBar()
+        if value >= bar.maximum() - self.LOAD_MARGIN:
+            self.load_forward()
+        elif value <= bar.minimum() + self.LOAD_MARGIN:
+            self.load_backward()
+
+    def load_forward(self):
+        if self.operation is not None or self.end >= self.size:
+            return
+        self.read(self.end, min(self.page_size, self.size - self.end), self.handle_forward)
+
+    def load_backward(self):
+        if self.operation is not None or self.start <= 0:
+            return
+        offset = max(0, self.start - self.page_size)
+        offset -= offset % self.HEX_WIDTH
+        self.read(offset, self.start - offset, self.handle_backward)
+
+    def read(self, offset: int, length: int, handler):
+        self.status_label.setText("正在读取...")
+        operation = self.async_service.read_range(self.name, offset, length)
+        operation.succeeded.connect(lambda data: self.handle_read(operation, offset, data, handler))
+        operation.failed.connect(lambda message: self.handle_failed(operation, message))
+        self.operation = operation
+
+    def handle_read(self, operation, offset: int, data, handler):
+        if operation is not self.operation:
+            return  # 已切换到开头/末尾，丢弃旧的结果
+        self.operation = None
+        if data is None:
+            self.status_label.setText("读取文件失败")
+            return
+        if self.binary is None:
+            self.binary = b"\0" in data[:8192]
+        handler(offset, data)
+        self.update_status()
+        if self.scroll_to_end:
+            self.scroll_to_end = False
+            self.text_edit.verticalScrollBar().setValue(self.text_edit.verticalScrollBar().maximum())
+        if self.text_edit.verticalScrollBar().maximum() == 0:
+            # 内容还不足一屏，无法通过滚动触发加载
+            handler_next = self.load_forward if handler == self.handle_forward else self.load_backward
+            handler_next()
+
+    def handle_failed(self, operation, message: str):
+        if operation is self.operation:
+            self.operation = None
+            self.status_label.setText(f"读取文件失败: {message}")
+
+    def handle_forward(self, offset: int, data: bytes):
+        if not self.binary and offset + len(data) < self.size:
+            cut = data.rfind(b"\n") + 1
+            if cut > 0:
+                data = data[:cut]  # 不完整的最后一行留给下一页
+        text = self.format(offset, data)
+        cursor = QTextCursor(self.text_edit.document())
+        cursor.movePosition(QTextCursor.End)
+        cursor.insertText(text)
+        self.pages.append((len(data), self.text_length(text), text.count("\n")))
+        self.end = offset + len(data)
+        if len(self.pages) > self.max_pages:
+            self.drop_first_page()
+
+    def handle_backward(self, offset: int, data: bytes):
+        if not self.binary and offset > 0:
+            skip = data.find(b"\n") + 1
+            if 0 < skip < len(data):
+                data = data[skip:]  # 不完整的第一行留给上一页
+                offset += skip
+        text = self.format(offset, data)
+        bar = self.text_edit.verticalScrollBar()
+        position = bar.value()
+        cursor = QTextCursor(self.text_edit.document())
+        cursor.movePosition(QTextCursor.Start)
+        cursor.insertText(text)
+        lines = text.count("\n")
+        self.pages.appendleft((len(data), self.text_length(text), lines))
+        self.start = offset
+        if len(self.pages) > self.max_pages:
+            self.drop_last_page()
+        bar.setValue(position + lines)  # 保持当前看到的内容不动
+
+    def drop_first_page(self):
+        size, chars, lines = self.pages.popleft()
+        bar = self.text_edit.verticalScrollBar()
+        position = bar.value()
+        # 按位置选择而不是按字符移动：移动光标以字形为单位，与UTF-16的位置数不一致
+        cursor = QTextCursor(self.text_edit.document())
+        cursor.setPosition(chars, QTextCursor.KeepAnchor)
+        cursor.removeSelectedText()
+        self.start += size
+        bar.setValue(max(0, position - lines))
+
+    def drop_last_page(self):
+        size, chars, _ = self.pages.pop()
+        cursor = QTextCursor(self.text_edit.document())
+        cursor.movePosition(QTextCursor.End)
+        cursor.setPosition(cursor.position() - chars, QTextCursor.KeepAnchor)
+        cursor.removeSelectedText()
+        self.end -= size
+
+    @staticmethod
+    def text_length(text: str) -> int:
+        """文本在文档中占用的位置数（Qt按UTF-16计数）"""
+        return len(text.encode("utf-16-le")) // 2
+
+    def format(self, offset: int, data: bytes) -> str:
+        if not self.binary:
+            return data.decode("utf-8", errors="replace")
+        lines = []
+        for start in range(0, len(data), self.HEX_WIDTH):
+            chunk = data[start:start + self.HEX_WIDTH]
+            hex_part = " ".join(f"{byte:02x}" for byte in chunk)
+            text_part = "".join(chr(byte) if 32 <= byte < 127 else "." for byte in chunk)
+            lines.append(f"{offset + start:010x}  {hex_part:<{self.HEX_WIDTH * 3 - 1}}  {text_part}\n")
+        return "".join(lines)
+
+    def update_status(self):
+        self.status_label.setText(
+            f"已加载 {humanize.naturalsize(self.start, binary=True)} - "
+            f"{humanize.naturalsize(self.end, binary=True)} / {humanize.naturalsize(self.size, binary=True)}")
+
+    def done(self, result):
+        if self.operation is not None:
+            self.operation.cancel()
+            self.operation = None
+        super().done(result)
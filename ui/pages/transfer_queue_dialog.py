@@ -0,0 +1,56 @@
+from PyQt5.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QTableView, QPushButton, QHeaderView, QAbstractItemView
+)
+from ui.models.transfer_model import TransferJobModel
+
+class TransferQueueDialog(QDialog):
+    """查看传输队列，对选中的任务调整优先级、暂停、继续或取消"""
+
+    def __init__(self, scheduler, parent=None):
+        super().__init__(parent)
+        self.scheduler = scheduler
+        self.model = TransferJobModel(scheduler, self)
+        self.setWindowTitle("传输队列")
+        self.resize(800, 500)
+
+        layout = QVBoxLayout(self)
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        self.table.verticalHeader().setVisible(False)
+        self.table.verticalHeader().setDefaultSectionSize(24)
+        header = self.table.horizontalHeader()
+        header.setSectionResizeMode(0, QHeaderView.Stretch)
+        for column in range(1, len(TransferJobModel.HEADERS)):
+            header.setSectionResizeMode(column, QHeaderView.ResizeToContents)
+        layout.addWidget(self.table)
+
+        buttons = QHBoxLayout()
+        for text, action in (
+            ("优先", lambda: self.scheduler.prioritize(self.selected_jobs())),
+            ("暂停", lambda: self.apply(self.scheduler.pause)),
+            ("继续", lambda: self.apply(self.scheduler.resume)),
+            ("取消", lambda: self.apply(self.scheduler.cancel)),
+        ):
+            button = QPushButton(text)
+            button.clicked.connect(action)
+            buttons.addWidget(button)
+        buttons.addStretch()
+        for text, action in (
+            ("全部暂停", self.scheduler.pause_all),
+            ("全部继续", self.scheduler.resume_all),
+            ("全部取消", self.scheduler.cancel_all),
+        ):
+            button = QPushButton(text)
+            button.clicked.connect(lambda _, action=action: action())
+            buttons.addWidget(button)
+        layout.addLayout(buttons)
+
+    def selected_jobs(self):
+        rows = sorted(index.row() for index in self.table.selectionModel().selectedRows())
+        return self.model.jobs(rows)
+
+    def apply(self, action):
+        for job in self.selected_jobs():
+            action(job)